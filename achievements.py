@@ -0,0 +1,129 @@
+# Declarative achievements and challenges over incrementally maintained counters
+#
+# Every badge is a rule "counter >= target" declared as data below. Rules are
+# indexed by the counter they watch, so after a save only the rules whose
+# counter actually changed are checked -- no rescans of workout history.
+# Adding a badge means adding an entry here; the app needs no new code.
+
+CARDIO_TYPES = frozenset(['Running', 'Walking', 'Cycling', 'Swimming', 'HIIT'])
+
+# Counters kept in st.session_state.user_stats alongside the running totals
+COUNTERS = ['total_workouts', 'total_calories', 'total_duration', 'streak', 'longest_streak', 'distinct_types',
+            'cardio_workouts']
+
+ACHIEVEMENTS = [
+    {'key': 'first_workout', 'name': 'First Step', 'icon': '🎯', 'description': 'Log your first workout',
+     'counter': 'total_workouts', 'target': 1},
+    {'key': 'three_workouts', 'name': 'Getting Started', 'icon': '🔥', 'description': 'Complete 3 workouts',
+     'counter': 'total_workouts', 'target': 3},
+    {'key': 'consistency', 'name': 'Consistency King', 'icon': '👑', 'description': 'Work out 3 days in a row',
+     'counter': 'longest_streak', 'target': 3},
+    {'key': 'calorie_milestone', 'name': 'Calorie Crusher', 'icon': '💪', 'description': 'Burn 500 total calories',
+     'counter': 'total_calories', 'target': 500},
+    {'key': 'different_workouts', 'name': 'Variety Pack', 'icon': '🌈', 'description': 'Try 3 different workout types',
+     'counter': 'distinct_types', 'target': 3},
+]
+
+CHALLENGES = [
+    {'id': 1, 'name': '7-Day Streak', 'description': 'Complete 7 workouts in 7 days', 'reward': '🏆 Gold Badge',
+     'counter': 'longest_streak', 'target': 7},
+    {'id': 2, 'name': 'Cardio Master', 'description': 'Complete 5 cardio workouts', 'reward': '🏅 Silver Badge',
+     'counter': 'cardio_workouts', 'target': 5},
+    {'id': 3, 'name': '1000 Calorie Burn', 'description': 'Burn a total of 1000 calories', 'reward': '🔥 Fire Badge',
+     'counter': 'total_calories', 'target': 1000},
+]
+
+
+def _index_rules():
+    # counter -> [(kind, rule)] in declaration order
+    index = {counter: [] for counter in COUNTERS}
+    for rule in ACHIEVEMENTS:
+        index[rule['counter']].append(('achievement', rule))
+    for rule in CHALLENGES:
+        index[rule['counter']].append(('challenge', rule))
+    return index
+
+
+RULES_BY_COUNTER = _index_rules()
+
+
+def new_counters():
+    return {counter: 0 for counter in COUNTERS}
+
+
+def new_achievements():
+    return {
+        rule['key']: {'earned': False, 'name': rule['name'], 'icon': rule['icon'], 'description': rule['description']}
+        for rule in ACHIEVEMENTS
+    }
+
+
+def new_challenges():
+    return [
+        {'id': rule['id'], 'name': rule['name'], 'description': rule['description'], 'reward': rule['reward'],
+         'completed': False}
+        for rule in CHALLENGES
+    ]
+
+
+def _update_streaks(counters, active_days, changed):
+    for counter, value in (('streak', active_days.current_streak()), ('longest_streak', active_days.longest_streak)):
+        if counters[counter] != value:
+            counters[counter] = value
+            changed.add(counter)
+
+
+def record_workout(counters, type_counts, active_days, workout):
+    # Folds one workout into the counters, per-type counts and active-day index
+    # (a streaks.DayIndex); returns the changed counters
+    counters['total_workouts'] += 1
+    counters['total_calories'] += workout['calories']
+    counters['total_duration'] += workout['duration']
+    changed = {'total_workouts', 'total_calories', 'total_duration'}
+
+    previous = type_counts.get(workout['type'], 0)
+    type_counts[workout['type']] = previous + 1
+    if previous == 0:
+        counters['distinct_types'] += 1
+        changed.add('distinct_types')
+    if workout['type'] in CARDIO_TYPES:
+        counters['cardio_workouts'] += 1
+        changed.add('cardio_workouts')
+    if active_days.add(workout['day']):
+        _update_streaks(counters, active_days, changed)
+    return changed
+
+
+def load_derived_counters(counters, type_counts, active_days):
+    # Sets the type and streak counters from complete per-type counts and
+    # active days (e.g. restored from storage)
+    counters['distinct_types'] = len(type_counts)
+    counters['cardio_workouts'] = sum(count for workout_type, count in type_counts.items() if workout_type in CARDIO_TYPES)
+    _update_streaks(counters, active_days, set())
+
+
+def evaluate(counters, changed, achievements, challenges):
+    # Marks newly met rules watching the changed counters; returns (achievements_earned, challenges_completed)
+    achievements_earned = []
+    challenges_completed = []
+    challenges_by_id = None
+    for counter in COUNTERS:
+        if counter not in changed:
+            continue
+        value = counters[counter]
+        for kind, rule in RULES_BY_COUNTER[counter]:
+            if value < rule['target']:
+                continue
+            if kind == 'achievement':
+                achievement = achievements[rule['key']]
+                if not achievement['earned']:
+                    achievement['earned'] = True
+                    achievements_earned.append(achievement)
+            else:
+                if challenges_by_id is None:
+                    challenges_by_id = {challenge['id']: challenge for challenge in challenges}
+                challenge = challenges_by_id[rule['id']]
+                if not challenge['completed']:
+                    challenge['completed'] = True
+                    challenges_completed.append(challenge)
+    return achievements_earned, challenges_completed
@@ -0,0 +1,87 @@
+# Per-user activity bitmap: one bit per day per tracker
+#
+# Each tracker's active days are a Python int used as a bit array, with bit i
+# standing for day `origin + i` (day ordinals, see days.py). A year of history
+# is ~46 bytes per tracker; window counts are a shift, a mask and
+# int.bit_count(), and the longest run is the classic x & (x >> 1) loop.
+import numpy as np
+
+from days import to_ordinal
+
+TRACKERS = ['workouts', 'steps', 'water']
+
+
+def _window_mask(bits, lo, n):
+    return (bits >> lo) & ((1 << n) - 1) if n > 0 else 0
+
+
+class ActivityBitmap:
+    def __init__(self):
+        self.origin = None
+        self._bits = {tracker: 0 for tracker in TRACKERS}
+
+    @classmethod
+    def from_days(cls, days_by_tracker):
+        # days_by_tracker: tracker -> iterable of days; builds each bit array in one pass
+        bitmap = cls()
+        ordinals = {tracker: [to_ordinal(day) for day in days] for tracker, days in days_by_tracker.items()}
+        firsts = [min(days) for days in ordinals.values() if days]
+        if firsts:
+            bitmap.origin = min(firsts)
+            for tracker, days in ordinals.items():
+                bits = 0
+                for day in days:
+                    bits |= 1 << (day - bitmap.origin)
+                bitmap._bits[tracker] = bits
+        return bitmap
+
+    def add(self, tracker, day):
+        day = to_ordinal(day)
+        if self.origin is None:
+            self.origin = day
+        elif day < self.origin:
+            shift = self.origin - day
+            for name in self._bits:
+                self._bits[name] <<= shift
+            self.origin = day
+        self._bits[tracker] |= 1 << (day - self.origin)
+
+    def _bits_for(self, tracker):
+        # tracker=None means active in any tracker
+        if tracker is None:
+            bits = 0
+            for value in self._bits.values():
+                bits |= value
+            return bits
+        return self._bits[tracker]
+
+    def _window(self, tracker, start, end):
+        # Bits for the inclusive window [start, end], bit 0 = start; days before origin are inactive
+        start, end = to_ordinal(start), to_ordinal(end)
+        if self.origin is None or end < self.origin:
+            return 0
+        bits = self._bits_for(tracker)
+        lo = max(start, self.origin) - self.origin
+        window = _window_mask(bits, lo, end - self.origin - lo + 1)
+        return window << (lo + self.origin - start)
+
+    def count(self, tracker, start, end):
+        # Active days in the inclusive window
+        return self._window(tracker, start, end).bit_count()
+
+    def longest_run(self, tracker=None, start=None, end=None):
+        if self.origin is None:
+            return 0
+        bits = self._bits_for(tracker) if start is None else self._window(tracker, start, end)
+        run = 0
+        while bits:
+            bits &= bits >> 1
+            run += 1
+        return run
+
+    def day_flags(self, tracker, start, end):
+        # uint8 array with one 0/1 entry per day of the inclusive window
+        n = to_ordinal(end) - to_ordinal(start) + 1
+        window = self._window(tracker, start, end)
+        packed = np.frombuffer(window.to_bytes((n + 7) // 8, "little"), dtype=np.uint8)
+        return np.unpackbits(packed, bitorder="little")[:n]
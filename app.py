@@ -2,11 +2,10 @@ import streamlit as st
 import numpy as np
 import matplotlib.pyplot as plt
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
+from functools import partial
 import json
 import warnings
 import base64
@@ -14,6 +13,19 @@ import random
 import uuid
 import time
 
+import achievements
+import activity
+import assets
+import dataset_cache
+import days
+import figures
+import model_registry
+import record_store
+import streaks
+import timeseries
+import tracker_store
+import user_store
+
 warnings.filterwarnings('ignore')
 
 # Page Configuration
@@ -24,359 +36,169 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for improved appearance with modern theme and glassy effects
+# Prepare the calorie model in the background so no page waits on training
+# (server.py also starts this at process boot)
+if not model_registry.is_ready():
+    model_registry.start_warmup()
+
+# Demo accounts exist only if FITNESS_DEMO_PASSWORD is set (see user_store.py)
+user_store.seed_demo_users()
+
+# Custom CSS for improved appearance with modern theme and glassy effects,
+# served from static/theme.css as a hashed, browser-cached asset (see assets.py)
 def local_css():
-    st.markdown("""
-        <style>
-        /* Global styling */
-        .main .block-container {
-            padding-top: 2rem;
-        }
-        
-        /* Custom theme colors - vibrant interactive palette */
-        :root {
-            --primary-color: #8e44ad;
-            --secondary-color: #3498db;
-            --accent-color: #e74c3c;
-            --background-color: #f8f9fa;
-            --text-color: #2c3e50;
-            --light-text: #7f8c8d;
-            --success-color: #2ecc71;
-            --warning-color: #f39c12;
-            --glass-bg: rgba(255, 255, 255, 0.25);
-            --glass-border: rgba(255, 255, 255, 0.18);
-            --glass-highlight: rgba(255, 255, 255, 0.6);
-            --glass-shadow: rgba(0, 0, 0, 0.1);
-        }
-        
-        /* Streamlit component styling */
-        .stMetric {
-            background: var(--glass-bg);
-            backdrop-filter: blur(10px);
-            -webkit-backdrop-filter: blur(10px);
-            border-radius: 15px;
-            padding: 20px !important;
-            border: 1px solid var(--glass-border);
-            box-shadow: 0 8px 32px var(--glass-shadow);
-            transition: all 0.4s ease;
-        }
-        .stMetric:hover {
-            transform: translateY(-5px);
-            box-shadow: 0 15px 35px var(--glass-shadow);
-            border-color: var(--glass-highlight);
-        }
-        .stMetric label {
-            color: var(--text-color) !important;
-            font-weight: 500 !important;
-            text-shadow: 0 1px 2px rgba(0,0,0,0.1);
-        }
-        .stMetric [data-testid="stMetricValue"] {
-            font-size: 2.2rem !important;
-            font-weight: bold !important;
-            color: var(--primary-color) !important;
-            text-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }
-        
-        /* Custom components */
-        .badge {
-            display: inline-block;
-            padding: 8px 15px;
-            background: linear-gradient(135deg, var(--primary-color), var(--secondary-color));
-            border-radius: 25px;
-            color: white;
-            font-weight: bold;
-            margin: 5px;
-            text-align: center;
-            box-shadow: 0 4px 15px rgba(0,0,0,0.2);
-            transition: all 0.4s cubic-bezier(0.175, 0.885, 0.32, 1.275);
-            border: 1px solid rgba(255, 255, 255, 0.1);
-        }
-        .badge:hover {
-            transform: translateY(-5px) scale(1.05);
-            box-shadow: 0 10px 25px rgba(0,0,0,0.25);
-        }
-        
-        .workout-card {
-            background: var(--glass-bg);
-            backdrop-filter: blur(10px);
-            -webkit-backdrop-filter: blur(10px);
-            border-radius: 15px;
-            padding: 20px;
-            margin-bottom: 18px;
-            box-shadow: 0 8px 32px var(--glass-shadow);
-            transition: all 0.4s ease;
-            border-left: 4px solid var(--primary-color);
-            border: 1px solid var(--glass-border);
-        }
-        .workout-card:hover {
-            transform: translateY(-5px) scale(1.02);
-            box-shadow: 0 15px 35px var(--glass-shadow);
-            border-color: var(--glass-highlight);
-        }
-        
-        .challenge-card {
-            background: linear-gradient(135deg, 
-                          rgba(142, 68, 173, 0.8), 
-                          rgba(52, 152, 219, 0.8));
-            backdrop-filter: blur(10px);
-            -webkit-backdrop-filter: blur(10px);
-            color: white;
-            border-radius: 15px;
-            padding: 25px;
-            margin-bottom: 20px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.15);
-            transition: all 0.5s cubic-bezier(0.175, 0.885, 0.32, 1.275);
-            border: 1px solid rgba(255, 255, 255, 0.1);
-        }
-        .challenge-card:hover {
-            transform: translateY(-8px) scale(1.03);
-            box-shadow: 0 20px 40px rgba(0,0,0,0.2);
-        }
-        
-        .achievement-icon {
-            font-size: 32px;
-            margin-right: 15px;
-            text-shadow: 0 2px 10px rgba(0,0,0,0.2);
-        }
-        
-        .progress-container {
-            width: 100%;
-            background: rgba(255, 255, 255, 0.3);
-            backdrop-filter: blur(5px);
-            -webkit-backdrop-filter: blur(5px);
-            border-radius: 20px;
-            margin: 15px 0;
-            overflow: hidden;
-            height: 25px;
-            box-shadow: inset 0 2px 8px rgba(0,0,0,0.1);
-            border: 1px solid rgba(255, 255, 255, 0.2);
-        }
-        
-        .progress-bar {
-            height: 100%;
-            background: linear-gradient(90deg, var(--primary-color), var(--secondary-color));
-            border-radius: 20px;
-            transition: width 1s cubic-bezier(0.19, 1, 0.22, 1);
-            text-align: center;
-            color: white;
-            font-weight: bold;
-            line-height: 25px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.2);
-            text-shadow: 0 1px 3px rgba(0,0,0,0.3);
-        }
-        
-        /* Animation effects */
-        .tab-content {
-            animation: fadeIn 0.8s cubic-bezier(0.19, 1, 0.22, 1);
-        }
-        
-        @keyframes fadeIn {
-            from { opacity: 0; transform: translateY(30px); }
-            to { opacity: 1; transform: translateY(0); }
-        }
-        
-        @keyframes pulse {
-            0% { transform: scale(1); box-shadow: 0 0 0 0 rgba(142, 68, 173, 0.7); }
-            70% { transform: scale(1.05); box-shadow: 0 0 0 10px rgba(142, 68, 173, 0); }
-            100% { transform: scale(1); box-shadow: 0 0 0 0 rgba(142, 68, 173, 0); }
-        }
-        
-        /* Login/Register form styling with glassy effect */
-        .auth-container {
-            max-width: 450px;
-            margin: 3rem auto;
-            background: rgba(255, 255, 255, 0.25);
-            backdrop-filter: blur(15px);
-            -webkit-backdrop-filter: blur(15px);
-            border-radius: 20px;
-            padding: 35px;
-            box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-            border: 1px solid rgba(255, 255, 255, 0.18);
-            text-align: center;
-            position: relative;
-            overflow: hidden;
-        }
-        
-        .auth-container::before {
-            content: '';
-            position: absolute;
-            top: -50%;
-            left: -50%;
-            width: 200%;
-            height: 200%;
-            background: radial-gradient(circle, 
-                             rgba(255, 255, 255, 0.1) 0%, 
-                             rgba(255, 255, 255, 0.05) 30%, 
-                             transparent 70%);
-            z-index: -1;
-        }
-        
-        .auth-header {
-            margin-bottom: 30px;
-            color: var(--primary-color);
-            font-size: 28px;
-            font-weight: bold;
-            text-shadow: 0 2px 5px rgba(0,0,0,0.1);
-        }
-        
-        .auth-input {
-            width: 100%;
-            padding: 15px 20px;
-            margin-bottom: 20px;
-            background: rgba(255, 255, 255, 0.15);
-            backdrop-filter: blur(5px);
-            -webkit-backdrop-filter: blur(5px);
-            border: 1px solid rgba(255, 255, 255, 0.2);
-            border-radius: 12px;
-            font-size: 16px;
-            color: var(--text-color);
-            transition: all 0.4s ease;
-            box-shadow: 0 4px 8px rgba(0,0,0,0.05);
-        }
-        
-        .auth-input:focus {
-            background: rgba(255, 255, 255, 0.25);
-            border-color: rgba(255, 255, 255, 0.4);
-            box-shadow: 0 8px 16px rgba(0,0,0,0.1);
-            outline: none;
-        }
-        
-        .auth-input::placeholder {
-            color: rgba(44, 62, 80, 0.6);
-        }
-        
-        .auth-btn {
-            width: 100%;
-            padding: 15px;
-            background: linear-gradient(135deg, var(--primary-color), var(--secondary-color));
-            color: white;
-            border: none;
-            border-radius: 12px;
-            font-size: 18px;
-            font-weight: bold;
-            cursor: pointer;
-            transition: all 0.4s cubic-bezier(0.175, 0.885, 0.32, 1.275);
-            box-shadow: 0 8px 15px rgba(0,0,0,0.1);
-            text-shadow: 0 1px 3px rgba(0,0,0,0.2);
-            margin-top: 10px;
-        }
-        
-        .auth-btn:hover {
-            transform: translateY(-5px);
-            box-shadow: 0 15px 25px rgba(0,0,0,0.2);
-            animation: pulse 1.5s infinite;
-        }
-        
-        .auth-switch {
-            margin-top: 20px;
-            color: var(--text-color);
-            font-size: 15px;
-        }
-        
-        .auth-switch a {
-            color: var(--primary-color);
-            text-decoration: none;
-            font-weight: bold;
-            transition: all 0.3s;
-        }
-        
-        .auth-switch a:hover {
-            text-decoration: underline;
-            color: var(--secondary-color);
-        }
-        
-        /* Avatar styling */
-        .user-avatar {
-            width: 45px;
-            height: 45px;
-            border-radius: 50%;
-            background: linear-gradient(45deg, var(--primary-color), var(--secondary-color));
-            color: white;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            font-weight: bold;
-            margin-right: 12px;
-            font-size: 18px;
-            box-shadow: 0 4px 10px rgba(0,0,0,0.2);
-            border: 2px solid rgba(255, 255, 255, 0.3);
-            text-shadow: 0 1px 2px rgba(0,0,0,0.3);
-        }
-        
-        /* Custom styling for buttons */
-        button[data-testid="baseButton-secondary"] {
-            background: rgba(255, 255, 255, 0.3) !important;
-            backdrop-filter: blur(5px) !important;
-            -webkit-backdrop-filter: blur(5px) !important;
-            border: 1px solid rgba(255, 255, 255, 0.2) !important;
-            box-shadow: 0 4px 10px rgba(0,0,0,0.1) !important;
-            transition: all 0.3s !important;
-        }
-        
-        button[data-testid="baseButton-secondary"]:hover {
-            background: rgba(255, 255, 255, 0.4) !important;
-            transform: translateY(-2px) !important;
-            box-shadow: 0 6px 15px rgba(0,0,0,0.15) !important;
-        }
-        
-        button[data-testid="baseButton-primary"] {
-            background: linear-gradient(45deg, var(--primary-color), var(--secondary-color)) !important;
-            border: none !important;
-            box-shadow: 0 4px 10px rgba(0,0,0,0.15) !important;
-            transition: all 0.3s !important;
-        }
-        
-        button[data-testid="baseButton-primary"]:hover {
-            transform: translateY(-2px) !important;
-            box-shadow: 0 8px 20px rgba(0,0,0,0.2) !important;
-        }
-        
-        /* Form inputs styling */
-        div[data-baseweb="input"] input, 
-        div[data-baseweb="textarea"] textarea,
-        div[data-baseweb="select"] div {
-            background: rgba(255, 255, 255, 0.2) !important;
-            border: 1px solid rgba(255, 255, 255, 0.2) !important;
-            border-radius: 10px !important;
-            transition: all 0.3s !important;
-        }
-        
-        div[data-baseweb="input"] input:focus,
-        div[data-baseweb="textarea"] textarea:focus,
-        div[data-baseweb="select"] div:focus-within {
-            background: rgba(255, 255, 255, 0.3) !important;
-            border-color: var(--primary-color) !important;
-            box-shadow: 0 0 0 2px rgba(142, 68, 173, 0.2) !important;
-        }
-        
-        /* Body background gradient for added effect */
-        body {
-            background: linear-gradient(135deg, #f5f7fa, #e8edf2);
-        }
-        
-        /* Custom scrollbar */
-        ::-webkit-scrollbar {
-            width: 10px;
-            background: rgba(255, 255, 255, 0.1);
-        }
-        
-        ::-webkit-scrollbar-thumb {
-            background: linear-gradient(to bottom, var(--primary-color), var(--secondary-color));
-            border-radius: 10px;
-        }
-        
-        ::-webkit-scrollbar-track {
-            background: rgba(255, 255, 255, 0.1);
-            border-radius: 10px;
-        }
-        </style>
-    """, unsafe_allow_html=True)
+    st.markdown(assets.stylesheet_markup(), unsafe_allow_html=True)
 
 local_css()
 
+# Per-user session state; rebuilt from storage whenever a user logs in
+def reset_user_state():
+    st.session_state.achievements = achievements.new_achievements()
+    st.session_state.challenges = achievements.new_challenges()
+    # Running totals, streaks and rule counters, updated on save instead of rescanning history
+    st.session_state.user_stats = achievements.new_counters()
+    st.session_state.workout_type_counts = {}
+    st.session_state.workout_days = streaks.DayIndex()
+    st.session_state.activity = activity.ActivityBitmap()
+    st.session_state.recent_workouts = None
+    # chart -> (start, end) day ordinals the user zoomed into
+    st.session_state.chart_zoom = {}
+    # widget key -> last value of a widget inside a lazy tab (see kept_widget)
+    st.session_state.kept_widgets = {}
+    # name -> (data version, args, result), one slot per tab query (see tab_data)
+    st.session_state.tab_data = {}
+    # Columnar copies of the user's records, for charting without re-querying
+    st.session_state.records = {tracker: record_store.ColumnStore(tracker) for tracker in record_store.SCHEMAS}
+    st.session_state.series = timeseries.build(st.session_state.records)
+
+def save_record(tracker, record):
+    # Persists a record and folds it into this session's in-memory copies
+    tracker_store.add_record(tracker, st.session_state.current_user['email'], record)
+    st.session_state.records[tracker].append(record)
+    if tracker in activity.TRACKERS:
+        st.session_state.activity.add(tracker, record['day'])
+    if tracker in timeseries.METRICS:
+        st.session_state.series[tracker].add(record['day'], record[timeseries.METRICS[tracker]['field']])
+
+def series_figure(tracker, chart, title, label, **chart_args):
+    # Shared chart adapter: a tracker's per-day series, combined per METRICS,
+    # over the zoomed range and downsampled to CHART_POINTS
+    metric = timeseries.METRICS[tracker]
+    start, end = zoom_range(tracker)
+    frame = st.session_state.series[tracker].chart_frame('day', metric['daily'], start, end, CHART_POINTS)
+    fig = chart(
+        frame,
+        x='date',
+        y=metric['field'],
+        title=title,
+        labels={metric['field']: label, 'date': 'Date'},
+        **chart_args
+    )
+    fig.update_layout(hovermode='x unified', dragmode='select')
+    return fig
+
+def tab_data(tracker, name, query, *args):
+    # Result of query(*args), reused across reruns until the args or the
+    # tracker's data version change. Each name keeps a single slot, so a new
+    # range or version replaces the old result instead of piling up.
+    version = st.session_state.records[tracker].version
+    cached = st.session_state.tab_data.get(name)
+    if cached is None or cached[:2] != (version, args):
+        cached = st.session_state.tab_data[name] = (version, args, query(*args))
+    return cached[2]
+
+def cached_figure(chart, version, time_frame, build):
+    # Figures come from the process-wide cache; build() runs only when the data version or time frame changed
+    return figures.cached_figure(st.session_state.current_user['email'], chart, version, time_frame, build)
+
+def keep_widget_value(key):
+    st.session_state.kept_widgets[key] = st.session_state[key]
+
+def kept_widget(key, **defaults):
+    # Widget arguments for a widget inside a lazy tab. Streamlit drops the state
+    # of widgets that are not rendered, so each change is copied to kept_widgets
+    # and the widget is reseeded from that copy when its tab opens again.
+    kept = st.session_state.kept_widgets
+    if key in kept and key not in st.session_state:
+        st.session_state[key] = kept[key]
+        defaults = {}
+    return {'key': key, 'on_change': keep_widget_value, 'args': (key,), **defaults}
+
+# Date charts send at most CHART_POINTS points, min/max downsampled (see
+# timeseries.py); box-selecting a range zooms in and re-requests just that
+# range, which is then shown at full resolution once it fits the budget
+CHART_POINTS = 400
+
+def zoom_range(chart, start=None, end=None):
+    # The chart's zoomed (start, end) day ordinals within [start, end]; None = open
+    zoom = st.session_state.chart_zoom.get(chart)
+    if zoom is None:
+        return start, end
+    return (zoom[0] if start is None else max(start, zoom[0]),
+            zoom[1] if end is None else min(end, zoom[1]))
+
+def select_zoom(chart):
+    # on_select callback: a box selection on a date chart becomes its zoom range
+    boxes = st.session_state[f"{chart}_chart"].selection['box']
+    if boxes:
+        start, end = sorted(pd.to_datetime(boxes[0]['x'], format='ISO8601'))
+        st.session_state.chart_zoom[chart] = (start.toordinal(), end.toordinal())
+
+def zoomable_chart(chart, fig):
+    # Renders a downsampled date chart whose box selection zooms in
+    st.plotly_chart(fig, use_container_width=True, key=f"{chart}_chart",
+                    on_select=partial(select_zoom, chart), selection_mode='box')
+    if chart in st.session_state.chart_zoom:
+        st.button("Show full range", key=f"{chart}_full_range",
+                  on_click=st.session_state.chart_zoom.pop, args=(chart, None))
+
+# Scatter charts with more points than this render with WebGL instead of SVG
+WEBGL_POINTS = 1000
+
+RECENT_WORKOUTS_PAGE = 5
+
+def load_recent_workouts():
+    # Appends the next page of newest-first workouts; the first call loads page one
+    recent = st.session_state.recent_workouts
+    if recent is None:
+        recent = st.session_state.recent_workouts = {'rows': [], 'cursor': None}
+    elif recent['cursor'] is None:
+        return
+    rows, recent['cursor'] = tracker_store.recent_records(
+        'workouts', st.session_state.current_user['email'], RECENT_WORKOUTS_PAGE, before=recent['cursor']
+    )
+    recent['rows'].extend(rows)
+
+def check_achievements(changed):
+    # Evaluates only the rules watching the changed counters
+    return achievements.evaluate(
+        st.session_state.user_stats, changed, st.session_state.achievements, st.session_state.challenges
+    )
+
+def restore_user_state(email):
+    # Rebuild stats, streaks, badges, indexes and record columns from storage
+    reset_user_state()
+    summary = tracker_store.workout_summary(email)
+    user_stats = st.session_state.user_stats
+    user_stats['total_workouts'] = summary['total_workouts']
+    user_stats['total_calories'] = summary['total_calories']
+    user_stats['total_duration'] = summary['total_duration']
+    st.session_state.workout_type_counts = summary['type_counts']
+    st.session_state.workout_days = streaks.DayIndex(summary['days'])
+    achievements.load_derived_counters(user_stats, summary['type_counts'], st.session_state.workout_days)
+    check_achievements(achievements.COUNTERS)
+    st.session_state.activity = activity.ActivityBitmap.from_days({
+        'workouts': summary['days'],
+        'steps': tracker_store.active_days('steps', email),
+        'water': tracker_store.active_days('water', email),
+    })
+    st.session_state.records = {
+        tracker: record_store.ColumnStore.from_records(tracker, tracker_store.fetch_records(tracker, email))
+        for tracker in record_store.SCHEMAS
+    }
+    st.session_state.series = timeseries.build(st.session_state.records)
+
 # Initialize Session State
-if 'workout_history' not in st.session_state:
-    st.session_state.workout_history = []
 if 'goals' not in st.session_state:
     st.session_state.goals = {'weekly_calories': 2000, 'weekly_duration': 150}
 if 'recommendations' not in st.session_state:
@@ -385,53 +207,10 @@ if 'recommendations' not in st.session_state:
         'Intermediate': ['Jogging (30 min)', 'Cycling (45 min)', 'Swimming (30 min)', 'Bodyweight exercises (20 min)'],
         'Advanced': ['HIIT (30 min)', 'Weight Training (45 min)', 'Running (5k)', 'Circuit training (40 min)']
     }
-if 'achievements' not in st.session_state:
-    st.session_state.achievements = {
-        'first_workout': {'earned': False, 'name': 'First Step', 'icon': '🎯', 'description': 'Log your first workout'},
-        'three_workouts': {'earned': False, 'name': 'Getting Started', 'icon': '🔥', 'description': 'Complete 3 workouts'},
-        'consistency': {'earned': False, 'name': 'Consistency King', 'icon': '👑', 'description': 'Work out 3 days in a row'},
-        'calorie_milestone': {'earned': False, 'name': 'Calorie Crusher', 'icon': '💪', 'description': 'Burn 500 total calories'},
-        'different_workouts': {'earned': False, 'name': 'Variety Pack', 'icon': '🌈', 'description': 'Try 3 different workout types'}
-    }
-if 'weight_tracker' not in st.session_state:
-    st.session_state.weight_tracker = []
-if 'step_tracker' not in st.session_state:
-    st.session_state.step_tracker = []
-if 'challenges' not in st.session_state:
-    st.session_state.challenges = [
-        {'id': 1, 'name': '7-Day Streak', 'description': 'Complete 7 workouts in 7 days', 'reward': '🏆 Gold Badge', 'completed': False},
-        {'id': 2, 'name': 'Cardio Master', 'description': 'Complete 5 cardio workouts', 'reward': '🏅 Silver Badge', 'completed': False},
-        {'id': 3, 'name': '1000 Calorie Burn', 'description': 'Burn a total of 1000 calories', 'reward': '🔥 Fire Badge', 'completed': False}
-    ]
 if 'user_stats' not in st.session_state:
-    st.session_state.user_stats = {
-        'total_workouts': 0,
-        'total_calories': 0,
-        'total_duration': 0,
-        'streak': 0,
-        'last_workout_date': None
-    }
-
-# User authentication system
-if 'users' not in st.session_state:
-    st.session_state.users = {
-        'demo@example.com': {
-            'password': 'password123',
-            'name': 'Demo User',
-            'profile_pic': '👤'
-        },
-        'john@example.com': {
-            'password': 'test123',
-            'name': 'John Smith',
-            'profile_pic': '🧑'
-        },
-        'jane@example.com': {
-            'password': 'test123',
-            'name': 'Jane Doe',
-            'profile_pic': '👩'
-        }
-    }
+    reset_user_state()
 
+# User authentication system (accounts live in the shared user_store, not in session state)
 if 'logged_in' not in st.session_state:
     st.session_state.logged_in = False
     
@@ -443,13 +222,10 @@ if 'login_error' not in st.session_state:
 
 # Login page handling
 def login_user(email, password):
-    if email in st.session_state.users and st.session_state.users[email]['password'] == password:
+    user = user_store.authenticate(email, password)
+    if user is not None:
         st.session_state.logged_in = True
-        st.session_state.current_user = {
-            'email': email,
-            'name': st.session_state.users[email]['name'],
-            'profile_pic': st.session_state.users[email]['profile_pic']
-        }
+        st.session_state.current_user = user
         st.session_state.login_error = False
         return True
     else:
@@ -459,12 +235,10 @@ def login_user(email, password):
 def logout_user():
     st.session_state.logged_in = False
     st.session_state.current_user = None
+    st.session_state.loaded_user = None
 
 # Registration function
 def register_user(name, email, password):
-    if email in st.session_state.users:
-        return False, "Email already registered"
-    
     # Generate profile pic from first letter of name
     profile_pic = '👤'
     if name:
@@ -478,11 +252,8 @@ def register_user(name, email, password):
             profile_pic = avatar_options[initials]
     
     # Add user to database
-    st.session_state.users[email] = {
-        'password': password,
-        'name': name,
-        'profile_pic': profile_pic
-    }
+    if not user_store.create_user(email, password, name, profile_pic):
+        return False, "Email already registered"
     
     # Automatically log in the new user
     login_user(email, password)
@@ -496,30 +267,17 @@ if not st.session_state.logged_in:
     
     # Background effects for login page
     st.markdown(
-        """
-        <div style="position: fixed; top: 0; left: 0; width: 100%; height: 100%; z-index: -1; overflow: hidden;">
-            <div style="position: absolute; width: 300px; height: 300px; top: -150px; left: -150px; 
-                 background: radial-gradient(circle, rgba(142, 68, 173, 0.2) 0%, rgba(142, 68, 173, 0.1) 40%, transparent 70%);
-                 border-radius: 50%;"></div>
-            <div style="position: absolute; width: 500px; height: 500px; bottom: -250px; right: -250px; 
-                 background: radial-gradient(circle, rgba(52, 152, 219, 0.2) 0%, rgba(52, 152, 219, 0.1) 40%, transparent 70%);
-                 border-radius: 50%;"></div>
-        </div>
-        """, 
+        '<div class="auth-backdrop"><div class="auth-orb purple"></div><div class="auth-orb blue"></div></div>',
         unsafe_allow_html=True
     )
     
     # Display animated fitness icons
     st.markdown(
         """
-        <div style="text-align: center; margin-bottom: 20px; animation: fadeIn 1s ease-in-out;">
-            <span style="font-size: 60px; margin: 0 15px; display: inline-block; animation: pulse 2s infinite;">🏋️</span>
-            <span style="font-size: 60px; margin: 0 15px; display: inline-block; animation: pulse 2s infinite 0.5s;">🏃</span>
-            <span style="font-size: 60px; margin: 0 15px; display: inline-block; animation: pulse 2s infinite 1s;">💪</span>
-        </div>
-        <div style="text-align: center; margin-bottom: 30px;">
-            <h1 style="font-size: 36px; color: #8e44ad; text-shadow: 0 2px 10px rgba(0,0,0,0.1);">Fitness Tracker Pro</h1>
-            <p style="font-size: 18px; color: #2c3e50; margin-top: 0;">Your Personal Workout Companion</p>
+        <div class="auth-icons"><span>🏋️</span><span>🏃</span><span>💪</span></div>
+        <div class="auth-title">
+            <h1>Fitness Tracker Pro</h1>
+            <p>Your Personal Workout Companion</p>
         </div>
         """, 
         unsafe_allow_html=True
@@ -611,23 +369,21 @@ if not st.session_state.logged_in:
     # Footer with benefits
     st.markdown(
         """
-        <div style="margin-top: 50px; text-align: center;">
-            <div style="display: flex; justify-content: center; gap: 40px; flex-wrap: wrap;">
-                <div style="text-align: center; max-width: 200px;">
-                    <div style="font-size: 32px; margin-bottom: 10px;">📊</div>
-                    <h3 style="margin: 0; color: #8e44ad;">Track Progress</h3>
-                    <p style="font-size: 14px; color: #7f8c8d;">Monitor your workouts and see your improvements over time</p>
-                </div>
-                <div style="text-align: center; max-width: 200px;">
-                    <div style="font-size: 32px; margin-bottom: 10px;">🎯</div>
-                    <h3 style="margin: 0; color: #8e44ad;">Set Goals</h3>
-                    <p style="font-size: 14px; color: #7f8c8d;">Create and achieve your personal fitness goals</p>
-                </div>
-                <div style="text-align: center; max-width: 200px;">
-                    <div style="font-size: 32px; margin-bottom: 10px;">🏆</div>
-                    <h3 style="margin: 0; color: #8e44ad;">Earn Rewards</h3>
-                    <p style="font-size: 14px; color: #7f8c8d;">Complete challenges and earn achievement badges</p>
-                </div>
+        <div class="auth-benefits">
+            <div class="auth-benefit">
+                <div>📊</div>
+                <h3>Track Progress</h3>
+                <p>Monitor your workouts and see your improvements over time</p>
+            </div>
+            <div class="auth-benefit">
+                <div>🎯</div>
+                <h3>Set Goals</h3>
+                <p>Create and achieve your personal fitness goals</p>
+            </div>
+            <div class="auth-benefit">
+                <div>🏆</div>
+                <h3>Earn Rewards</h3>
+                <p>Complete challenges and earn achievement badges</p>
             </div>
         </div>
         """, 
@@ -647,6 +403,12 @@ if not st.session_state.logged_in:
     # Hide the rest of the app when not logged in
     st.stop()
 
+# Restore the logged-in user's workout stats from storage once per login
+user_email = st.session_state.current_user['email']
+if st.session_state.get('loaded_user') != user_email:
+    restore_user_state(user_email)
+    st.session_state.loaded_user = user_email
+
 # Main Header with user profile
 col1, col2 = st.columns([3, 1])
 with col1:
@@ -660,14 +422,7 @@ with col2:
     
     # User profile with a cleaner design
     st.markdown(
-        f"""
-        <div style="display: flex; justify-content: flex-end; align-items: center; margin-top: 20px;">
-            <div style="display: flex; align-items: center;">
-                <div class="user-avatar">{user_pic}</div>
-                <span style="font-weight: bold;">{user_name}</span>
-            </div>
-        </div>
-        """,
+        f'<div class="profile-header"><div class="user-avatar">{user_pic}</div>{user_name}</div>',
         unsafe_allow_html=True
     )
     
@@ -683,17 +438,11 @@ with st.sidebar:
         user_name = st.session_state.current_user['name']
         st.markdown(
             f"""
-            <div style="display: flex; align-items: center; margin-bottom: 20px; background: var(--glass-bg); 
-                       backdrop-filter: blur(10px); -webkit-backdrop-filter: blur(10px); padding: 15px; 
-                       border-radius: 12px; border: 1px solid var(--glass-border); box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
-                <div style="width: 45px; height: 45px; border-radius: 50%; background: linear-gradient(45deg, var(--primary-color), var(--secondary-color));
-                           display: flex; align-items: center; justify-content: center; color: white; font-weight: bold; margin-right: 12px;
-                           box-shadow: 0 4px 10px rgba(0,0,0,0.15); border: 2px solid rgba(255, 255, 255, 0.3);">
-                    {st.session_state.current_user['profile_pic']}
-                </div>
+            <div class="welcome-card">
+                <div class="user-avatar">{st.session_state.current_user['profile_pic']}</div>
                 <div>
-                    <div style="font-size: 18px; font-weight: bold; color: var(--primary-color);">Welcome, {user_name}!</div>
-                    <div style="font-size: 14px; color: var(--light-text);">Ready to crush your fitness goals?</div>
+                    <div class="welcome-title">Welcome, {user_name}!</div>
+                    <div class="welcome-subtitle">Ready to crush your fitness goals?</div>
                 </div>
             </div>
             """,
@@ -712,7 +461,6 @@ with st.sidebar:
         heart_rate = st.slider("Heart Rate (bpm)", 60, 200, 80)
         body_temp = st.slider("Body Temperature (°C)", 36.0, 42.0, 38.0, 0.1)
         gender = st.radio("Gender", ("Male", "Female"))
-        gender_encoded = 1 if gender == "Male" else 0
         
         st.markdown("---")
         fitness_level = st.selectbox(
@@ -746,287 +494,318 @@ with st.sidebar:
             max_value=30000,
             value=st.session_state.goals['steps_goal']
         )
+        
+        if 'target_weight' not in st.session_state.goals:
+            st.session_state.goals['target_weight'] = 65.0
+        
+        st.session_state.goals['target_weight'] = st.number_input(
+            "Target Weight (kg)",
+            min_value=30.0,
+            max_value=250.0,
+            value=st.session_state.goals['target_weight'],
+            step=0.5
+        )
 
-# Create DataFrame for prediction
-df = pd.DataFrame({
-    "Age": [age],
-    "BMI": [bmi],
-    "Duration": [duration],
-    "Heart_Rate": [heart_rate],
-    "Body_Temp": [body_temp],
-    "Gender_male": [gender_encoded]
-})
-
-# Load and Process Data
-try:
-    calories = pd.read_csv("calories.csv")
-    exercise = pd.read_csv("exercise.csv")
-    dataset = exercise.merge(calories, on="User_ID").drop(columns="User_ID")
-    dataset["BMI"] = round(dataset["Weight"] / ((dataset["Height"] / 100) ** 2), 2)
-except Exception as e:
-    st.error(f"Error loading data: {e}")
-    st.stop()
-
-# Prepare Train/Test Data
-train_data, test_data = train_test_split(dataset, test_size=0.2, random_state=1)
-train_data = train_data[["Gender", "Age", "BMI", "Duration", "Heart_Rate", "Body_Temp", "Calories"]]
-test_data = test_data[["Gender", "Age", "BMI", "Duration", "Heart_Rate", "Body_Temp", "Calories"]]
-train_data = pd.get_dummies(train_data, drop_first=True)
-test_data = pd.get_dummies(test_data, drop_first=True)
+# Predict calories once the background model is ready (repeat inputs hit the prediction cache)
+predicted_calories = None
+if model_registry.is_ready():
+    predicted_calories = model_registry.predict_calories(
+        age=age,
+        bmi=bmi,
+        duration=duration,
+        heart_rate=heart_rate,
+        body_temp=body_temp,
+        gender=gender
+    )
 
-X_train, y_train = train_data.drop("Calories", axis=1), train_data["Calories"]
-X_test, y_test = test_data.drop("Calories", axis=1), test_data["Calories"]
+# Pending state for the prediction card; polls until the model is warm, then reruns the page
+@st.fragment(run_every=2)
+def model_pending_card():
+    if model_registry.is_ready():
+        st.rerun()
+    elif model_registry.warmup_error() is not None:
+        st.error(f"Error loading model: {model_registry.warmup_error()}")
+    else:
+        st.info("⏳ Preparing the calorie prediction model. Your prediction will appear here in a moment.")
 
-# Train Model
-model = RandomForestRegressor(n_estimators=1000, max_features=3, max_depth=6)
-model.fit(X_train, y_train)
+# Main Content
+# Lazy tabs: switching tabs reruns the page and only the open tab's body runs
+# (tabs(key=, on_change=) and tab.open need Streamlit 1.55+, see requirements.txt)
+tab1, tab2, tab3, tab4 = st.tabs(
+    ["Dashboard", "Progress Tracking", "Trackers", "Recommendations"], key="main_tabs", on_change="rerun"
+)
 
-# Make Prediction
-df = df.reindex(columns=X_train.columns, fill_value=0)
-prediction = model.predict(df)
+# Tabs, tracker panels and the workout form are fragments: a widget inside one
+# reruns only that fragment, skipping the CSS injection, the prediction and
+# every other tab. Saving a workout still reruns the page, since stats and
+# achievements change.
 
-# Main Content
-tab1, tab2, tab3, tab4 = st.tabs(["Dashboard", "Progress Tracking", "Trackers", "Recommendations"])
+# Recent workouts list; "Show more" pages it in place
+@st.fragment
+def recent_workouts_panel():
+    if st.session_state.recent_workouts is None:
+        load_recent_workouts()
+    recent_history = st.session_state.recent_workouts['rows']
+    if recent_history:
+        st.subheader("💪 Recent Workouts")
+        
+        for i, workout in enumerate(recent_history):
+            # Create a nicer workout card
+            st.markdown(
+                f"""
+                <div class="workout-card">
+                    <div class="workout-row">
+                        <div><b>{days.to_iso(workout['day'])}</b> • <b>{workout['type']}</b></div>
+                        <div><span>⏱️ {workout['duration']} min</span><span>🔥 {workout['calories']} kcal</span></div>
+                    </div>
+                    {f'<div class="workout-notes">{workout["notes"]}</div>' if workout.get('notes') else ''}
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
+        
+        if st.session_state.recent_workouts['cursor'] is not None:
+            st.button("Show more", key="show_more_workouts", on_click=load_recent_workouts)
 
-with tab1:
-    col1, col2 = st.columns(2)
+# Workout form; its widgets rerun only this fragment. Saving reruns the whole
+# app so the stats, calendar and recent workouts pick the workout up, and the
+# outcome is shown from session state on that run.
+@st.fragment
+def workout_form(predicted_calories, duration, heart_rate):
+    st.subheader("💪 Log Your Workout")
+    workout_date = st.date_input("Workout Date", **kept_widget("workout_date", value=datetime.now()))
+    workout_type = st.selectbox("Workout Type", [
+        "Walking", "Running", "Cycling", "Swimming", 
+        "Weight Training", "Yoga", "HIIT", "Other"
+    ], **kept_widget("workout_type"))
+    additional_notes = st.text_area("Notes (optional)", max_chars=200, **kept_widget("workout_notes"))
     
-    with col1:
-        st.subheader("🔥 Calories Burned Prediction")
-        calories_metric = st.metric(
-            "Predicted Calories",
-            f"{round(prediction[0], 2)} kcal",
-            delta=f"+{round(prediction[0]/10, 2)}%"
-        )
-        
-        # Display factors
-        st.write("Key factors affecting your calorie burn:")
-        factors = {
-            "Duration": f"{duration} min ({'high' if duration > 20 else 'moderate' if duration > 10 else 'low'} impact)",
-            "Heart Rate": f"{heart_rate} bpm ({'high' if heart_rate > 120 else 'moderate' if heart_rate > 90 else 'low'} intensity)",
-            "Body Temperature": f"{body_temp}°C ({'elevated' if body_temp > 38.5 else 'normal'})"
+    if st.button("Save Workout", type="primary", disabled=predicted_calories is None,
+                 help="Available once the calorie prediction is ready" if predicted_calories is None else None):
+        workout = {
+            'id': str(uuid.uuid4()),
+            'day': workout_date.toordinal(),
+            'type': workout_type,
+            'calories': round(predicted_calories, 2),
+            'duration': duration,
+            'heart_rate': heart_rate,
+            'notes': additional_notes
         }
+        save_record('workouts', workout)
         
-        for factor, value in factors.items():
-            st.write(f"• **{factor}**: {value}")
+        # Update user stats
+        changed = achievements.record_workout(
+            st.session_state.user_stats, st.session_state.workout_type_counts,
+            st.session_state.workout_days, workout
+        )
+        st.session_state.recent_workouts = None
         
-    with col2:
-        # Workout Form
-        st.subheader("💪 Log Your Workout")
-        workout_date = st.date_input("Workout Date", datetime.now())
-        workout_type = st.selectbox("Workout Type", [
-            "Walking", "Running", "Cycling", "Swimming", 
-            "Weight Training", "Yoga", "HIIT", "Other"
-        ])
-        additional_notes = st.text_area("Notes (optional)", max_chars=200)
-        
-        if st.button("Save Workout", type="primary"):
-            workout = {
-                'id': str(uuid.uuid4()),
-                'date': workout_date.strftime("%Y-%m-%d"),
-                'type': workout_type,
-                'calories': round(prediction[0], 2),
-                'duration': duration,
-                'heart_rate': heart_rate,
-                'notes': additional_notes
-            }
-            st.session_state.workout_history.append(workout)
-            
-            # Update user stats
-            st.session_state.user_stats['total_workouts'] += 1
-            st.session_state.user_stats['total_calories'] += workout['calories']
-            st.session_state.user_stats['total_duration'] += workout['duration']
-            
-            # Check and update achievements
-            achievements_earned = []
-            
-            # First workout achievement
-            if not st.session_state.achievements['first_workout']['earned']:
-                st.session_state.achievements['first_workout']['earned'] = True
-                achievements_earned.append(st.session_state.achievements['first_workout'])
-            
-            # Three workouts achievement
-            if st.session_state.user_stats['total_workouts'] >= 3 and not st.session_state.achievements['three_workouts']['earned']:
-                st.session_state.achievements['three_workouts']['earned'] = True
-                achievements_earned.append(st.session_state.achievements['three_workouts'])
-            
-            # Calorie milestone achievement
-            if st.session_state.user_stats['total_calories'] >= 500 and not st.session_state.achievements['calorie_milestone']['earned']:
-                st.session_state.achievements['calorie_milestone']['earned'] = True
-                achievements_earned.append(st.session_state.achievements['calorie_milestone'])
-            
-            # Different workouts achievement
-            unique_workouts = len(set([w['type'] for w in st.session_state.workout_history]))
-            if unique_workouts >= 3 and not st.session_state.achievements['different_workouts']['earned']:
-                st.session_state.achievements['different_workouts']['earned'] = True
-                achievements_earned.append(st.session_state.achievements['different_workouts'])
-            
-            # Streak achievement logic
-            today = datetime.strptime(workout_date.strftime("%Y-%m-%d"), "%Y-%m-%d")
-            if st.session_state.user_stats['last_workout_date']:
-                last_date = datetime.strptime(st.session_state.user_stats['last_workout_date'], "%Y-%m-%d")
-                date_diff = (today - last_date).days
-                
-                if date_diff == 1:  # Consecutive day
-                    st.session_state.user_stats['streak'] += 1
-                elif date_diff == 0:  # Same day, don't increment streak
-                    pass
-                else:  # Streak broken
-                    st.session_state.user_stats['streak'] = 1
+        # Check and update achievements and challenges
+        st.session_state.workout_saved = check_achievements(changed)
+        st.rerun(scope="app")
+    
+    saved = st.session_state.pop('workout_saved', None)
+    if saved is not None:
+        achievements_earned, challenges_completed = saved
+        for challenge in challenges_completed:
+            st.info(f"🎉 Challenge completed: {challenge['name']}! You earned: {challenge['reward']}")
+        
+        # Show achievements earned
+        st.success("Workout saved successfully!")
+        st.balloons()
+        
+        if achievements_earned:
+            st.markdown("### 🏆 Achievements Earned!")
+            for achievement in achievements_earned:
+                st.markdown(f"<div class='badge'>{achievement['icon']} {achievement['name']}: {achievement['description']}</div>", unsafe_allow_html=True)
+            st.markdown("---")
+
+with tab1:
+    if tab1.open:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("🔥 Calories Burned Prediction")
+            if predicted_calories is None:
+                model_pending_card()
             else:
-                st.session_state.user_stats['streak'] = 1
-                
-            st.session_state.user_stats['last_workout_date'] = workout_date.strftime("%Y-%m-%d")
-                
-            # Consistency achievement
-            if st.session_state.user_stats['streak'] >= 3 and not st.session_state.achievements['consistency']['earned']:
-                st.session_state.achievements['consistency']['earned'] = True
-                achievements_earned.append(st.session_state.achievements['consistency'])
+                calories_metric = st.metric(
+                    "Predicted Calories",
+                    f"{round(predicted_calories, 2)} kcal",
+                    delta=f"+{round(predicted_calories/10, 2)}%"
+                )
             
-            # Check and update challenges
-            for i, challenge in enumerate(st.session_state.challenges):
-                if not challenge['completed']:
-                    if challenge['id'] == 1 and st.session_state.user_stats['streak'] >= 7:
-                        st.session_state.challenges[i]['completed'] = True
-                        st.info(f"🎉 Challenge completed: {challenge['name']}! You earned: {challenge['reward']}")
-                    elif challenge['id'] == 2:
-                        cardio_workouts = sum(1 for w in st.session_state.workout_history 
-                                             if w['type'] in ['Running', 'Walking', 'Cycling', 'Swimming', 'HIIT'])
-                        if cardio_workouts >= 5:
-                            st.session_state.challenges[i]['completed'] = True
-                            st.info(f"🎉 Challenge completed: {challenge['name']}! You earned: {challenge['reward']}")
-                    elif challenge['id'] == 3 and st.session_state.user_stats['total_calories'] >= 1000:
-                        st.session_state.challenges[i]['completed'] = True
-                        st.info(f"🎉 Challenge completed: {challenge['name']}! You earned: {challenge['reward']}")
+            # Display factors
+            st.write("Key factors affecting your calorie burn:")
+            factors = {
+                "Duration": f"{duration} min ({'high' if duration > 20 else 'moderate' if duration > 10 else 'low'} impact)",
+                "Heart Rate": f"{heart_rate} bpm ({'high' if heart_rate > 120 else 'moderate' if heart_rate > 90 else 'low'} intensity)",
+                "Body Temperature": f"{body_temp}°C ({'elevated' if body_temp > 38.5 else 'normal'})"
+            }
             
-            # Show achievements earned
-            st.success("Workout saved successfully!")
-            st.balloons()
+            for factor, value in factors.items():
+                st.write(f"• **{factor}**: {value}")
             
-            if achievements_earned:
-                st.markdown("### 🏆 Achievements Earned!")
-                for achievement in achievements_earned:
-                    st.markdown(f"<div class='badge'>{achievement['icon']} {achievement['name']}: {achievement['description']}</div>", unsafe_allow_html=True)
-                st.markdown("---")
+        with col2:
+            workout_form(predicted_calories, duration, heart_rate)
 
-    # User Stats Dashboard
-    st.subheader("📊 Your Fitness Stats")
-    
-    # Stats cards
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        total_workouts = st.session_state.user_stats['total_workouts']
-        st.markdown(
-            f"""
-            <div class="workout-card" style="text-align: center;">
-                <div style="font-size: 36px; color: #FF4B4B;">🏋️</div>
-                <div style="font-size: 24px; font-weight: bold;">{total_workouts}</div>
-                <div style="font-size: 14px; color: #6c757d;">Total Workouts</div>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-    
-    with col2:
-        total_calories = st.session_state.user_stats['total_calories']
-        st.markdown(
-            f"""
-            <div class="workout-card" style="text-align: center;">
-                <div style="font-size: 36px; color: #FF4B4B;">🔥</div>
-                <div style="font-size: 24px; font-weight: bold;">{total_calories:.0f}</div>
-                <div style="font-size: 14px; color: #6c757d;">Calories Burned</div>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-    
-    with col3:
-        total_duration = st.session_state.user_stats['total_duration']
-        st.markdown(
-            f"""
-            <div class="workout-card" style="text-align: center;">
-                <div style="font-size: 36px; color: #FF4B4B;">⏱️</div>
-                <div style="font-size: 24px; font-weight: bold;">{total_duration:.0f}</div>
-                <div style="font-size: 14px; color: #6c757d;">Minutes Exercised</div>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-    
-    with col4:
-        streak = st.session_state.user_stats['streak']
-        st.markdown(
-            f"""
-            <div class="workout-card" style="text-align: center;">
-                <div style="font-size: 36px; color: #FF4B4B;">🔄</div>
-                <div style="font-size: 24px; font-weight: bold;">{streak}</div>
-                <div style="font-size: 14px; color: #6c757d;">Day Streak</div>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-    
-    # Recent Workouts
-    if st.session_state.workout_history:
-        st.subheader("💪 Recent Workouts")
-        recent_history = sorted(st.session_state.workout_history, 
-                              key=lambda x: x['date'], 
-                              reverse=True)[:5]
+        # User Stats Dashboard
+        st.subheader("📊 Your Fitness Stats")
         
-        for i, workout in enumerate(recent_history):
-            # Create a nicer workout card
+        # Stats cards
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            total_workouts = st.session_state.user_stats['total_workouts']
             st.markdown(
                 f"""
-                <div class="workout-card">
-                    <div style="display: flex; justify-content: space-between; align-items: center;">
-                        <div>
-                            <span style="font-weight: bold; color: #6A11CB;">{workout['date']}</span> • 
-                            <span style="font-weight: bold;">{workout['type']}</span>
-                        </div>
-                        <div>
-                            <span style="margin-right: 15px;">⏱️ {workout['duration']} min</span>
-                            <span>🔥 {workout['calories']} kcal</span>
-                        </div>
-                    </div>
-                    {f'<div style="margin-top: 5px; font-style: italic; color: #6c757d;">{workout["notes"]}</div>' if workout.get('notes') else ''}
+                <div class="workout-card stat-card">
+                    <div class="stat-icon">🏋️</div>
+                    <div class="stat-value">{total_workouts}</div>
+                    <div class="stat-label">Total Workouts</div>
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
+        
+        with col2:
+            total_calories = st.session_state.user_stats['total_calories']
+            st.markdown(
+                f"""
+                <div class="workout-card stat-card">
+                    <div class="stat-icon">🔥</div>
+                    <div class="stat-value">{total_calories:.0f}</div>
+                    <div class="stat-label">Calories Burned</div>
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
+        
+        with col3:
+            total_duration = st.session_state.user_stats['total_duration']
+            st.markdown(
+                f"""
+                <div class="workout-card stat-card">
+                    <div class="stat-icon">⏱️</div>
+                    <div class="stat-value">{total_duration:.0f}</div>
+                    <div class="stat-label">Minutes Exercised</div>
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
+        
+        with col4:
+            streak = st.session_state.user_stats['streak']
+            st.markdown(
+                f"""
+                <div class="workout-card stat-card">
+                    <div class="stat-icon">🔄</div>
+                    <div class="stat-value">{streak}</div>
+                    <div class="stat-label">Day Streak</div>
                 </div>
                 """,
                 unsafe_allow_html=True
             )
+        
+        # Activity calendar: the last 53 weeks, one cell per day shaded by how many trackers were logged
+        st.subheader("🗓️ Activity Calendar")
+        bitmap = st.session_state.activity
+        calendar_end = datetime.now().date()
+        calendar_start = calendar_end - timedelta(days=calendar_end.weekday() + 52 * 7)
+        
+        def calendar_figure():
+            calendar_days = (calendar_end - calendar_start).days + 1
+            day_levels = sum(
+                bitmap.day_flags(tracker, calendar_start, calendar_end).astype(float) for tracker in activity.TRACKERS
+            )
+            # Pad the current week so the grid is weekday rows x week columns
+            calendar_grid = np.full(53 * 7, np.nan)
+            calendar_grid[:calendar_days] = day_levels
+            calendar_grid = calendar_grid.reshape(53, 7).T
+            week_starts = [calendar_start + timedelta(weeks=week) for week in range(53)]
+            
+            fig = go.Figure(go.Heatmap(
+                z=calendar_grid,
+                x=week_starts,
+                y=['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'],
+                zmin=0,
+                zmax=len(activity.TRACKERS),
+                colorscale=[[0, '#ebedf0'], [0.34, '#9be9a8'], [0.67, '#40c463'], [1, '#216e39']],
+                xgap=3,
+                ygap=3,
+                showscale=False,
+                hovertemplate='Week of %{x|%b %d}, %{y}: %{z:.0f} tracker(s) logged<extra></extra>'
+            ))
+            fig.update_layout(
+                height=220,
+                margin=dict(t=10, b=10, l=10, r=10),
+                yaxis=dict(autorange='reversed'),
+                plot_bgcolor='rgba(0,0,0,0)'
+            )
+            return fig
+        
+        # The bitmap changes exactly when one of the calendar trackers' stores does
+        calendar_versions = tuple(st.session_state.records[tracker].version for tracker in activity.TRACKERS)
+        fig = cached_figure('calendar', calendar_versions, calendar_end.toordinal(), calendar_figure)
+        st.plotly_chart(fig, use_container_width=True)
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Active Days (Past Year)", bitmap.count(None, calendar_start, calendar_end))
+        with col2:
+            st.metric("Active Days This Month", bitmap.count(None, calendar_end.replace(day=1), calendar_end))
+        with col3:
+            st.metric("Longest Active Run", f"{bitmap.longest_run(None, calendar_start, calendar_end)} days")
+        
+        # Recent Workouts
+        recent_workouts_panel()
 
-with tab2:
+@st.fragment
+def progress_tab():
     st.subheader("📈 Progress Tracking")
     
-    if st.session_state.workout_history:
-        history_df = pd.DataFrame(st.session_state.workout_history)
-        
+    if st.session_state.user_stats['total_workouts']:
         # Time frame selection
         time_frame = st.radio(
             "Select Time Frame",
-            ["Last 7 days", "Last 30 days", "All time"],
-            horizontal=True
+            ["Last 7 days", "Last 30 days", "This month", "This year", "All time", "Custom range"],
+            horizontal=True,
+            **kept_widget("progress_time_frame")
         )
         
-        # Filter data based on time frame
-        end_date = datetime.now()
+        # Read the per-day rollups for the selected time frame (day ordinals)
+        end_day = days.today()
         if time_frame == "Last 7 days":
-            start_date = end_date - timedelta(days=7)
+            start_day = end_day - 6
         elif time_frame == "Last 30 days":
-            start_date = end_date - timedelta(days=30)
+            start_day = end_day - 29
+        elif time_frame == "This month":
+            start_day = days.month_start(end_day)
+        elif time_frame == "This year":
+            start_day = datetime.now().date().replace(month=1, day=1).toordinal()
+        elif time_frame == "Custom range":
+            picked_range = st.date_input(
+                "Date Range",
+                **kept_widget("progress_range",
+                              value=(datetime.now().date() - timedelta(days=29), datetime.now().date()))
+            )
+            # While only the first date is picked, show that single day
+            if picked_range:
+                start_day = picked_range[0].toordinal()
+                end_day = picked_range[-1].toordinal()
+            else:
+                start_day = end_day - 29
         else:
-            start_date = datetime.strptime("2000-01-01", "%Y-%m-%d")
-            
-        # Convert date string to datetime for filtering
-        history_df['date_dt'] = pd.to_datetime(history_df['date'])
-        filtered_df = history_df[(history_df['date_dt'] >= start_date) & (history_df['date_dt'] <= end_date)]
+            start_day = None
+        daily_rollups = tab_data('workouts', 'period_rollups', tracker_store.workout_rollups,
+                                 user_email, 'day', start_day, end_day)
         
-        if filtered_df.empty:
+        if not daily_rollups:
             st.info(f"No workout data available for the selected time frame ({time_frame}).")
         else:
             # Weekly Progress
-            weekly_calories = filtered_df.groupby('date')['calories'].sum().sum()
-            weekly_duration = filtered_df.groupby('date')['duration'].sum().sum()
+            weekly_calories = sum(day['calories'] for day in daily_rollups)
+            weekly_duration = sum(day['duration'] for day in daily_rollups)
             
             col1, col2 = st.columns(2)
             
@@ -1042,64 +821,175 @@ with tab2:
                          f"{round(weekly_duration, 2)}/{st.session_state.goals['weekly_duration']} min",
                          f"{round(duration_progress, 1)}%")
             
+            # Year-over-year: the same calendar range one year earlier
+            if start_day is not None:
+                last_year_rollups = tab_data(
+                    'workouts', 'last_year_rollups', tracker_store.workout_rollups,
+                    user_email, 'day', days.shift_years(start_day, -1), days.shift_years(end_day, -1)
+                )
+                last_year_calories = sum(day['calories'] for day in last_year_rollups)
+                last_year_workouts = sum(day['workouts'] for day in last_year_rollups)
+                period_workouts = sum(day['workouts'] for day in daily_rollups)
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric("Calories vs. Last Year",
+                             f"{round(weekly_calories, 2)} kcal",
+                             f"{round(weekly_calories - last_year_calories, 2)} kcal")
+                with col2:
+                    st.metric("Workouts vs. Last Year",
+                             period_workouts,
+                             period_workouts - last_year_workouts)
+            
             # Progress Visualizations
             st.subheader("Calories Burned Over Time")
             
-            # Group by date and calculate daily sum
-            daily_calories = filtered_df.groupby('date')['calories'].sum().reset_index()
-            daily_calories['date'] = pd.to_datetime(daily_calories['date'])
-            daily_calories = daily_calories.sort_values('date')
+            chart_interval = st.radio("Chart Interval", ["Daily", "Weekly", "Monthly"], horizontal=True,
+                                      **kept_widget("chart_interval"))
+            workout_store = st.session_state.records['workouts']
             
-            # Create interactive line chart
-            fig = px.line(
-                daily_calories, 
-                x='date', 
-                y='calories',
-                markers=True,
-                title='Daily Calories Burned'
-            )
-            fig.update_layout(
-                xaxis_title='Date',
-                yaxis_title='Calories (kcal)',
-                hovermode='x unified'
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            zoom_start, zoom_end = zoom_range('calories', start_day, end_day)
+            
+            def calories_figure():
+                period = {"Daily": 'day', "Weekly": 'week', "Monthly": 'month'}[chart_interval]
+                if (period, zoom_start, zoom_end) == ('day', start_day, end_day):
+                    interval_rollups = daily_rollups
+                else:
+                    interval_rollups = tab_data(
+                        'workouts', 'chart_rollups', tracker_store.workout_rollups,
+                        user_email, period, zoom_start, zoom_end
+                    )
+                calories = np.array([rollup['calories'] for rollup in interval_rollups])
+                kept = timeseries.downsample_indices(calories, CHART_POINTS)
+                daily_calories = pd.DataFrame({
+                    'date': days.to_datetime64([interval_rollups[i]['day'] for i in kept]),
+                    'calories': calories[kept]
+                })
+                
+                # Create interactive line chart
+                fig = px.line(
+                    daily_calories, 
+                    x='date', 
+                    y='calories',
+                    markers=True,
+                    title=f'{chart_interval} Calories Burned'
+                )
+                fig.update_layout(
+                    xaxis_title='Date',
+                    yaxis_title='Calories (kcal)',
+                    hovermode='x unified',
+                    dragmode='select'
+                )
+                return fig
+            
+            fig = cached_figure('calories', workout_store.version, (chart_interval, zoom_start, zoom_end),
+                                calories_figure)
+            zoomable_chart('calories', fig)
             
             # Workout Type Distribution
             st.subheader("Workout Type Distribution")
-            workout_counts = filtered_df['type'].value_counts().reset_index()
-            workout_counts.columns = ['Workout Type', 'Count']
             
-            fig = px.pie(
-                workout_counts, 
-                values='Count', 
-                names='Workout Type',
-                hole=0.4
-            )
-            fig.update_layout(
-                margin=dict(t=0, b=0, l=0, r=0),
-                showlegend=True
-            )
+            def workout_types_figure():
+                type_counts = tab_data('workouts', 'type_counts', tracker_store.workout_type_counts,
+                                       user_email, start_day, end_day)
+                workout_counts = pd.DataFrame(list(type_counts.items()), columns=['Workout Type', 'Count'])
+                
+                fig = px.pie(
+                    workout_counts, 
+                    values='Count', 
+                    names='Workout Type',
+                    hole=0.4
+                )
+                fig.update_layout(
+                    margin=dict(t=0, b=0, l=0, r=0),
+                    showlegend=True
+                )
+                return fig
+            
+            fig = cached_figure('workout_types', workout_store.version, (start_day, end_day), workout_types_figure)
             st.plotly_chart(fig, use_container_width=True)
             
             # Workout Intensity Analysis
             st.subheader("Workout Intensity Analysis")
-            intensity_df = filtered_df[['date', 'duration', 'heart_rate', 'calories']].copy()
             
-            fig = px.scatter(
-                intensity_df,
-                x='duration',
-                y='heart_rate',
-                size='calories',
-                color='calories',
-                hover_name='date',
-                title='Workout Intensity: Duration vs Heart Rate'
-            )
-            fig.update_layout(
-                xaxis_title='Duration (minutes)',
-                yaxis_title='Heart Rate (bpm)',
-                coloraxis_colorbar=dict(title='Calories')
-            )
+            col1, col2 = st.columns(2)
+            with col1:
+                intensity_view = st.radio("Intensity View", ["Scatter", "Density"], horizontal=True,
+                                          **kept_widget("intensity_view"))
+            with col2:
+                # Population: the reference exercise dataset, from the shared column cache
+                compare_population = st.checkbox("Compare with all exercisers", **kept_widget("intensity_population"))
+                population = dataset_cache.load_columns() if compare_population else None
+            
+            def intensity_figure():
+                intensity_df = workout_store.frame(
+                    ['day', 'duration', 'heart_rate', 'calories'], rows=workout_store.range_rows(start_day, end_day)
+                )
+                duration = intensity_df['duration'].to_numpy()
+                heart_rate = intensity_df['heart_rate'].to_numpy()
+                title = 'Workout Intensity: Duration vs Heart Rate'
+                
+                # One grid for the user's workouts and the population, binned with NumPy
+                x_samples, y_samples = [duration], [heart_rate]
+                if population is not None:
+                    x_samples.append(population['columns']['Duration'])
+                    y_samples.append(population['columns']['Heart_Rate'])
+                x_edges = figures.density_edges(*x_samples)
+                y_edges = figures.density_edges(*y_samples)
+                
+                if intensity_view == "Scatter":
+                    fig = px.scatter(
+                        intensity_df,
+                        x='duration',
+                        y='heart_rate',
+                        size='calories',
+                        color='calories',
+                        hover_name='date',
+                        render_mode='webgl' if len(intensity_df) > WEBGL_POINTS else 'svg',
+                        title=title
+                    )
+                    fig.update_layout(coloraxis_colorbar=dict(title='Calories'))
+                else:
+                    fig = go.Figure(layout=dict(title=title))
+                    if population is None:
+                        fig.add_heatmap(
+                            **figures.density(duration, heart_rate, x_edges, y_edges),
+                            colorscale='Blues',
+                            colorbar=dict(title='% of workouts'),
+                            hovertemplate='%{z:.1f}% of workouts<extra></extra>'
+                        )
+                
+                if population is not None:
+                    # Population distribution underneath the user's workouts
+                    fig.add_heatmap(
+                        **figures.density(x_samples[1], y_samples[1], x_edges, y_edges),
+                        colorscale='Greys',
+                        showscale=False,
+                        opacity=0.6,
+                        name='All exercisers',
+                        hovertemplate='%{z:.1f}% of all exercisers<extra></extra>'
+                    )
+                    fig.data = fig.data[-1:] + fig.data[:-1]
+                    if intensity_view == "Density":
+                        fig.add_contour(
+                            **figures.density(duration, heart_rate, x_edges, y_edges),
+                            contours_coloring='lines',
+                            colorscale='Reds',
+                            showscale=False,
+                            name='Your workouts',
+                            showlegend=True,
+                            hovertemplate='%{z:.1f}% of your workouts<extra></extra>'
+                        )
+                
+                fig.update_layout(
+                    xaxis_title='Duration (minutes)',
+                    yaxis_title='Heart Rate (bpm)'
+                )
+                return fig
+            
+            population_version = population['version'] if population is not None else None
+            fig = cached_figure('intensity', workout_store.version, (start_day, end_day, intensity_view, population_version),
+                                intensity_figure)
             st.plotly_chart(fig, use_container_width=True)
     else:
         st.info("No workout history available. Start logging your workouts to track progress!")
@@ -1120,378 +1010,322 @@ with tab2:
         fig.update_layout(xaxis_title='Date', yaxis_title='Calories (kcal)')
         st.plotly_chart(fig, use_container_width=True)
 
-with tab3:
-    st.subheader("📊 Health Trackers")
+with tab2:
+    if tab2.open:
+        progress_tab()
+
+@st.fragment
+def weight_panel():
+    st.subheader("⚖️ Weight Tracker")
     
-    # Create tabs for different trackers
-    weight_tab, steps_tab, water_tab = st.tabs(["Weight Tracker", "Step Counter", "Water Intake"])
+    # Weight tracking form
+    col1, col2 = st.columns(2)
     
-    with weight_tab:
-        st.subheader("⚖️ Weight Tracker")
-        
-        # Weight tracking form
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            weight_date = st.date_input("Date", datetime.now(), key="weight_date")
-            weight_value = st.number_input("Weight (kg)", min_value=30.0, max_value=250.0, value=70.0, step=0.1)
-        
-        with col2:
-            notes = st.text_area("Notes (optional)", max_chars=100, key="weight_notes")
-            if st.button("Log Weight", key="log_weight"):
-                weight_entry = {
-                    'id': str(uuid.uuid4()),
-                    'date': weight_date.strftime("%Y-%m-%d"),
-                    'weight': weight_value,
-                    'notes': notes
-                }
-                st.session_state.weight_tracker.append(weight_entry)
-                st.success("Weight logged successfully!")
-        
-        # Display weight progress
-        if st.session_state.weight_tracker:
-            st.markdown("### Weight Progress")
-            
-            # Convert data for chart
-            weight_df = pd.DataFrame(st.session_state.weight_tracker)
-            weight_df['date'] = pd.to_datetime(weight_df['date'])
-            weight_df = weight_df.sort_values('date')
-            
-            # Create line chart with smoothing
-            fig = px.line(
-                weight_df, 
-                x='date', 
-                y='weight',
-                markers=True,
-                title='Weight Over Time',
-                labels={'weight': 'Weight (kg)', 'date': 'Date'}
-            )
-            fig.update_traces(line=dict(shape='spline', smoothing=0.3))
-            fig.update_layout(hovermode='x unified')
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Weight statistics
-            if len(weight_df) > 1:
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    initial_weight = weight_df.iloc[0]['weight']
-                    latest_weight = weight_df.iloc[-1]['weight']
-                    st.metric(
-                        "Weight Change", 
-                        f"{round(latest_weight, 1)} kg", 
-                        f"{round(latest_weight - initial_weight, 1)} kg"
-                    )
-                
-                with col2:
-                    avg_weight = weight_df['weight'].mean()
-                    st.metric("Average Weight", f"{round(avg_weight, 1)} kg")
-                
-                with col3:
-                    if len(weight_df) >= 7:
-                        recent_weight = weight_df.iloc[-7:]['weight'].mean()
-                        st.metric("7-Day Average", f"{round(recent_weight, 1)} kg")
-                    else:
-                        st.metric("Recent Average", f"{round(avg_weight, 1)} kg")
-        else:
-            st.info("No weight data available. Start logging your weight to track progress!")
-            
-            # Example chart
-            dates = [(datetime.now() - timedelta(days=i*5)).strftime("%Y-%m-%d") for i in range(6, -1, -1)]
-            weights = [72.5, 72.2, 71.8, 71.5, 71.3, 71.0, 70.5]
-            example_df = pd.DataFrame({'date': dates, 'weight': weights})
-            example_df['date'] = pd.to_datetime(example_df['date'])
-            
-            fig = px.line(
-                example_df, 
-                x='date', 
-                y='weight', 
-                markers=True,
-                title='Example: Weight Progress Chart',
-                labels={'weight': 'Weight (kg)', 'date': 'Date'}
-            )
-            fig.update_traces(line=dict(shape='spline', smoothing=0.3))
-            st.plotly_chart(fig, use_container_width=True)
+    with col1:
+        weight_date = st.date_input("Date", **kept_widget("weight_date", value=datetime.now()))
+        weight_value = st.number_input("Weight (kg)", min_value=30.0, max_value=250.0, step=0.1,
+                                       **kept_widget("weight_value", value=70.0))
     
-    with steps_tab:
-        st.subheader("👣 Step Counter")
-        
-        # Step counting form
-        col1, col2 = st.columns(2)
+    with col2:
+        notes = st.text_area("Notes (optional)", max_chars=100, **kept_widget("weight_notes"))
+        if st.button("Log Weight", key="log_weight"):
+            weight_entry = {
+                'id': str(uuid.uuid4()),
+                'day': weight_date.toordinal(),
+                'weight': weight_value,
+                'notes': notes
+            }
+            save_record('weight', weight_entry)
+            st.success("Weight logged successfully!")
+    
+    # Display weight progress
+    weight_series = st.session_state.series['weight']
+    if len(weight_series):
+        st.markdown("### Weight Progress")
         
-        with col1:
-            step_date = st.date_input("Date", datetime.now(), key="step_date")
-            step_count = st.number_input("Steps", min_value=0, max_value=100000, value=5000, step=100)
+        # Create line chart with smoothing, plus the incrementally maintained trend lines
+        weight_trend = weight_series.trend
         
-        with col2:
-            distance = round(step_count * 0.0008, 2)  # Approximate conversion from steps to km
-            st.metric("Estimated Distance", f"{distance} km")
-            
-            if st.button("Log Steps", key="log_steps"):
-                step_entry = {
-                    'id': str(uuid.uuid4()),
-                    'date': step_date.strftime("%Y-%m-%d"),
-                    'steps': step_count,
-                    'distance': distance
-                }
-                st.session_state.step_tracker.append(step_entry)
-                st.success("Steps logged successfully!")
-        
-        # Display step progress
-        if st.session_state.step_tracker:
-            st.markdown("### Step Progress")
-            
-            # Calculate progress toward daily goal
-            steps_goal = st.session_state.goals['steps_goal']
-            latest_steps = step_count  # Default to input value
-            
-            # Find today's steps if they exist
-            today = datetime.now().strftime("%Y-%m-%d")
-            today_entries = [entry for entry in st.session_state.step_tracker if entry['date'] == today]
-            if today_entries:
-                latest_steps = today_entries[-1]['steps']
-            
-            # Progress bar
-            steps_progress = (latest_steps / steps_goal) * 100
-            st.markdown(f"**Today's Progress:** {latest_steps:,} / {steps_goal:,} steps ({round(steps_progress, 1)}%)")
-            st.markdown(
-                f"""
-                <div class="progress-container">
-                    <div class="progress-bar" style="width:{min(100, steps_progress)}%">
-                        {round(steps_progress)}%
-                    </div>
-                </div>
-                """, 
-                unsafe_allow_html=True
-            )
-            
-            # Display chart of steps over time
-            step_df = pd.DataFrame(st.session_state.step_tracker)
-            step_df['date'] = pd.to_datetime(step_df['date'])
-            step_df = step_df.sort_values('date')
+        def weight_figure():
+            fig = series_figure('weight', px.line, 'Weight Over Time', 'Weight (kg)', markers=True)
+            fig.update_traces(line=dict(shape='spline', smoothing=0.3))
+            # Trend lines over the same zoomed range and point budget
+            start, end = zoom_range('weight')
+            lo = 0 if start is None else np.searchsorted(weight_trend.days, start)
+            hi = len(weight_trend) if end is None else np.searchsorted(weight_trend.days, end, side='right')
+            trend_days = weight_trend.days[lo:hi]
+            for name, values, dash in [(f'{weight_trend.window_days}-day average', weight_trend.moving_average, 'dot'),
+                                       ('Exponential average', weight_trend.ewma, 'dash')]:
+                values = values[lo:hi]
+                kept = timeseries.downsample_indices(values, CHART_POINTS)
+                fig.add_scatter(x=days.to_datetime64(trend_days[kept]), y=values[kept], mode='lines',
+                                name=name, line=dict(dash=dash))
+            return fig
+        
+        fig = cached_figure('weight', st.session_state.records['weight'].version, zoom_range('weight'),
+                            weight_figure)
+        zoomable_chart('weight', fig)
+        
+        # Weight statistics
+        if len(weight_series) > 1:
+            col1, col2, col3 = st.columns(3)
             
-            # Group by date and sum steps (in case of multiple entries per day)
-            daily_steps = step_df.groupby('date')['steps'].sum().reset_index()
+            with col1:
+                initial_weight = weight_series.first()
+                latest_weight = weight_series.last()
+                st.metric(
+                    "Weight Change", 
+                    f"{round(latest_weight, 1)} kg", 
+                    f"{round(latest_weight - initial_weight, 1)} kg"
+                )
             
-            fig = px.bar(
-                daily_steps,
-                x='date',
-                y='steps',
-                title='Daily Steps',
-                labels={'steps': 'Steps', 'date': 'Date'}
-            )
-            fig.update_layout(hovermode='x unified')
-            st.plotly_chart(fig, use_container_width=True)
+            with col2:
+                avg_weight = weight_series.mean
+                st.metric("Average Weight", f"{round(avg_weight, 1)} kg")
             
-            # Step statistics
-            if len(daily_steps) > 1:
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    avg_steps = daily_steps['steps'].mean()
-                    st.metric("Average Steps", f"{int(avg_steps):,}")
-                
-                with col2:
-                    max_steps = daily_steps['steps'].max()
-                    st.metric("Best Day", f"{int(max_steps):,} steps")
-                
-                with col3:
-                    total_steps = daily_steps['steps'].sum()
-                    st.metric("Total Steps", f"{int(total_steps):,}")
-        else:
-            st.info("No step data available. Start logging your steps to track progress!")
+            with col3:
+                # Mean of the daily weights logged in the last 7 calendar days
+                recent_weight = weight_trend.current_average(days.today())
+                if recent_weight is not None:
+                    st.metric("7-Day Average", f"{round(recent_weight, 1)} kg")
+                else:
+                    st.metric("Recent Average", f"{round(avg_weight, 1)} kg")
             
-            # Sample progress bar
-            sample_progress = 65
-            st.markdown(f"**Example Progress:** 6,500 / 10,000 steps ({sample_progress}%)")
-            st.markdown(
-                f"""
-                <div class="progress-container">
-                    <div class="progress-bar" style="width:{sample_progress}%">
-                        {sample_progress}%
-                    </div>
-                </div>
-                """, 
-                unsafe_allow_html=True
-            )
+            # Goal forecast from a least-squares fit over the last 90 days
+            target_weight = st.session_state.goals.get('target_weight', 65.0)
+            weekly_rate, goal_day = weight_trend.forecast(target_weight, window_days=90)
+            if weekly_rate is not None:
+                weekly_rate *= 7
+                if abs(latest_weight - target_weight) < 0.05:
+                    forecast_text = "Goal reached 🎉"
+                elif goal_day is not None:
+                    forecast_text = days.to_iso(goal_day)
+                else:
+                    forecast_text = "Not on track"
+                st.metric(
+                    f"Forecast to reach {target_weight} kg",
+                    forecast_text,
+                    f"{weekly_rate:+.2f} kg/week",
+                    delta_color="off"
+                )
+    else:
+        st.info("No weight data available. Start logging your weight to track progress!")
+        
+        # Example chart
+        dates = [(datetime.now() - timedelta(days=i*5)).strftime("%Y-%m-%d") for i in range(6, -1, -1)]
+        weights = [72.5, 72.2, 71.8, 71.5, 71.3, 71.0, 70.5]
+        example_df = pd.DataFrame({'date': dates, 'weight': weights})
+        example_df['date'] = pd.to_datetime(example_df['date'])
+        
+        fig = px.line(
+            example_df, 
+            x='date', 
+            y='weight', 
+            markers=True,
+            title='Example: Weight Progress Chart',
+            labels={'weight': 'Weight (kg)', 'date': 'Date'}
+        )
+        fig.update_traces(line=dict(shape='spline', smoothing=0.3))
+        st.plotly_chart(fig, use_container_width=True)
+
+@st.fragment
+def steps_panel():
+    st.subheader("👣 Step Counter")
     
-    with water_tab:
-        st.subheader("💧 Water Intake Tracker")
-        
-        # Initialize water tracker if not exists
-        if 'water_tracker' not in st.session_state:
-            st.session_state.water_tracker = []
+    # Step counting form
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        step_date = st.date_input("Date", **kept_widget("step_date", value=datetime.now()))
+        step_count = st.number_input("Steps", min_value=0, max_value=100000, step=100,
+                                     **kept_widget("step_count", value=5000))
+    
+    with col2:
+        distance = round(step_count * 0.0008, 2)  # Approximate conversion from steps to km
+        st.metric("Estimated Distance", f"{distance} km")
         
-        # Water tracking form
-        col1, col2 = st.columns(2)
+        if st.button("Log Steps", key="log_steps"):
+            step_entry = {
+                'id': str(uuid.uuid4()),
+                'day': step_date.toordinal(),
+                'steps': step_count,
+                'distance': distance
+            }
+            save_record('steps', step_entry)
+            st.success("Steps logged successfully!")
+    
+    # Display step progress
+    step_series = st.session_state.series['steps']
+    if len(step_series):
+        st.markdown("### Step Progress")
+        
+        # Calculate progress toward daily goal
+        steps_goal = st.session_state.goals['steps_goal']
+        latest_steps = step_count  # Default to input value
+        
+        # Find today's steps if they exist
+        today_steps = step_series.day(days.today())
+        if today_steps:
+            latest_steps = int(today_steps['last'])
+        
+        # Progress bar
+        steps_progress = (latest_steps / steps_goal) * 100
+        st.markdown(f"**Today's Progress:** {latest_steps:,} / {steps_goal:,} steps ({round(steps_progress, 1)}%)")
+        st.markdown(
+            f"""
+            <div class="progress-container">
+                <div class="progress-bar" style="width:{min(100, steps_progress)}%">
+                    {round(steps_progress)}%
+                </div>
+            </div>
+            """, 
+            unsafe_allow_html=True
+        )
         
-        with col1:
-            water_date = st.date_input("Date", datetime.now(), key="water_date")
-            water_amount = st.number_input("Water (ml)", min_value=0, max_value=5000, value=250, step=50)
-            water_options = st.multiselect(
-                "Water Type", 
-                ["Water", "Coffee", "Tea", "Juice", "Sports Drink"],
-                default=["Water"]
-            )
+        # Display chart of daily step totals (multiple entries per day are summed)
+        fig = cached_figure('steps', st.session_state.records['steps'].version, zoom_range('steps'),
+                            lambda: series_figure('steps', px.bar, 'Daily Steps', 'Steps'))
+        zoomable_chart('steps', fig)
         
-        with col2:
-            # Daily recommendation (simplified)
-            recommended = 2500
+        # Step statistics
+        if step_series.periods('day') > 1:
+            col1, col2, col3 = st.columns(3)
             
-            # Calculate today's intake
-            today = datetime.now().strftime("%Y-%m-%d")
-            today_entries = [entry['amount'] for entry in st.session_state.water_tracker if entry['date'] == today]
-            today_total = sum(today_entries) if today_entries else 0
+            with col1:
+                avg_steps = step_series.total / step_series.periods('day')
+                st.metric("Average Steps", f"{int(avg_steps):,}")
             
-            # Display current hydration
-            st.metric(
-                "Today's Hydration", 
-                f"{today_total} ml", 
-                f"{round((today_total/recommended)*100, 1)}% of daily goal"
-            )
+            with col2:
+                max_steps = step_series.best('day')[1]['total']
+                st.metric("Best Day", f"{int(max_steps):,} steps")
             
-            if st.button("Log Water", key="log_water"):
-                water_entry = {
-                    'id': str(uuid.uuid4()),
-                    'date': water_date.strftime("%Y-%m-%d"),
-                    'amount': water_amount,
-                    'type': ', '.join(water_options)
-                }
-                st.session_state.water_tracker.append(water_entry)
-                st.success(f"{water_amount} ml logged successfully!")
-                
-                # Update today's total for display
-                if water_date.strftime("%Y-%m-%d") == today:
-                    today_total += water_amount
-        
-        # Visual representation of water intake
-        st.markdown("### Hydration Progress")
-        water_progress = min(100, (today_total / recommended) * 100)
+            with col3:
+                total_steps = step_series.total
+                st.metric("Total Steps", f"{int(total_steps):,}")
+    else:
+        st.info("No step data available. Start logging your steps to track progress!")
         
-        # Display progress with a water-themed progress bar
+        # Sample progress bar
+        sample_progress = 65
+        st.markdown(f"**Example Progress:** 6,500 / 10,000 steps ({sample_progress}%)")
         st.markdown(
             f"""
             <div class="progress-container">
-                <div class="progress-bar" style="width:{water_progress}%; background: linear-gradient(90deg, #4F8BFF, #36D1DC);">
-                    {round(water_progress)}%
+                <div class="progress-bar" style="width:{sample_progress}%">
+                    {sample_progress}%
                 </div>
             </div>
-            <p style="text-align: center; margin-top: 5px;">{today_total} ml of {recommended} ml daily goal</p>
             """, 
             unsafe_allow_html=True
         )
+
+@st.fragment
+def water_panel():
+    st.subheader("💧 Water Intake Tracker")
+    
+    # Water tracking form
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        water_date = st.date_input("Date", **kept_widget("water_date", value=datetime.now()))
+        water_amount = st.number_input("Water (ml)", min_value=0, max_value=5000, step=50,
+                                       **kept_widget("water_amount", value=250))
+        water_options = st.multiselect(
+            "Water Type", 
+            ["Water", "Coffee", "Tea", "Juice", "Sports Drink"],
+            **kept_widget("water_types", default=["Water"])
+        )
+    
+    with col2:
+        # Daily recommendation (simplified)
+        recommended = 2500
+        
+        # Calculate today's intake
+        water_series = st.session_state.series['water']
+        today = days.today()
+        today_intake = water_series.day(today)
+        today_total = int(today_intake['total']) if today_intake else 0
+        
+        # Display current hydration
+        st.metric(
+            "Today's Hydration", 
+            f"{today_total} ml", 
+            f"{round((today_total/recommended)*100, 1)}% of daily goal"
+        )
         
-        # Water intake over time chart
-        if st.session_state.water_tracker:
-            # Prepare data
-            water_df = pd.DataFrame(st.session_state.water_tracker)
-            water_df['date'] = pd.to_datetime(water_df['date'])
-            
-            # Group by date and sum amounts
-            daily_water = water_df.groupby('date')['amount'].sum().reset_index()
+        if st.button("Log Water", key="log_water"):
+            water_entry = {
+                'id': str(uuid.uuid4()),
+                'day': water_date.toordinal(),
+                'amount': water_amount,
+                'type': ', '.join(water_options)
+            }
+            save_record('water', water_entry)
+            st.success(f"{water_amount} ml logged successfully!")
             
-            # Create chart
-            fig = px.line(
-                daily_water,
-                x='date',
-                y='amount',
-                markers=True,
-                title='Daily Water Intake',
-                labels={'amount': 'Water (ml)', 'date': 'Date'}
-            )
+            # Update today's total for display
+            if water_date.toordinal() == today:
+                today_total += water_amount
+    
+    # Visual representation of water intake
+    st.markdown("### Hydration Progress")
+    water_progress = min(100, (today_total / recommended) * 100)
+    
+    # Display progress with a water-themed progress bar
+    st.markdown(
+        f"""
+        <div class="progress-container">
+            <div class="progress-bar water" style="width:{water_progress}%">
+                {round(water_progress)}%
+            </div>
+        </div>
+        <p class="progress-caption">{today_total} ml of {recommended} ml daily goal</p>
+        """, 
+        unsafe_allow_html=True
+    )
+    
+    # Water intake over time chart
+    if len(water_series):
+        # Create chart of daily totals
+        def water_figure():
+            fig = series_figure('water', px.line, 'Daily Water Intake', 'Water (ml)', markers=True)
             fig.add_hline(
                 y=recommended, 
                 line_dash="dash", 
                 line_color="green",
                 annotation_text="Daily goal"
             )
-            fig.update_layout(hovermode='x unified')
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.info("No water intake data available. Start logging your hydration to track progress!")
+            return fig
+        
+        fig = cached_figure('water', st.session_state.records['water'].version, (recommended, zoom_range('water')),
+                            water_figure)
+        zoomable_chart('water', fig)
+    else:
+        st.info("No water intake data available. Start logging your hydration to track progress!")
 
-with tab4:
-    st.subheader("💪 Workout Recommendations")
-    
-    # Determine fitness level based on model prediction if not manually selected
-    if 'fitness_level' not in locals():
-        if prediction[0] > 300:
-            fitness_level = "Advanced"
-        elif prediction[0] > 200:
-            fitness_level = "Intermediate"
-        else:
-            fitness_level = "Beginner"
-    
-    st.write(f"Based on your profile - **{fitness_level}** level:")
-    
-    # Create expandable sections for each recommendation
-    for i, workout in enumerate(st.session_state.recommendations[fitness_level]):
-        with st.expander(f"Recommendation {i+1}: {workout}"):
-            # Basic details about the workout
-            workout_name = workout.split(" (")[0]
-            duration_str = workout.split("(")[1].split(")")[0] if "(" in workout else "varies"
-            
-            # Show workout details
-            st.write(f"**Workout:** {workout_name}")
-            st.write(f"**Recommended Duration:** {duration_str}")
-            
-            # Benefits section
-            st.write("**Benefits:**")
-            
-            if "Walking" in workout_name:
-                st.write("• Improves cardiovascular health")
-                st.write("• Low impact exercise suitable for all fitness levels")
-                st.write("• Helps maintain healthy weight")
-                st.write("• Can be done anywhere with minimal equipment")
-            elif "Jogging" in workout_name or "Running" in workout_name:
-                st.write("• Burns calories effectively")
-                st.write("• Strengthens muscles and bones")
-                st.write("• Improves cardiovascular fitness")
-                st.write("• Enhances mental wellbeing through endorphin release")
-            elif "Cycling" in workout_name:
-                st.write("• Low-impact cardio workout")
-                st.write("• Strengthens lower body muscles")
-                st.write("• Improves joint mobility")
-                st.write("• Environmentally friendly transportation")
-            elif "Swimming" in workout_name:
-                st.write("• Full body workout")
-                st.write("• Zero impact on joints")
-                st.write("• Improves lung capacity and breathing")
-                st.write("• Effective for building endurance")
-            elif "HIIT" in workout_name:
-                st.write("• Maximum calorie burn in minimal time")
-                st.write("• Continues burning calories post-workout")
-                st.write("• Improves metabolic rate")
-                st.write("• No equipment necessary")
-            elif "Weight" in workout_name:
-                st.write("• Builds muscle mass")
-                st.write("• Increases resting metabolic rate")
-                st.write("• Improves functional strength")
-                st.write("• Enhances bone density")
-            elif "Yoga" in workout_name or "stretching" in workout_name:
-                st.write("• Improves flexibility and balance")
-                st.write("• Reduces stress and promotes relaxation")
-                st.write("• Enhances mind-body connection")
-                st.write("• Helps prevent injuries")
-            elif "Circuit" in workout_name:
-                st.write("• Combines strength and cardio benefits")
-                st.write("• Keeps workouts interesting and varied")
-                st.write("• Efficient full-body training")
-                st.write("• Adaptable to different fitness levels")
-            else:
-                st.write("• Provides variety to your fitness routine")
-                st.write("• Helps prevent plateaus in fitness progress")
-                st.write("• Can target specific muscle groups")
-                st.write("• Keeps workouts engaging and challenging")
-                
-            # Tips section
-            st.write("**Tips:**")
-            st.write("• Start with proper warm-up")
-            st.write("• Focus on proper form and technique")
-            st.write("• Stay hydrated before, during, and after workout")
-            st.write("• Listen to your body and adjust intensity as needed")
-            
-    # Custom workout generator
+with tab3:
+    if tab3.open:
+        st.subheader("📊 Health Trackers")
+        
+        # Create tabs for different trackers
+        weight_tab, steps_tab, water_tab = st.tabs(
+            ["Weight Tracker", "Step Counter", "Water Intake"], key="tracker_tabs", on_change="rerun"
+        )
+        
+        with weight_tab:
+            if weight_tab.open:
+                weight_panel()
+        
+        with steps_tab:
+            if steps_tab.open:
+                steps_panel()
+        
+        with water_tab:
+            if water_tab.open:
+                water_panel()
+
+@st.fragment
+def custom_workout_generator():
     st.subheader("🏋️ Custom Workout Generator")
     
     col1, col2 = st.columns(2)
@@ -1499,12 +1333,13 @@ with tab4:
     with col1:
         target_area = st.selectbox(
             "Target Area",
-            ["Full Body", "Upper Body", "Lower Body", "Core", "Cardio"]
+            ["Full Body", "Upper Body", "Lower Body", "Core", "Cardio"],
+            **kept_widget("generator_target")
         )
         available_equipment = st.multiselect(
             "Available Equipment",
             ["None/Bodyweight", "Dumbbells", "Resistance Bands", "Kettlebells", "Yoga Mat"],
-            default=["None/Bodyweight"]
+            **kept_widget("generator_equipment", default=["None/Bodyweight"])
         )
     
     with col2:
@@ -1512,12 +1347,13 @@ with tab4:
             "Workout Duration (minutes)",
             min_value=10,
             max_value=60,
-            value=30,
-            step=5
+            step=5,
+            **kept_widget("generator_duration", value=30)
         )
         intensity_preference = st.select_slider(
             "Intensity Level",
-            options=["Light", "Moderate", "Challenging", "Intense"]
+            options=["Light", "Moderate", "Challenging", "Intense"],
+            **kept_widget("generator_intensity")
         )
     
     if st.button("Generate Custom Workout"):
@@ -1593,22 +1429,119 @@ with tab4:
         st.markdown("4. Cool down and stretch for 5 minutes after completing all rounds")
         st.markdown("5. Adjust intensity as needed for your fitness level")
 
+with tab4:
+    if tab4.open:
+        st.subheader("💪 Workout Recommendations")
+        
+        # Determine fitness level based on model prediction if not manually selected
+        if 'fitness_level' not in locals() and predicted_calories is not None:
+            if predicted_calories > 300:
+                fitness_level = "Advanced"
+            elif predicted_calories > 200:
+                fitness_level = "Intermediate"
+            else:
+                fitness_level = "Beginner"
+        
+        st.write(f"Based on your profile - **{fitness_level}** level:")
+        
+        # Create expandable sections for each recommendation
+        for i, workout in enumerate(st.session_state.recommendations[fitness_level]):
+            with st.expander(f"Recommendation {i+1}: {workout}"):
+                # Basic details about the workout
+                workout_name = workout.split(" (")[0]
+                duration_str = workout.split("(")[1].split(")")[0] if "(" in workout else "varies"
+                
+                # Show workout details
+                st.write(f"**Workout:** {workout_name}")
+                st.write(f"**Recommended Duration:** {duration_str}")
+                
+                # Benefits section
+                st.write("**Benefits:**")
+                
+                if "Walking" in workout_name:
+                    st.write("• Improves cardiovascular health")
+                    st.write("• Low impact exercise suitable for all fitness levels")
+                    st.write("• Helps maintain healthy weight")
+                    st.write("• Can be done anywhere with minimal equipment")
+                elif "Jogging" in workout_name or "Running" in workout_name:
+                    st.write("• Burns calories effectively")
+                    st.write("• Strengthens muscles and bones")
+                    st.write("• Improves cardiovascular fitness")
+                    st.write("• Enhances mental wellbeing through endorphin release")
+                elif "Cycling" in workout_name:
+                    st.write("• Low-impact cardio workout")
+                    st.write("• Strengthens lower body muscles")
+                    st.write("• Improves joint mobility")
+                    st.write("• Environmentally friendly transportation")
+                elif "Swimming" in workout_name:
+                    st.write("• Full body workout")
+                    st.write("• Zero impact on joints")
+                    st.write("• Improves lung capacity and breathing")
+                    st.write("• Effective for building endurance")
+                elif "HIIT" in workout_name:
+                    st.write("• Maximum calorie burn in minimal time")
+                    st.write("• Continues burning calories post-workout")
+                    st.write("• Improves metabolic rate")
+                    st.write("• No equipment necessary")
+                elif "Weight" in workout_name:
+                    st.write("• Builds muscle mass")
+                    st.write("• Increases resting metabolic rate")
+                    st.write("• Improves functional strength")
+                    st.write("• Enhances bone density")
+                elif "Yoga" in workout_name or "stretching" in workout_name:
+                    st.write("• Improves flexibility and balance")
+                    st.write("• Reduces stress and promotes relaxation")
+                    st.write("• Enhances mind-body connection")
+                    st.write("• Helps prevent injuries")
+                elif "Circuit" in workout_name:
+                    st.write("• Combines strength and cardio benefits")
+                    st.write("• Keeps workouts interesting and varied")
+                    st.write("• Efficient full-body training")
+                    st.write("• Adaptable to different fitness levels")
+                else:
+                    st.write("• Provides variety to your fitness routine")
+                    st.write("• Helps prevent plateaus in fitness progress")
+                    st.write("• Can target specific muscle groups")
+                    st.write("• Keeps workouts engaging and challenging")
+                    
+                # Tips section
+                st.write("**Tips:**")
+                st.write("• Start with proper warm-up")
+                st.write("• Focus on proper form and technique")
+                st.write("• Stay hydrated before, during, and after workout")
+                st.write("• Listen to your body and adjust intensity as needed")
+                
+        # Custom workout generator
+        custom_workout_generator()
+
 # Generate Report
 if st.sidebar.button("Generate Fitness Report", type="primary"):
-    if not st.session_state.workout_history:
+    if not st.session_state.user_stats['total_workouts']:
         st.sidebar.warning("No workout history to generate report. Please log at least one workout.")
     else:
-        # Calculate stats for report
-        history_df = pd.DataFrame(st.session_state.workout_history)
-        total_workouts = len(history_df)
-        total_calories = history_df['calories'].sum()
-        total_duration = history_df['duration'].sum()
-        avg_calories = history_df['calories'].mean()
-        avg_duration = history_df['duration'].mean()
+        # Calculate stats for report from the running totals
+        total_workouts = st.session_state.user_stats['total_workouts']
+        total_calories = st.session_state.user_stats['total_calories']
+        total_duration = st.session_state.user_stats['total_duration']
+        avg_calories = total_calories / total_workouts
+        avg_duration = total_duration / total_workouts
+        
+        # Weekly goals are always measured over the last 7 days, whatever the Progress tab shows
+        week_rollups = tab_data('workouts', 'report_rollups', tracker_store.workout_rollups,
+                                user_email, 'day', days.today() - 6, days.today())
+        week_calories = sum(day['calories'] for day in week_rollups)
+        week_duration = sum(day['duration'] for day in week_rollups)
+        goal_progress = {
+            'calories': week_calories,
+            'calories_progress': week_calories / st.session_state.goals['weekly_calories'] * 100,
+            'duration': week_duration,
+            'duration_progress': week_duration / st.session_state.goals['weekly_duration'] * 100
+        }
         
         # Get most frequent workout type
-        if 'type' in history_df.columns:
-            most_frequent_type = history_df['type'].value_counts().idxmax()
+        type_counts = st.session_state.workout_type_counts
+        if type_counts:
+            most_frequent_type = max(type_counts, key=type_counts.get)
         else:
             most_frequent_type = "Not available"
         
@@ -1630,8 +1563,8 @@ if st.sidebar.button("Generate Fitness Report", type="primary"):
         - Favorite Workout Type: {most_frequent_type}
         
         PROGRESS TOWARDS GOALS:
-        - Weekly Calories: {weekly_calories:.2f}/{st.session_state.goals['weekly_calories']} kcal ({calories_progress:.1f}%)
-        - Weekly Duration: {weekly_duration:.2f}/{st.session_state.goals['weekly_duration']} minutes ({duration_progress:.1f}%)
+        - Weekly Calories: {goal_progress['calories']:.2f}/{st.session_state.goals['weekly_calories']} kcal ({goal_progress['calories_progress']:.1f}%)
+        - Weekly Duration: {goal_progress['duration']:.2f}/{st.session_state.goals['weekly_duration']} minutes ({goal_progress['duration_progress']:.1f}%)
         
         RECOMMENDED WORKOUTS ({fitness_level}):
         {chr(10).join(['- ' + w for w in st.session_state.recommendations[fitness_level]])}
@@ -1662,139 +1595,139 @@ st.markdown("---")
 st.subheader("🏆 Achievements & Challenges")
 
 # Display achievements in an interactive grid
-achievements_tab, challenges_tab, share_tab = st.tabs(["Achievements", "Challenges", "Share"])
+achievements_tab, challenges_tab, share_tab = st.tabs(
+    ["Achievements", "Challenges", "Share"], key="achievement_tabs", on_change="rerun"
+)
 
 with achievements_tab:
-    # Check earned achievements
-    earned_achievements = [a for a in st.session_state.achievements.values() if a['earned']]
-    locked_achievements = [a for a in st.session_state.achievements.values() if not a['earned']]
-    
-    if earned_achievements:
-        st.markdown("### Earned Badges")
+    if achievements_tab.open:
+        # Check earned achievements
+        earned_achievements = [a for a in st.session_state.achievements.values() if a['earned']]
+        locked_achievements = [a for a in st.session_state.achievements.values() if not a['earned']]
         
-        # Create a grid for badges
-        cols = st.columns(min(3, len(earned_achievements)))
-        for i, achievement in enumerate(earned_achievements):
-            with cols[i % 3]:
+        if earned_achievements:
+            st.markdown("### Earned Badges")
+            
+            # Create a grid for badges
+            cols = st.columns(min(3, len(earned_achievements)))
+            for i, achievement in enumerate(earned_achievements):
+                with cols[i % 3]:
+                    st.markdown(
+                        f"""
+                        <div class="badge-card">
+                            <div class="badge-icon">{achievement['icon']}</div>
+                            <div class="badge-name">{achievement['name']}</div>
+                            <div class="badge-description">{achievement['description']}</div>
+                        </div>
+                        """,
+                        unsafe_allow_html=True
+                    )
+        
+        if locked_achievements:
+            st.markdown("### Locked Achievements")
+            
+            # Create a grid for locked badges
+            cols = st.columns(min(3, len(locked_achievements)))
+            for i, achievement in enumerate(locked_achievements):
+                with cols[i % 3]:
+                    st.markdown(
+                        f"""
+                        <div class="badge-card locked">
+                            <div class="badge-icon">🔒</div>
+                            <div class="badge-name">{achievement['name']}</div>
+                            <div class="badge-description">{achievement['description']}</div>
+                        </div>
+                        """,
+                        unsafe_allow_html=True
+                    )
+        
+        if not earned_achievements and not locked_achievements:
+            st.info("Complete workouts to earn achievements!")
+
+with challenges_tab:
+    if challenges_tab.open:
+        active_challenges = [c for c in st.session_state.challenges if not c['completed']]
+        completed_challenges = [c for c in st.session_state.challenges if c['completed']]
+        
+        if active_challenges:
+            st.markdown("### Active Challenges")
+            
+            for challenge in active_challenges:
                 st.markdown(
                     f"""
-                    <div style="text-align: center; padding: 15px; background: linear-gradient(45deg, #6A11CB, #2575FC); 
-                         border-radius: 10px; margin: 5px; color: white; box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-                         transition: transform 0.3s ease;">
-                        <div style="font-size: 36px;">{achievement['icon']}</div>
-                        <div style="font-weight: bold; margin: 10px 0;">{achievement['name']}</div>
-                        <div style="font-size: 14px;">{achievement['description']}</div>
+                    <div class="challenge-card">
+                        <h4>{challenge['name']}</h4>
+                        <p>{challenge['description']}</p>
+                        <p><strong>Reward:</strong> {challenge['reward']}</p>
                     </div>
                     """,
                     unsafe_allow_html=True
                 )
-    
-    if locked_achievements:
-        st.markdown("### Locked Achievements")
         
-        # Create a grid for locked badges
-        cols = st.columns(min(3, len(locked_achievements)))
-        for i, achievement in enumerate(locked_achievements):
-            with cols[i % 3]:
+        if completed_challenges:
+            st.markdown("### Completed Challenges")
+            
+            for challenge in completed_challenges:
                 st.markdown(
                     f"""
-                    <div style="text-align: center; padding: 15px; background: #f8f9fa; 
-                         border-radius: 10px; margin: 5px; color: #6c757d; box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-                         filter: grayscale(100%); opacity: 0.7;">
-                        <div style="font-size: 36px;">🔒</div>
-                        <div style="font-weight: bold; margin: 10px 0;">{achievement['name']}</div>
-                        <div style="font-size: 14px;">{achievement['description']}</div>
+                    <div class="challenge-card completed">
+                        <h4>✅ {challenge['name']}</h4>
+                        <p>{challenge['description']}</p>
+                        <p><strong>Reward:</strong> {challenge['reward']}</p>
                     </div>
                     """,
                     unsafe_allow_html=True
                 )
-    
-    if not earned_achievements and not locked_achievements:
-        st.info("Complete workouts to earn achievements!")
-
-with challenges_tab:
-    active_challenges = [c for c in st.session_state.challenges if not c['completed']]
-    completed_challenges = [c for c in st.session_state.challenges if c['completed']]
-    
-    if active_challenges:
-        st.markdown("### Active Challenges")
-        
-        for challenge in active_challenges:
-            st.markdown(
-                f"""
-                <div class="challenge-card">
-                    <h4>{challenge['name']}</h4>
-                    <p>{challenge['description']}</p>
-                    <p><strong>Reward:</strong> {challenge['reward']}</p>
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
-    
-    if completed_challenges:
-        st.markdown("### Completed Challenges")
         
-        for challenge in completed_challenges:
-            st.markdown(
-                f"""
-                <div class="challenge-card" style="background: linear-gradient(135deg, #28a745, #20c997);">
-                    <h4>✅ {challenge['name']}</h4>
-                    <p>{challenge['description']}</p>
-                    <p><strong>Reward:</strong> {challenge['reward']}</p>
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
-    
-    if not active_challenges and not completed_challenges:
-        st.info("No active challenges found.")
+        if not active_challenges and not completed_challenges:
+            st.info("No active challenges found.")
 
 with share_tab:
-    st.markdown("### Share Your Progress")
-    
-    # Calculate overall stats for sharing
-    total_workouts = st.session_state.user_stats['total_workouts']
-    total_calories = st.session_state.user_stats['total_calories']
-    streak = st.session_state.user_stats['streak']
-    
-    share_message = f"I've completed {total_workouts} workouts and burned {total_calories:.0f} calories with my fitness tracker! 🏋️‍♀️"
-    
-    # Interactive share card
-    st.markdown(
-        f"""
-        <div style="background: linear-gradient(135deg, #6f42c1, #fd7e14); color: white; padding: 20px; 
-        border-radius: 15px; box-shadow: 0 4px 15px rgba(0,0,0,0.1); text-align: center; margin: 20px 0;">
-            <h3>My Fitness Journey</h3>
-            <p style="font-size: 18px;">🏋️‍♀️ Workouts: {total_workouts}</p>
-            <p style="font-size: 18px;">🔥 Calories Burned: {total_calories:.0f}</p>
-            <p style="font-size: 18px;">🔄 Current Streak: {streak} days</p>
-            <p style="font-size: 18px;">💪 Achievements: {len([a for a in st.session_state.achievements.values() if a['earned']])}</p>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-    
-    # Example platform buttons
-    st.markdown("### Share on:")
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        if st.button("📱 Twitter/X", type="primary"):
-            st.success("Twitter share link generated (example)")
-            st.code(f"https://twitter.com/intent/tweet?text={share_message}")
-    
-    with col2:
-        if st.button("📘 Facebook", type="primary"):
-            st.success("Facebook share link generated (example)")
-            st.code(f"https://www.facebook.com/sharer/sharer.php?u=https://fitnessapp.com&quote={share_message}")
-    
-    with col3:
-        if st.button("📧 Email", type="primary"):
-            st.success("Email share content generated (example)")
-            st.code(f"Subject: My Fitness Journey Update\nBody: {share_message}")
-    
-    # Copy to clipboard option
-    st.text_area("Or copy this text:", value=share_message, height=100)
+    if share_tab.open:
+        st.markdown("### Share Your Progress")
+        
+        # Calculate overall stats for sharing
+        total_workouts = st.session_state.user_stats['total_workouts']
+        total_calories = st.session_state.user_stats['total_calories']
+        streak = st.session_state.user_stats['streak']
+        
+        share_message = f"I've completed {total_workouts} workouts and burned {total_calories:.0f} calories with my fitness tracker! 🏋️‍♀️"
+        
+        # Interactive share card
+        st.markdown(
+            f"""
+            <div class="share-card">
+                <h3>My Fitness Journey</h3>
+                <p>🏋️‍♀️ Workouts: {total_workouts}</p>
+                <p>🔥 Calories Burned: {total_calories:.0f}</p>
+                <p>🔄 Current Streak: {streak} days</p>
+                <p>💪 Achievements: {len([a for a in st.session_state.achievements.values() if a['earned']])}</p>
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
+        
+        # Example platform buttons
+        st.markdown("### Share on:")
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            if st.button("📱 Twitter/X", type="primary"):
+                st.success("Twitter share link generated (example)")
+                st.code(f"https://twitter.com/intent/tweet?text={share_message}")
+        
+        with col2:
+            if st.button("📘 Facebook", type="primary"):
+                st.success("Facebook share link generated (example)")
+                st.code(f"https://www.facebook.com/sharer/sharer.php?u=https://fitnessapp.com&quote={share_message}")
+        
+        with col3:
+            if st.button("📧 Email", type="primary"):
+                st.success("Email share content generated (example)")
+                st.code(f"Subject: My Fitness Journey Update\nBody: {share_message}")
+        
+        # Copy to clipboard option
+        st.text_area("Or copy this text:", value=share_message, height=100)
 
 # Footer
 st.markdown("---")
@@ -0,0 +1,76 @@
+# Content-hashed static assets (the theme stylesheet)
+#
+# Files under STATIC_DIR are published as "<stem>.<hash><ext>", the hash being
+# the first 12 hex digits of the file's SHA-256, and served by server.py with a
+# one-year immutable Cache-Control, so a browser fetches each version once and
+# every rerun only sends a short @import. A changed file gets a new URL.
+# The route and the URLs sit under Streamlit's server.baseUrlPath, so they
+# keep working behind a path prefix.
+# Under a plain `streamlit run app.py` there is no asset route, and the
+# stylesheet is inlined as before.
+import hashlib
+import os
+
+from starlette.exceptions import HTTPException
+from starlette.responses import Response
+from starlette.routing import Route
+from streamlit import config
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+URL_PREFIX = "/assets"
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+CONTENT_TYPES = {'.css': "text/css; charset=utf-8"}
+
+_assets = {}  # hashed name -> (content, content type)
+_names = {}   # source name -> hashed name
+_state = {'served': False}
+
+
+def _load():
+    for name in sorted(os.listdir(STATIC_DIR)):
+        stem, ext = os.path.splitext(name)
+        if ext not in CONTENT_TYPES:
+            continue
+        with open(os.path.join(STATIC_DIR, name), "rb") as f:
+            content = f.read()
+        hashed = f"{stem}.{hashlib.sha256(content).hexdigest()[:12]}{ext}"
+        _assets[hashed] = (content, CONTENT_TYPES[ext])
+        _names[name] = hashed
+
+
+_load()
+
+
+def prefix():
+    # URL_PREFIX below the configured base path, e.g. "/fitness/assets"
+    base = (config.get_option("server.baseUrlPath") or "").strip("/")
+    return f"/{base}{URL_PREFIX}" if base else URL_PREFIX
+
+
+def url(name):
+    return f"{prefix()}/{_names[name]}"
+
+
+def text(name):
+    return _assets[_names[name]][0].decode()
+
+
+async def _serve(request):
+    asset = _assets.get(request.path_params['name'])
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    content, content_type = asset
+    return Response(content, media_type=content_type, headers={'Cache-Control': CACHE_CONTROL})
+
+
+def route():
+    # Starlette route for server.py; once mounted, pages link the hashed files
+    _state['served'] = True
+    return Route(prefix() + "/{name}", _serve)
+
+
+def stylesheet_markup(name="theme.css"):
+    if _state['served']:
+        return f'<style>@import url("{url(name)}");</style>'
+    return f"<style>{text(name)}</style>"
@@ -0,0 +1,63 @@
+# Embedded SQLite database shared by every session in the process
+#
+# Connections come from a small pool and run in WAL mode, so readers never
+# block each other or the single writer. Store modules register their tables
+# with register_schema() at import; pending schema is applied lazily the next
+# time a connection is handed out.
+from contextlib import contextmanager
+import os
+import queue
+import sqlite3
+import threading
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.environ.get("FITNESS_DB_PATH", os.path.join(BASE_DIR, "fitness.db"))
+POOL_SIZE = 8
+
+_pool = queue.LifoQueue()
+_schema = {'pending': [], 'applied': set()}
+_schema_lock = threading.Lock()
+
+
+def register_schema(name, script):
+    with _schema_lock:
+        if name not in _schema['applied']:
+            _schema['pending'].append((name, script))
+
+
+def _connect():
+    conn = sqlite3.connect(DB_PATH, timeout=30, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+
+def _apply_pending_schema(conn):
+    with _schema_lock:
+        while _schema['pending']:
+            # Dequeued only once applied, so a failed script is retried on the next connection
+            name, script = _schema['pending'][0]
+            conn.executescript(script)
+            _schema['pending'].pop(0)
+            _schema['applied'].add(name)
+
+
+@contextmanager
+def connection():
+    try:
+        conn = _pool.get_nowait()
+    except queue.Empty:
+        conn = _connect()
+    try:
+        if _schema['pending']:
+            _apply_pending_schema(conn)
+        yield conn
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        if _pool.qsize() < POOL_SIZE:
+            _pool.put(conn)
+        else:
+            conn.close()
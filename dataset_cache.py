@@ -0,0 +1,141 @@
+# Columnar training-set cache
+#
+# A one-time ingest parses calories.csv and exercise.csv, merges them, derives
+# BMI, encodes categorical columns as small-int codes and writes every column
+# as its own .npy file under CACHE_DIR/<version>/. Later loads memory-map those
+# files read-only, so no CSV parsing or merging happens and several server
+# processes share the same pages.
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE_DIR, "data_cache")
+DATA_FILES = {
+    'calories': os.path.join(BASE_DIR, "calories.csv"),
+    'exercise': os.path.join(BASE_DIR, "exercise.csv"),
+}
+
+# Bump when the ingested columns or their encoding change
+INGEST_SCHEMA = 2
+
+COLUMN_DTYPES = {
+    'Gender': np.uint8,
+    'Age': np.float64,
+    'Height': np.float64,
+    'Weight': np.float64,
+    'BMI': np.float64,
+    'Duration': np.float64,
+    'Heart_Rate': np.float64,
+    'Body_Temp': np.float64,
+    'Calories': np.float64,
+}
+
+_cache = {'entry': None}
+_cache_lock = threading.Lock()
+
+
+def data_signature():
+    # Cheap change detection (mtime + size) used to skip rehashing the CSVs
+    signature = []
+    for name, path in sorted(DATA_FILES.items()):
+        stat = os.stat(path)
+        signature.append((name, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def dataset_version():
+    digest = hashlib.sha256()
+    for name in sorted(DATA_FILES):
+        with open(DATA_FILES[name], "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    digest.update(json.dumps({'schema': INGEST_SCHEMA, 'columns': list(COLUMN_DTYPES)}).encode())
+    return digest.hexdigest()[:16]
+
+
+def version_dir(version):
+    return os.path.join(CACHE_DIR, version)
+
+
+def read_csv_dataset():
+    calories = pd.read_csv(DATA_FILES['calories'])
+    exercise = pd.read_csv(DATA_FILES['exercise'])
+    dataset = exercise.merge(calories, on="User_ID").drop(columns="User_ID")
+    dataset["BMI"] = round(dataset["Weight"] / ((dataset["Height"] / 100) ** 2), 2)
+    return dataset
+
+
+def ingest(version):
+    dataset = read_csv_dataset()
+    target = version_dir(version)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+
+    # Build in a private directory and rename it into place so readers only
+    # ever see a complete column set
+    tmp_dir = f"{target}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    categories = {}
+    for column, dtype in COLUMN_DTYPES.items():
+        values = dataset[column]
+        if not pd.api.types.is_numeric_dtype(values):
+            values = pd.Categorical(values)
+            categories[column] = list(values.categories)
+            values = values.codes
+        np.save(os.path.join(tmp_dir, f"{column}.npy"), np.asarray(values, dtype=dtype))
+    meta = {'version': version, 'rows': len(dataset), 'columns': list(COLUMN_DTYPES), 'categories': categories}
+    with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+        json.dump(meta, f)
+
+    try:
+        os.replace(tmp_dir, target)
+    except OSError:
+        # Another process finished the same ingest first
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    else:
+        remove_stale_versions(version)
+    return target
+
+
+def remove_stale_versions(version):
+    # Deletes the column sets of other versions. In-progress ".tmp" builds are
+    # left alone; a process still mapping an old version keeps its pages (and
+    # where the OS refuses to delete mapped files, the directory stays).
+    for name in os.listdir(CACHE_DIR):
+        if name != version and not name.endswith(".tmp"):
+            shutil.rmtree(os.path.join(CACHE_DIR, name), ignore_errors=True)
+
+
+def open_dataset(version):
+    target = version_dir(version)
+    meta_path = os.path.join(target, "meta.json")
+    if not os.path.exists(meta_path):
+        ingest(version)
+    with open(meta_path) as f:
+        meta = json.load(f)
+    columns = {
+        column: np.load(os.path.join(target, f"{column}.npy"), mmap_mode='r')
+        for column in COLUMN_DTYPES
+    }
+    return {'version': version, 'columns': columns, 'categories': meta['categories']}
+
+
+def load_columns():
+    # Process-wide: every session shares one set of read-only memory maps
+    signature = data_signature()
+    entry = _cache['entry']
+    if entry is not None and entry[0] == signature:
+        return entry[1]
+
+    with _cache_lock:
+        entry = _cache['entry']
+        if entry is None or entry[0] != signature:
+            entry = (signature, open_dataset(dataset_version()))
+            _cache['entry'] = entry
+        return entry[1]
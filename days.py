@@ -0,0 +1,50 @@
+# Canonical day representation shared by the stores and indexes
+#
+# In memory a day is an integer ordinal (date.toordinal()), set once when a
+# record is written; filtering, grouping and sorting compare integers. SQLite
+# keeps ISO "%Y-%m-%d" text, which its indexes range-compare natively, and
+# hands ordinals back via SQL_DAY. Strings are only produced for storage and
+# display, datetime64 only for charts.
+from datetime import date
+
+import numpy as np
+
+# Ordinal of 1970-01-01, the datetime64 epoch
+EPOCH_ORDINAL = 719163
+
+# SQL expression turning an ISO date column into its day ordinal
+SQL_DAY = "CAST(julianday({column}) - 1721424.5 AS INTEGER)"
+
+
+def to_ordinal(day):
+    # Accepts a date/datetime, an ISO "%Y-%m-%d" string or an ordinal
+    if isinstance(day, (int, np.integer)):
+        return int(day)
+    if isinstance(day, str):
+        return date.fromisoformat(day).toordinal()
+    return day.toordinal()
+
+
+def today():
+    return date.today().toordinal()
+
+
+def to_iso(day):
+    return date.fromordinal(day).isoformat()
+
+
+def month_start(day):
+    return date.fromordinal(day).replace(day=1).toordinal()
+
+
+def shift_years(day, years):
+    # Same calendar day `years` later (Feb 29 falls back to Feb 28)
+    d = date.fromordinal(day)
+    try:
+        return d.replace(year=d.year + years).toordinal()
+    except ValueError:
+        return d.replace(year=d.year + years, day=28).toordinal()
+
+
+def to_datetime64(ordinals):
+    return (np.asarray(ordinals, dtype=np.int64) - EPOCH_ORDINAL).astype("datetime64[D]")
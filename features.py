@@ -0,0 +1,74 @@
+# Fixed-schema feature encoder for the calorie model
+#
+# Fitted once next to the model and stored in the same artifact, so training
+# and serving always agree on the column layout. Raw inputs are written
+# straight into a float array in that layout: no DataFrame construction,
+# get_dummies or reindexing per prediction.
+import numpy as np
+
+# (raw input name, model column) in model column order
+NUMERIC_FEATURES = [
+    ('age', "Age"),
+    ('bmi', "BMI"),
+    ('duration', "Duration"),
+    ('heart_rate', "Heart_Rate"),
+    ('body_temp', "Body_Temp"),
+]
+
+
+class FeatureEncoder:
+    def __init__(self, gender_categories):
+        self.gender_categories = [str(c).lower() for c in gender_categories]
+        # One-hot with the first category dropped, as pd.get_dummies(drop_first=True)
+        self.columns = [column for _, column in NUMERIC_FEATURES]
+        self.columns += [f"Gender_{c}" for c in self.gender_categories[1:]]
+
+        first_dummy = len(NUMERIC_FEATURES)
+        # Column index set to 1.0 per gender code; None for the dropped category
+        self._gender_slots = [None] + list(range(first_dummy, first_dummy + len(self.gender_categories) - 1))
+        self._gender_codes = {c: i for i, c in enumerate(self.gender_categories)}
+
+    @classmethod
+    def fit(cls, gender_labels):
+        return cls(sorted({str(label).lower() for label in gender_labels}))
+
+    @property
+    def n_features(self):
+        return len(self.columns)
+
+    def gender_code(self, gender):
+        try:
+            return self._gender_codes[str(gender).lower()]
+        except KeyError:
+            raise ValueError(f"Unknown gender {gender!r}, expected one of {self.gender_categories}") from None
+
+    def encode_row(self, age, bmi, duration, heart_rate, body_temp, gender, out=None):
+        if out is None:
+            out = np.empty((1, self.n_features), dtype=np.float64)
+        row = out[0]
+        row[0] = age
+        row[1] = bmi
+        row[2] = duration
+        row[3] = heart_rate
+        row[4] = body_temp
+        row[len(NUMERIC_FEATURES):] = 0.0
+        slot = self._gender_slots[self.gender_code(gender)]
+        if slot is not None:
+            row[slot] = 1.0
+        return out
+
+    def encode_batch(self, age, bmi, duration, heart_rate, body_temp, gender, out=None):
+        # gender may be labels ("male") or integer codes into gender_categories
+        gender = np.asarray(gender)
+        if gender.dtype.kind not in "iub":
+            gender = np.fromiter((self.gender_code(g) for g in gender), dtype=np.intp, count=len(gender))
+
+        n_rows = len(gender)
+        if out is None:
+            out = np.empty((n_rows, self.n_features), dtype=np.float64)
+        for i, values in enumerate((age, bmi, duration, heart_rate, body_temp)):
+            out[:, i] = values
+        for code, slot in enumerate(self._gender_slots):
+            if slot is not None:
+                np.equal(gender, code, out=out[:, slot], casting='unsafe')
+        return out
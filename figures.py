@@ -0,0 +1,41 @@
+# Process-wide cache of built Plotly figures
+#
+# Keyed by (user, chart, data version, time frame). Data versions come from
+# record_store and change on every append, so a hit is always current and
+# stale figures simply age out of the LRU.
+#
+# Density charts are binned here with NumPy; Plotly only receives the grid.
+import os
+
+import numpy as np
+
+from caching import LRUCache
+
+FIGURE_CACHE_SIZE = int(os.environ.get("FITNESS_FIGURE_CACHE_SIZE", 512))
+figure_cache = LRUCache(FIGURE_CACHE_SIZE)
+
+DENSITY_BINS = 30
+
+
+def cached_figure(user, chart, version, time_frame, build):
+    # build() runs only on a miss; callers must not mutate the returned figure
+    return figure_cache.get_or_compute((user, chart, version, time_frame), build)
+
+
+def density_edges(*samples, bins=DENSITY_BINS):
+    # bins + 1 evenly spaced edges spanning every sample
+    samples = [np.asarray(sample) for sample in samples if len(sample)]
+    lo = min((float(sample.min()) for sample in samples), default=0.0)
+    hi = max((float(sample.max()) for sample in samples), default=1.0)
+    return np.linspace(lo, hi if hi > lo else lo + 1, bins + 1)
+
+
+def density(x, y, x_edges, y_edges):
+    # Share (%) of the points in each (x, y) bin, as go.Heatmap / go.Contour arguments
+    counts, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges])
+    total = counts.sum()
+    return {
+        'x': (x_edges[:-1] + x_edges[1:]) / 2,
+        'y': (y_edges[:-1] + y_edges[1:]) / 2,
+        'z': counts.T * (100 / total) if total else counts.T,
+    }
@@ -0,0 +1,153 @@
+# Vectorized inference for the calorie RandomForest
+#
+# The fitted forest is exported into flat NumPy node arrays. Every tree is
+# padded to a perfect binary tree of the forest's depth and stored in heap
+# order (children of node i are 2i+1 and 2i+2), so a batch of rows walks all
+# trees at once with only array arithmetic and gathers: no per-tree Python
+# loop, no pandas objects and no sklearn per-call validation.
+#
+# tests/test_forest_engine.py checks exact parity with model.predict on a
+# held-out split. Run `python forest_engine.py` for the served model's parity
+# on X_test plus single-row and 10k-row timings.
+import numpy as np
+
+# Rows x trees walked per chunk; keeps the scratch buffers cache-sized
+_CHUNK_CELLS = 1 << 16
+# Padding doubles per level, so only shallow forests are exported
+MAX_DEPTH = 16
+
+
+def _float32_floor(threshold):
+    # Largest float32 <= threshold. For float32 inputs x, `x > floor` is
+    # exactly `x > threshold`, which is the comparison sklearn trees make
+    floor = threshold.astype(np.float32)
+    over = floor.astype(np.float64) > threshold
+    floor[over] = np.nextafter(floor[over], np.float32(-np.inf))
+    return floor
+
+
+class ForestEngine:
+    def __init__(self, feature, threshold, value, depth):
+        # feature/threshold: (n_trees, 2**depth - 1) internal nodes in heap order
+        # value: (n_trees, 2**depth) leaf predictions
+        self.feature = feature
+        self.threshold = threshold
+        self.value = value
+        self.depth = depth
+
+    @classmethod
+    def from_estimator(cls, forest):
+        depth = max(estimator.tree_.max_depth for estimator in forest.estimators_)
+        if depth > MAX_DEPTH:
+            raise ValueError(f"Forest depth {depth} exceeds the supported maximum of {MAX_DEPTH}")
+
+        n_trees = len(forest.estimators_)
+        n_internal = 2 ** depth - 1
+        feature = np.zeros((n_trees, n_internal), dtype=np.intp)
+        # +inf never compares greater, so padded nodes always go left
+        threshold = np.full((n_trees, n_internal), np.inf, dtype=np.float64)
+        value = np.zeros((n_trees, n_internal + 1), dtype=np.float64)
+
+        for t, estimator in enumerate(forest.estimators_):
+            tree = estimator.tree_
+            stack = [(0, 0, 0)]  # (sklearn node id, heap index, level)
+            while stack:
+                node, heap, level = stack.pop()
+                if level == depth:
+                    value[t, heap - n_internal] = tree.value[node, 0, 0]
+                elif tree.children_left[node] == -1:
+                    # Leaf above the bottom level: copy it into both padded subtrees
+                    stack.append((node, 2 * heap + 1, level + 1))
+                    stack.append((node, 2 * heap + 2, level + 1))
+                else:
+                    feature[t, heap] = tree.feature[node]
+                    threshold[t, heap] = tree.threshold[node]
+                    stack.append((tree.children_left[node], 2 * heap + 1, level + 1))
+                    stack.append((tree.children_right[node], 2 * heap + 2, level + 1))
+
+        return cls(feature.ravel(), _float32_floor(threshold.ravel()), value.ravel(), depth)
+
+    @property
+    def n_trees(self):
+        return len(self.value) >> self.depth
+
+    def predict(self, X):
+        # sklearn trees see float32 inputs; cast the same way for identical splits
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        out = np.empty(len(X), dtype=np.float64)
+        step = max(1, _CHUNK_CELLS // self.n_trees)
+        for start in range(0, len(X), step):
+            out[start:start + step] = self._predict_chunk(X[start:start + step])
+        return out
+
+    def _predict_chunk(self, X):
+        n_rows = len(X)
+        n_internal = 2 ** self.depth - 1
+        trees = np.arange(self.n_trees, dtype=np.intp)[:, None]
+        node_base = trees * n_internal
+        leaf_base = trees * (n_internal + 1) - n_internal
+
+        # Column-major inputs: value of feature f for row r sits at f * n_rows + r
+        columns = np.ascontiguousarray(X.T).ravel()
+        feature_offset = self.feature * n_rows
+        rows = np.arange(n_rows, dtype=np.intp)[None, :]
+
+        shape = (self.n_trees, n_rows)
+        heap = np.zeros(shape, dtype=np.intp)
+        node = np.empty(shape, dtype=np.intp)
+        cell = np.empty(shape, dtype=np.intp)
+        x = np.empty(shape, dtype=np.float32)
+        threshold = np.empty(shape, dtype=np.float32)
+        go_right = np.empty(shape, dtype=bool)
+
+        for _ in range(self.depth):
+            np.add(node_base, heap, out=node)
+            np.take(feature_offset, node, out=cell)
+            cell += rows
+            np.take(columns, cell, out=x)
+            np.take(self.threshold, node, out=threshold)
+            np.greater(x, threshold, out=go_right)
+            heap *= 2
+            heap += 1
+            heap += go_right
+
+        heap += leaf_base
+        return self.value.take(heap).mean(axis=0)
+
+
+if __name__ == "__main__":
+    import time
+
+    import pandas as pd
+
+    import dataset_cache
+    import model_registry
+
+    artifact = model_registry.get_model()
+    model = artifact['model']
+    engine = ForestEngine.from_estimator(model)
+    _, _, X_test, _ = model_registry.split_dataset(dataset_cache.load_columns(), artifact['encoder'])
+    X = X_test.to_numpy()
+
+    expected = model.predict(X_test)
+    actual = engine.predict(X)
+    print(f"parity on X_test ({len(X)} rows): max abs diff {np.abs(expected - actual).max():.3g}")
+    assert np.allclose(expected, actual)
+
+    def best_of(fn, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    single = X_test.iloc[:1]
+    batch = np.resize(X, (10_000, X.shape[1]))
+    batch_df = pd.DataFrame(batch, columns=X_test.columns)
+    print(f"1 row:       sklearn {best_of(lambda: model.predict(single), 20) * 1e3:8.2f} ms"
+          f"   engine {best_of(lambda: engine.predict(X[:1]), 20) * 1e3:8.2f} ms")
+    print(f"10k rows:    sklearn {best_of(lambda: model.predict(batch_df), 3) * 1e3:8.2f} ms"
+          f"   engine {best_of(lambda: engine.predict(batch), 3) * 1e3:8.2f} ms")
@@ -0,0 +1,189 @@
+# Calorie model registry
+#
+# Trains the calorie RandomForest once, persists it to MODEL_DIR as a versioned
+# artifact and serves it from a process-wide cache. The artifact version is a
+# hash of the training CSVs plus the hyperparameters, so a model is only
+# retrained when the data or the configuration changes.
+import hashlib
+import json
+import os
+import threading
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.model_selection import train_test_split
+
+from caching import LRUCache
+import dataset_cache
+from features import FeatureEncoder
+from forest_engine import ForestEngine
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_DIR = os.path.join(BASE_DIR, "models")
+
+# Bump when the artifact layout or the feature pipeline changes
+ARTIFACT_SCHEMA = 4
+
+# Fixed random_state keeps the fitted forest (and its predictions) deterministic
+MODEL_PARAMS = {'n_estimators': 1000, 'max_features': 3, 'max_depth': 6, 'random_state': 1}
+SPLIT_PARAMS = {'test_size': 0.2, 'random_state': 1}
+TARGET = "Calories"
+
+# Memoized predictions, shared by every session in the process
+PREDICTION_CACHE_SIZE = int(os.environ.get("FITNESS_PREDICTION_CACHE_SIZE", 4096))
+prediction_cache = LRUCache(PREDICTION_CACHE_SIZE)
+
+# (data signature, artifact) of the model currently served by this process
+_cache = {'entry': None}
+_cache_lock = threading.Lock()
+
+# Background model preparation started at process boot
+_warmup = {'thread': None, 'error': None}
+_warmup_lock = threading.Lock()
+
+
+def fit_encoder(dataset):
+    return FeatureEncoder.fit(dataset['categories']['Gender'])
+
+
+def split_dataset(dataset, encoder):
+    columns = dataset['columns']
+    # Same row split train_test_split produced on the merged DataFrame
+    train_idx, test_idx = train_test_split(np.arange(len(columns[TARGET])), **SPLIT_PARAMS)
+    features = encoder.encode_batch(
+        age=columns['Age'],
+        bmi=columns['BMI'],
+        duration=columns['Duration'],
+        heart_rate=columns['Heart_Rate'],
+        body_temp=columns['Body_Temp'],
+        gender=columns['Gender'],
+    )
+    X = pd.DataFrame(features, columns=encoder.columns)
+    y = np.asarray(columns[TARGET])
+    return X.iloc[train_idx], y[train_idx], X.iloc[test_idx], y[test_idx]
+
+
+def artifact_version(dataset_version, params=None):
+    # Hash of the training data version and everything that shapes the model
+    params = MODEL_PARAMS if params is None else params
+    config = {'schema': ARTIFACT_SCHEMA, 'model': params, 'split': SPLIT_PARAMS}
+    digest = hashlib.sha256(dataset_version.encode())
+    digest.update(json.dumps(config, sort_keys=True).encode())
+    return digest.hexdigest()[:16]
+
+
+def artifact_path(version):
+    return os.path.join(MODEL_DIR, f"calorie_model-{version}.joblib")
+
+
+def train_model(version, dataset, params=None):
+    params = MODEL_PARAMS if params is None else params
+    encoder = fit_encoder(dataset)
+    X_train, y_train, X_test, y_test = split_dataset(dataset, encoder)
+
+    model = RandomForestRegressor(**params)
+    model.fit(X_train, y_train)
+
+    # Serve through the exported engine, but only if it reproduces sklearn
+    engine = ForestEngine.from_estimator(model)
+    if not np.allclose(engine.predict(X_test.to_numpy()), model.predict(X_test)):
+        raise RuntimeError("Exported forest engine does not match model.predict on X_test")
+
+    return {
+        'version': version,
+        'model': model,
+        'engine': engine,
+        'encoder': encoder,
+        'params': dict(params),
+        'test_score': float(model.score(X_test, y_test)),
+    }
+
+
+def save_artifact(artifact):
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    path = artifact_path(artifact['version'])
+    # Write to a temp file first so a concurrent reader never sees a partial artifact
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    joblib.dump(artifact, tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_or_train(params=None):
+    dataset = dataset_cache.load_columns()
+    version = artifact_version(dataset['version'], params)
+    path = artifact_path(version)
+    if os.path.exists(path):
+        try:
+            artifact = joblib.load(path)
+        except Exception:
+            # Corrupt or incompatible artifact: fall through and rebuild it
+            artifact = None
+        if isinstance(artifact, dict) and artifact.get('version') == version:
+            return artifact
+    artifact = train_model(version, dataset, params)
+    save_artifact(artifact)
+    return artifact
+
+
+def get_model():
+    signature = dataset_cache.data_signature()
+    entry = _cache['entry']
+    if entry is not None and entry[0] == signature:
+        return entry[1]
+
+    with _cache_lock:
+        entry = _cache['entry']
+        if entry is None or entry[0] != signature:
+            entry = (signature, load_or_train())
+            _cache['entry'] = entry
+            # Keys carry the model version too; clearing just frees the stale entries
+            prediction_cache.clear()
+        return entry[1]
+
+
+def _warm():
+    try:
+        get_model()
+        _warmup['error'] = None
+    except Exception as e:
+        _warmup['error'] = e
+
+
+def start_warmup():
+    # Idempotent: at most one warm-up thread runs at a time
+    with _warmup_lock:
+        thread = _warmup['thread']
+        if thread is None or not thread.is_alive():
+            thread = threading.Thread(target=_warm, name="model-warmup", daemon=True)
+            _warmup['thread'] = thread
+            thread.start()
+        return thread
+
+
+def is_ready():
+    # True once the model for the current training data is loaded in this process
+    entry = _cache['entry']
+    return entry is not None and entry[0] == dataset_cache.data_signature()
+
+
+def warmup_error():
+    return _warmup['error']
+
+
+def predict_calories(age, bmi, duration, heart_rate, body_temp, gender):
+    artifact = get_model()
+    encoder = artifact['encoder']
+    key = (
+        artifact['version'],
+        float(age), float(bmi), float(duration), float(heart_rate), float(body_temp),
+        encoder.gender_code(gender),
+    )
+
+    def compute():
+        features = encoder.encode_row(age, bmi, duration, heart_rate, body_temp, gender)
+        return float(artifact['engine'].predict(features)[0])
+
+    return prediction_cache.get_or_compute(key, compute)
@@ -0,0 +1,83 @@
+# Salted password hashing with scrypt (memory-hard, from the standard library)
+#
+# Hashes are stored as "scrypt$<log2 n>$<r>$<p>$<salt>$<hash>" so the cost can
+# be raised later; needs_rehash() reports hashes made with older parameters.
+# Hashing is deliberately expensive, so it runs on a small bounded worker pool
+# instead of the session's script thread.
+import base64
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import hmac
+import os
+
+SCHEME = "scrypt"
+# hashlib.scrypt refuses a maxmem above INT_MAX, which caps n at 2 ** 20 for r = 8
+MAX_SCRYPT_MEM = 2 ** 31 - 1
+MIN_LOG2_N = 10
+MAX_LOG2_N = 20
+
+
+def clamp_log2_n(log2_n):
+    return min(max(int(log2_n), MIN_LOG2_N), MAX_LOG2_N)
+
+
+# Cost factor: n = 2 ** SCRYPT_LOG2_N (memory ~ 128 * r * n bytes), clamped to what scrypt accepts
+SCRYPT_LOG2_N = clamp_log2_n(os.environ.get("FITNESS_SCRYPT_LOG2_N", 14))
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+HASH_BYTES = 32
+HASH_WORKERS = int(os.environ.get("FITNESS_HASH_WORKERS", 2))
+
+_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="password-hash")
+
+
+def _b64encode(data):
+    return base64.b64encode(data).decode("ascii")
+
+
+def _scrypt(password, salt, log2_n, r, p):
+    n = 1 << log2_n
+    return hashlib.scrypt(
+        password.encode("utf-8"),
+        salt=salt,
+        n=n,
+        r=r,
+        p=p,
+        maxmem=min(256 * r * n, MAX_SCRYPT_MEM),
+        dklen=HASH_BYTES,
+    )
+
+
+def _hash_password(password):
+    salt = os.urandom(SALT_BYTES)
+    digest = _scrypt(password, salt, SCRYPT_LOG2_N, SCRYPT_R, SCRYPT_P)
+    return f"{SCHEME}${SCRYPT_LOG2_N}${SCRYPT_R}${SCRYPT_P}${_b64encode(salt)}${_b64encode(digest)}"
+
+
+def _verify_password(password, stored):
+    try:
+        scheme, log2_n, r, p, salt, expected = stored.split("$")
+        if scheme != SCHEME:
+            return False
+        digest = _scrypt(password, base64.b64decode(salt), int(log2_n), int(r), int(p))
+        expected = base64.b64decode(expected)
+    except ValueError:
+        return False
+    return hmac.compare_digest(digest, expected)
+
+
+def hash_password(password):
+    return _executor.submit(_hash_password, password).result()
+
+
+def verify_password(password, stored):
+    return _executor.submit(_verify_password, password, stored).result()
+
+
+def needs_rehash(stored):
+    return not stored.startswith(f"{SCHEME}${SCRYPT_LOG2_N}${SCRYPT_R}${SCRYPT_P}$")
+
+
+# Verified against when an email is unknown, so a miss costs as much as a hit
+DUMMY_HASH = _hash_password(_b64encode(os.urandom(SALT_BYTES)))
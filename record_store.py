@@ -0,0 +1,208 @@
+# Compact columnar in-memory storage for workout and tracker records
+#
+# Records are held column-wise in NumPy arrays that grow by doubling: days as
+# int32 ordinals (see days.py), categories (workout type) as uint8 codes,
+# measurements as float32, and free text (notes) as uint32 codes into an
+# interned side table.
+# column() returns a zero-copy view of the filled rows; a view stays valid
+# after later appends because growth moves the store to a new buffer.
+#
+# Rows are also partitioned by month: each partition is an array of row ids
+# kept sorted by day, so a date-range query bisects the month keys, takes the
+# inner months whole and binary-searches only the two edge partitions. The
+# searches pass key= to bisect, which needs Python 3.10.
+#
+# Every store carries a data version that changes on each append. Versions come
+# from one process-wide counter, so a version names exactly one snapshot of one
+# store and can key caches shared across sessions.
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from itertools import count
+import sys
+
+import numpy as np
+
+import days
+
+# Field kinds: 'day' (int32 ordinal), 'category' (uint8 code), 'text' (uint32
+# interned code), or a NumPy dtype for plain values
+SCHEMAS = {
+    'workouts': [('day', 'day'), ('type', 'category'), ('calories', np.float32), ('duration', np.float32),
+                 ('heart_rate', np.float32), ('notes', 'text')],
+    'weight': [('day', 'day'), ('weight', np.float32), ('notes', 'text')],
+    'steps': [('day', 'day'), ('steps', np.int32), ('distance', np.float32)],
+    'water': [('day', 'day'), ('amount', np.float32), ('type', 'text')],
+}
+
+KIND_DTYPES = {'day': np.int32, 'category': np.uint8, 'text': np.uint32}
+
+_versions = count(1)
+
+
+class ColumnStore:
+    __slots__ = ('tracker', 'fields', 'version', '_size', '_columns', '_labels', '_codes', '_months', '_partitions')
+
+    def __init__(self, tracker, capacity=64):
+        self.tracker = tracker
+        self.fields = dict(SCHEMAS[tracker])
+        self.version = next(_versions)
+        self._size = 0
+        self._columns = {
+            name: np.empty(capacity, dtype=KIND_DTYPES.get(kind, kind)) for name, kind in self.fields.items()
+        }
+        # Interned labels per category/text field; code 0 of a text field is ""
+        self._labels = {}
+        self._codes = {}
+        for name, kind in self.fields.items():
+            if kind in ('category', 'text'):
+                self._labels[name] = [""] if kind == 'text' else []
+                self._codes[name] = {"": 0} if kind == 'text' else {}
+        self._months = []  # sorted month keys (first day ordinal)
+        self._partitions = {}  # month key -> array of row ids sorted by day
+
+    @classmethod
+    def from_records(cls, tracker, records):
+        store = cls(tracker, capacity=max(64, len(records)))
+        for record in records:
+            store.append(record)
+        return store
+
+    def __len__(self):
+        return self._size
+
+    def _encode(self, name, label):
+        codes = self._codes[name]
+        code = codes.get(label)
+        if code is None:
+            code = len(self._labels[name])
+            if self.fields[name] == 'category' and code > np.iinfo(np.uint8).max:
+                raise ValueError(f"too many distinct values for category field {name!r}")
+            label = sys.intern(label)
+            codes[label] = code
+            self._labels[name].append(label)
+        return code
+
+    def append(self, record):
+        if self._size == len(self._columns['day']):
+            for name, column in self._columns.items():
+                grown = np.empty(2 * len(column), dtype=column.dtype)
+                grown[:self._size] = column[:self._size]
+                self._columns[name] = grown
+
+        row = self._size
+        for name, kind in self.fields.items():
+            value = record[name]
+            if kind in ('category', 'text'):
+                value = self._encode(name, value or "")
+            self._columns[name][row] = value
+        self._size += 1
+        self._partition(row, record['day'])
+        self.version = next(_versions)
+
+    def _partition(self, row, day):
+        month = days.month_start(day)
+        rows = self._partitions.get(month)
+        if rows is None:
+            rows = self._partitions[month] = array('I')
+            insort(self._months, month)
+        day_column = self._columns['day']
+        if not rows or day_column[rows[-1]] <= day:
+            rows.append(row)
+        else:
+            rows.insert(bisect_right(rows, day, key=day_column.__getitem__), row)
+
+    def column(self, name):
+        # Zero-copy view of the filled rows
+        return self._columns[name][:self._size]
+
+    def range_rows(self, start=None, end=None):
+        # Row ids with start <= day <= end (inclusive ordinals, None = open), in day order
+        day_column = self._columns['day']
+        lo = 0 if start is None else bisect_left(self._months, days.month_start(start))
+        hi = len(self._months) if end is None else bisect_right(self._months, end)
+        parts = []
+        for month in self._months[lo:hi]:
+            rows = self._partitions[month]
+            first = 0 if start is None or month >= start else bisect_left(rows, start, key=day_column.__getitem__)
+            last = len(rows)
+            if end is not None and day_column[rows[-1]] > end:
+                last = bisect_right(rows, end, key=day_column.__getitem__)
+            if last > first:
+                parts.append(np.frombuffer(rows, dtype=np.uint32)[first:last])
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.uint32)
+
+    def labels(self, name):
+        return self._labels[name]
+
+    def decoded(self, name, rows=slice(None)):
+        # Labels for a category/text field, for display
+        labels = np.array(self._labels[name], dtype=object)
+        return labels[self.column(name)[rows]]
+
+    def frame(self, names, rows=slice(None)):
+        # DataFrame of the selected fields for charting; the 'day' field becomes
+        # a datetime64 'date' column
+        import pandas as pd
+
+        data = {}
+        for name in names:
+            kind = self.fields[name]
+            if kind == 'day':
+                data['date'] = days.to_datetime64(self.column(name)[rows])
+            elif kind in ('category', 'text'):
+                data[name] = self.decoded(name, rows)
+            else:
+                data[name] = self.column(name)[rows]
+        return pd.DataFrame(data, copy=False)
+
+    def nbytes(self):
+        # Bytes held by the filled rows plus the interned side tables
+        total = sum(column[:self._size].nbytes for column in self._columns.values())
+        for labels in self._labels.values():
+            total += sys.getsizeof(labels) + sum(sys.getsizeof(label) for label in labels)
+        return total
+
+
+if __name__ == "__main__":
+    # Memory benchmark: per-1000-workout footprint of list-of-dicts vs ColumnStore
+    from datetime import date, timedelta
+    import random
+    import tracemalloc
+    import uuid
+
+    types = ["Walking", "Running", "Cycling", "Swimming", "Weight Training", "Yoga", "HIIT", "Other"]
+    notes = ["", "", "", "Felt great", "Legs sore", "Easy pace"]
+    start = date(2024, 1, 1)
+
+    def make_workouts(n):
+        rng = random.Random(1)
+        return [
+            {
+                'id': str(uuid.UUID(int=rng.getrandbits(128))),
+                'day': (start + timedelta(days=i // 2)).toordinal(),
+                'type': rng.choice(types),
+                'calories': round(rng.uniform(50, 600), 2),
+                'duration': float(rng.randint(10, 90)),
+                'heart_rate': float(rng.randint(90, 170)),
+                # Strings built per record, as they arrive from widgets
+                'notes': "".join(rng.choice(notes)),
+            }
+            for i in range(n)
+        ]
+
+    for n in (1000, 10000):
+        tracemalloc.start()
+        workouts = make_workouts(n)
+        dict_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        store = ColumnStore.from_records('workouts', workouts)
+        store_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        print(f"{n:>6} workouts: list-of-dicts {dict_bytes * 1000 / n / 1024:8.1f} KiB per 1000, "
+              f"ColumnStore {store_bytes * 1000 / n / 1024:6.1f} KiB per 1000 "
+              f"(filled {store.nbytes() * 1000 / n / 1024:.1f} KiB), "
+              f"{dict_bytes / store_bytes:.0f}x smaller")
+        assert np.shares_memory(store.column('calories'), store._columns['calories'])
@@ -0,0 +1,38 @@
+# ASGI entry point for production: `streamlit run server.py`
+#
+# Starts the calorie model warm-up at process boot and exposes /readyz so a
+# load balancer only routes traffic to this process once the predictor is warm.
+# A ready response also reports the prediction cache's hit/miss counters.
+# Also serves the content-hashed theme assets under /assets (see assets.py).
+# `streamlit run app.py` still works; the app then starts the warm-up itself
+# and inlines the stylesheet.
+from contextlib import asynccontextmanager
+
+import streamlit as st
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+import assets
+import model_registry
+
+
+@asynccontextmanager
+async def lifespan(app):
+    model_registry.start_warmup()
+    yield
+
+
+async def readyz(request):
+    if model_registry.is_ready():
+        return JSONResponse({
+            'status': 'ready',
+            'model_version': model_registry.get_model()['version'],
+            'prediction_cache': model_registry.prediction_cache.stats(),
+        })
+    error = model_registry.warmup_error()
+    if error is not None:
+        return JSONResponse({'status': 'error', 'error': str(error)}, status_code=503)
+    return JSONResponse({'status': 'warming'}, status_code=503)
+
+
+app = st.App("app.py", lifespan=lifespan, routes=[Route("/readyz", readyz), assets.route()])
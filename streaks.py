@@ -0,0 +1,52 @@
+# Ordered index of active days for streak queries
+#
+# Days are stored as integer ordinals (see days.py) in a sorted list, so
+# workouts can be logged for any date in any order. Alongside it, runs of
+# consecutive days are kept as start <-> end maps: adding a day merges at most
+# two neighbouring runs, which keeps the current and longest streak O(1).
+from bisect import bisect_left, bisect_right, insort
+
+from days import to_ordinal
+
+
+class DayIndex:
+    def __init__(self, days=()):
+        self._days = []
+        self._run_end = {}    # run start -> run end
+        self._run_start = {}  # run end -> run start
+        self.longest_streak = 0
+        for day in days:
+            self.add(day)
+
+    def __len__(self):
+        return len(self._days)
+
+    def __contains__(self, day):
+        day = to_ordinal(day)
+        i = bisect_left(self._days, day)
+        return i < len(self._days) and self._days[i] == day
+
+    def add(self, day):
+        # Returns False if the day was already active
+        day = to_ordinal(day)
+        if day in self:
+            return False
+        insort(self._days, day)
+
+        start = self._run_start.pop(day - 1, day)
+        end = self._run_end.pop(day + 1, day)
+        self._run_end[start] = end
+        self._run_start[end] = start
+        self.longest_streak = max(self.longest_streak, end - start + 1)
+        return True
+
+    def current_streak(self):
+        # Run ending at the most recent active day
+        if not self._days:
+            return 0
+        latest = self._days[-1]
+        return latest - self._run_start[latest] + 1
+
+    def active_days(self, start, end):
+        # Number of active days in the inclusive window [start, end]
+        return bisect_right(self._days, to_ordinal(end)) - bisect_left(self._days, to_ordinal(start))
@@ -0,0 +1,28 @@
+# The modules under test are flat top-level modules in the repository root.
+# Stores write to a throwaway SQLite file, never the app's fitness.db.
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["FITNESS_DB_PATH"] = os.path.join(tempfile.mkdtemp(prefix="fitness-tests-"), "fitness.db")
+
+
+import dataset_cache  # noqa: E402
+
+
+@pytest.fixture
+def tiny_dataset(tmp_path, monkeypatch):
+    # The first 200 rows of the real CSVs, with the dataset cache under tmp_path
+    files = {}
+    for name, path in dataset_cache.DATA_FILES.items():
+        with open(path) as f:
+            lines = [next(f) for _ in range(201)]
+        files[name] = tmp_path / os.path.basename(path)
+        files[name].write_text("".join(lines))
+    monkeypatch.setattr(dataset_cache, "DATA_FILES", {name: str(path) for name, path in files.items()})
+    monkeypatch.setattr(dataset_cache, "CACHE_DIR", str(tmp_path / "data_cache"))
+    monkeypatch.setitem(dataset_cache._cache, 'entry', None)
+    return files
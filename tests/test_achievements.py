@@ -0,0 +1,89 @@
+import pytest
+
+import achievements
+from streaks import DayIndex
+
+# The thresholds of the inline checks the rules replaced
+OLD_ACHIEVEMENTS = {
+    'first_workout': ('total_workouts', 1),
+    'three_workouts': ('total_workouts', 3),
+    'calorie_milestone': ('total_calories', 500),
+    'different_workouts': ('distinct_types', 3),
+    'consistency': ('longest_streak', 3),
+}
+OLD_CHALLENGES = {1: ('longest_streak', 7), 2: ('cardio_workouts', 5), 3: ('total_calories', 1000)}
+
+
+def rules():
+    return ([('achievement', key, counter, target) for key, (counter, target) in OLD_ACHIEVEMENTS.items()]
+            + [('challenge', key, counter, target) for key, (counter, target) in OLD_CHALLENGES.items()])
+
+
+def test_rules_declare_the_old_thresholds():
+    assert {rule['key']: (rule['counter'], rule['target']) for rule in achievements.ACHIEVEMENTS} == OLD_ACHIEVEMENTS
+    assert {rule['id']: (rule['counter'], rule['target']) for rule in achievements.CHALLENGES} == OLD_CHALLENGES
+
+
+@pytest.mark.parametrize("kind, key, counter, target", rules())
+def test_each_rule_unlocks_exactly_at_its_target(kind, key, counter, target):
+    counters = achievements.new_counters()
+    badges, challenges = achievements.new_achievements(), achievements.new_challenges()
+    rule = badges[key] if kind == 'achievement' else next(c for c in challenges if c['id'] == key)
+
+    def unlocked():
+        earned, completed = achievements.evaluate(counters, {counter}, badges, challenges)
+        return earned if kind == 'achievement' else completed
+
+    counters[counter] = target - 1
+    assert rule not in unlocked()
+    assert not rule.get('earned', rule.get('completed'))
+
+    counters[counter] = target
+    assert rule in unlocked()
+    # A met rule never unlocks twice
+    counters[counter] = target + 1
+    assert rule not in unlocked()
+
+
+def test_only_rules_on_changed_counters_are_checked():
+    counters = achievements.new_counters()
+    badges, challenges = achievements.new_achievements(), achievements.new_challenges()
+    counters.update(total_workouts=3, total_calories=1000)
+
+    earned, completed = achievements.evaluate(counters, {'total_workouts'}, badges, challenges)
+    assert [badge['name'] for badge in earned] == ['First Step', 'Getting Started']
+    assert completed == [] and not badges['calorie_milestone']['earned']
+
+
+def test_record_workout_unlocks_what_the_old_checks_did():
+    counters = achievements.new_counters()
+    type_counts, active_days = {}, DayIndex()
+    badges, challenges = achievements.new_achievements(), achievements.new_challenges()
+    unlocked = []
+    # Seven consecutive days: two Yoga sessions, then cardio; 150 kcal each
+    plan = [('Yoga', 0), ('Yoga', 1), ('Running', 2), ('Cycling', 3), ('Walking', 4), ('HIIT', 5), ('Swimming', 6)]
+    for workout_type, offset in plan:
+        workout = {'day': 738000 + offset, 'type': workout_type, 'calories': 150.0, 'duration': 30.0}
+        changed = achievements.record_workout(counters, type_counts, active_days, workout)
+        earned, completed = achievements.evaluate(counters, changed, badges, challenges)
+        unlocked.append(({badge['name'] for badge in earned}, {challenge['id'] for challenge in completed}))
+
+        # Reference: the old inline checks over the full state
+        totals = {'total_workouts': offset + 1, 'total_calories': 150.0 * (offset + 1),
+                  'distinct_types': len({t for t, _ in plan[:offset + 1]}), 'longest_streak': offset + 1,
+                  'cardio_workouts': sum(t in achievements.CARDIO_TYPES for t, _ in plan[:offset + 1])}
+        for key, (counter, target) in OLD_ACHIEVEMENTS.items():
+            assert badges[key]['earned'] == (totals[counter] >= target)
+        for challenge in challenges:
+            counter, target = OLD_CHALLENGES[challenge['id']]
+            assert challenge['completed'] == (totals[counter] >= target)
+
+    assert unlocked == [
+        ({'First Step'}, set()),
+        (set(), set()),
+        ({'Getting Started', 'Consistency King'}, set()),
+        ({'Calorie Crusher', 'Variety Pack'}, set()),
+        (set(), set()),
+        (set(), set()),
+        (set(), {1, 2, 3}),
+    ]
@@ -0,0 +1,70 @@
+import random
+
+import numpy as np
+
+from activity import TRACKERS, ActivityBitmap
+
+
+def longest(flags):
+    run = best = 0
+    for flag in flags:
+        run = run + 1 if flag else 0
+        best = max(best, run)
+    return best
+
+
+def test_windows_before_and_across_origin():
+    bitmap = ActivityBitmap.from_days({'workouts': [100, 101, 102, 110], 'steps': [105], 'water': []})
+    assert bitmap.origin == 100
+
+    # Entirely before the origin
+    assert bitmap.count('workouts', 80, 99) == 0
+    assert bitmap.longest_run('workouts', 80, 99) == 0
+    # Starting before the origin and reaching into the history
+    assert bitmap.count('workouts', 90, 101) == 2
+    assert bitmap.longest_run('workouts', 90, 101) == 2
+    assert bitmap.day_flags('workouts', 98, 103).tolist() == [0, 0, 1, 1, 1, 0]
+    # Any tracker
+    assert bitmap.count(None, 90, 120) == 5
+    assert bitmap.longest_run(None, 100, 120) == 3
+
+
+def test_adding_a_day_before_origin_shifts_every_tracker():
+    bitmap = ActivityBitmap()
+    bitmap.add('water', 200)
+    bitmap.add('steps', 201)
+    bitmap.add('workouts', 195)
+
+    assert bitmap.origin == 195
+    assert bitmap.count('water', 200, 200) == 1
+    assert bitmap.count('steps', 195, 201) == 1
+    assert bitmap.day_flags('workouts', 194, 196).tolist() == [0, 1, 0]
+    assert bitmap.longest_run('water') == 1
+
+
+def test_empty_bitmap():
+    bitmap = ActivityBitmap()
+    assert bitmap.count('steps', 1, 10) == 0
+    assert bitmap.longest_run() == 0
+    assert bitmap.day_flags('steps', 1, 10).tolist() == [0] * 10
+
+
+def test_matches_brute_force_for_random_days_and_windows():
+    rng = random.Random(0)
+    for _ in range(200):
+        active = {tracker: set(rng.sample(range(500, 600), rng.randint(0, 30))) for tracker in TRACKERS}
+        bitmap = ActivityBitmap()
+        events = [(tracker, day) for tracker, days in active.items() for day in days]
+        rng.shuffle(events)
+        for tracker, day in events:
+            bitmap.add(tracker, day)
+
+        for _ in range(10):
+            start, end = sorted(rng.sample(range(450, 650), 2))
+            window = range(start, end + 1)
+            for tracker in [*TRACKERS, None]:
+                days = set().union(*active.values()) if tracker is None else active[tracker]
+                flags = [day in days for day in window]
+                assert bitmap.count(tracker, start, end) == sum(flags)
+                assert bitmap.longest_run(tracker, start, end) == longest(flags)
+            assert np.array_equal(bitmap.day_flags('steps', start, end), [day in active['steps'] for day in window])
@@ -0,0 +1,68 @@
+import asyncio
+import hashlib
+import os
+
+import pytest
+from starlette.applications import Starlette
+from streamlit import config
+
+import assets
+
+
+def get(path):
+    # Minimal ASGI GET against a Starlette app holding only the asset route;
+    # returns (status, headers, body)
+    app = Starlette(routes=[assets.route()])
+    scope = {'type': 'http', 'method': 'GET', 'path': path, 'raw_path': path.encode(), 'query_string': b"",
+             'headers': [], 'scheme': 'http', 'server': ('testserver', 80), 'root_path': "", 'http_version': "1.1"}
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b"", 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    start = messages[0]
+    headers = {key.decode(): value.decode() for key, value in start['headers']}
+    return start['status'], headers, b"".join(m.get('body', b"") for m in messages[1:])
+
+
+@pytest.fixture
+def served(monkeypatch):
+    monkeypatch.setitem(assets._state, 'served', False)
+    return monkeypatch
+
+
+def test_stylesheet_name_carries_its_content_hash():
+    with open(os.path.join(assets.STATIC_DIR, "theme.css"), "rb") as f:
+        content = f.read()
+    digest = hashlib.sha256(content).hexdigest()[:12]
+
+    assert assets.url("theme.css") == f"/assets/theme.{digest}.css"
+    assert assets.text("theme.css") == content.decode()
+
+
+def test_hashed_stylesheet_is_served_immutable(served):
+    status, headers, body = get(assets.url("theme.css"))
+
+    assert status == 200
+    assert headers['cache-control'] == "public, max-age=31536000, immutable"
+    assert headers['content-type'] == "text/css; charset=utf-8"
+    assert body.decode() == assets.text("theme.css")
+    assert assets.stylesheet_markup() == f'<style>@import url("{assets.url("theme.css")}");</style>'
+
+
+def test_unknown_or_stale_hash_is_404(served):
+    for path in ["/assets/theme.000000000000.css", "/assets/theme.css", "/assets/missing.css"]:
+        assert get(path)[0] == 404
+
+
+def test_urls_and_route_follow_the_base_url_path(served):
+    served.setattr(config, "get_option", lambda key: "/fitness/" if key == "server.baseUrlPath" else None)
+    hashed = assets._names["theme.css"]
+
+    assert assets.url("theme.css") == f"/fitness/assets/{hashed}"
+    assert get(f"/fitness/assets/{hashed}")[0] == 200
+    assert get(f"/assets/{hashed}")[0] == 404
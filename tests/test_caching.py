@@ -0,0 +1,56 @@
+import pytest
+
+from caching import LRUCache
+
+
+def test_evicts_the_least_recently_used_entry():
+    cache = LRUCache(maxsize=3)
+    for key in "abc":
+        cache.put(key, key.upper())
+
+    assert cache.get("a") == "A"  # "a" is now the most recently used
+    cache.put("d", "D")
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in "acd"] == ["A", "C", "D"]
+
+    cache.put("c", "C2")  # overwriting also refreshes recency
+    cache.put("e", "E")
+    assert cache.get("a") is None
+    assert (cache.get("c"), len(cache)) == ("C2", 3)
+
+
+def test_get_or_compute_computes_only_on_a_miss():
+    cache = LRUCache(maxsize=2)
+    calls = []
+
+    def compute(value):
+        calls.append(value)
+        return value * 2
+
+    assert cache.get_or_compute("x", lambda: compute(1)) == 2
+    assert cache.get_or_compute("x", lambda: compute(5)) == 2
+    assert calls == [1]
+    # A cached falsy value is still a hit
+    assert cache.get_or_compute("zero", lambda: compute(0)) == 0
+    assert cache.get_or_compute("zero", lambda: compute(9)) == 0
+    assert calls == [1, 0]
+
+
+def test_stats_count_hits_and_misses():
+    cache = LRUCache(maxsize=2)
+    assert cache.stats() == {'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 2}
+
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get("missing")
+    cache.put("b", 2)
+    cache.put("c", 3)
+    assert cache.stats() == {'hits': 1, 'misses': 2, 'size': 2, 'maxsize': 2}
+
+    cache.clear()
+    assert cache.stats() == {'hits': 1, 'misses': 2, 'size': 0, 'maxsize': 2}
+
+
+def test_rejects_a_zero_maxsize():
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
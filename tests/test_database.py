@@ -0,0 +1,24 @@
+import sqlite3
+
+import pytest
+
+import database
+
+
+def test_failed_schema_is_retried_on_the_next_connection():
+    # The script's INSERT fails until its source table exists
+    database.register_schema("retry_test", """
+    CREATE TABLE IF NOT EXISTS retry_copy (value INTEGER);
+    INSERT INTO retry_copy SELECT value FROM retry_source;
+    """)
+    with pytest.raises(sqlite3.OperationalError):
+        with database.connection():
+            pass
+    assert "retry_test" not in database._schema['applied']
+
+    with sqlite3.connect(database.DB_PATH) as conn:
+        conn.execute("CREATE TABLE retry_source (value INTEGER)")
+        conn.execute("INSERT INTO retry_source VALUES (7)")
+    with database.connection() as conn:
+        assert [tuple(row) for row in conn.execute("SELECT value FROM retry_copy")] == [(7,)]
+    assert "retry_test" in database._schema['applied']
@@ -0,0 +1,57 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import dataset_cache
+
+
+def test_ingest_writes_a_version_directory_and_reuses_it(tiny_dataset, monkeypatch):
+    dataset = dataset_cache.load_columns()
+    version = dataset['version']
+    target = os.path.join(dataset_cache.CACHE_DIR, version)
+    assert os.listdir(dataset_cache.CACHE_DIR) == [version]
+    assert sorted(os.listdir(target)) == sorted([f"{column}.npy" for column in dataset_cache.COLUMN_DTYPES]
+                                                + ["meta.json"])
+
+    # Unchanged CSVs: a fresh process maps the existing files instead of ingesting
+    monkeypatch.setitem(dataset_cache._cache, 'entry', None)
+    def ingest(version):
+        raise AssertionError("re-ingested an unchanged dataset")
+
+    monkeypatch.setattr(dataset_cache, "ingest", ingest)
+    assert dataset_cache.load_columns()['version'] == version
+    # And within the process the same memory maps are shared
+    assert dataset_cache.load_columns() is dataset_cache.load_columns()
+
+
+def test_columns_are_read_only_memmaps_equal_to_the_csvs(tiny_dataset):
+    columns = dataset_cache.load_columns()['columns']
+    exercise = pd.read_csv(tiny_dataset['exercise'])
+    calories = pd.read_csv(tiny_dataset['calories'])
+    expected = exercise.merge(calories, on="User_ID")
+
+    for name, column in columns.items():
+        assert isinstance(column, np.memmap)
+        assert not column.flags.writeable
+        assert column.dtype == dataset_cache.COLUMN_DTYPES[name]
+    for name in ["Age", "Height", "Weight", "Duration", "Heart_Rate", "Body_Temp", "Calories"]:
+        np.testing.assert_array_equal(columns[name], expected[name].to_numpy(dtype=np.float64))
+    categories = dataset_cache.load_columns()['categories']['Gender']
+    assert [categories[code] for code in columns['Gender']] == expected['Gender'].tolist()
+    np.testing.assert_allclose(columns['BMI'], round(expected['Weight'] / (expected['Height'] / 100) ** 2, 2))
+
+
+def test_ingesting_a_new_version_removes_the_old_one(tiny_dataset):
+    old = dataset_cache.load_columns()['version']
+    in_progress = os.path.join(dataset_cache.CACHE_DIR, f"{old}.123.tmp")
+    os.makedirs(in_progress)
+
+    with open(tiny_dataset['calories'], "a") as f:
+        f.write("99999999,99.0\n")
+    with open(tiny_dataset['exercise'], "a") as f:
+        f.write("99999999,female,30,170.0,65.0,20.0,100.0,40.0\n")
+    new = dataset_cache.load_columns()['version']
+
+    assert new != old
+    assert sorted(os.listdir(dataset_cache.CACHE_DIR)) == sorted([new, os.path.basename(in_progress)])
@@ -0,0 +1,37 @@
+import json
+import sqlite3
+from datetime import date
+
+import numpy as np
+
+import days
+
+DATES = ["1969-12-31", "1970-01-01", "1900-02-28", "1900-03-01", "1600-02-29", "0001-01-01", "2000-02-29",
+         "2024-02-29", "2024-03-01", "2023-12-31", "9999-12-31"]
+
+
+def test_sql_day_agrees_with_to_ordinal():
+    with sqlite3.connect(":memory:") as conn:
+        conn.execute("CREATE TABLE t (date TEXT)")
+        conn.executemany("INSERT INTO t VALUES (?)", [(day,) for day in DATES])
+        rows = conn.execute(f"SELECT date, {days.SQL_DAY.format(column='date')} FROM t").fetchall()
+
+    assert [ordinal for _, ordinal in rows] == [days.to_ordinal(day) for day in DATES]
+    assert all(days.to_iso(ordinal) == day for day, ordinal in rows)
+
+
+def test_every_day_of_a_leap_year_range_round_trips():
+    first, last = date(1999, 12, 1).toordinal(), date(2001, 3, 31).toordinal()
+    isos = [days.to_iso(ordinal) for ordinal in range(first, last + 1)]
+    with sqlite3.connect(":memory:") as conn:
+        ordinals = [row[0] for row in conn.execute(
+            "WITH t(date) AS (SELECT value FROM json_each(?)) SELECT " + days.SQL_DAY.format(column="date") + " FROM t",
+            (json.dumps(isos),),
+        )]
+    assert ordinals == list(range(first, last + 1))
+
+
+def test_datetime64_matches_the_ordinals():
+    ordinals = [days.to_ordinal(day) for day in DATES[:5]]
+    assert days.to_datetime64(ordinals).astype(str).tolist() == DATES[:5]
+    assert np.datetime64("1970-01-01") == days.to_datetime64([days.EPOCH_ORDINAL])[0]
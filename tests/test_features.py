@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import dataset_cache
+import model_registry
+from features import FeatureEncoder
+
+# Columns the model was trained on, in the order the training frame held them
+TRAINING_COLUMNS = ["Gender", "Age", "BMI", "Duration", "Heart_Rate", "Body_Temp"]
+
+
+def training_frame(dataset):
+    # The frame the model used to be fitted on: pd.get_dummies(drop_first=True)
+    return pd.get_dummies(dataset[TRAINING_COLUMNS], drop_first=True).astype(np.float64)
+
+
+def encode(encoder, frame, method):
+    return getattr(encoder, method)(
+        frame["Age"], frame["BMI"], frame["Duration"], frame["Heart_Rate"], frame["Body_Temp"], frame["Gender"]
+    )
+
+
+def test_encode_batch_matches_get_dummies_on_the_training_set():
+    dataset = dataset_cache.read_csv_dataset()
+    expected = training_frame(dataset)
+    encoder = FeatureEncoder.fit(dataset["Gender"])
+
+    assert encoder.columns == list(expected.columns)
+    np.testing.assert_array_equal(encode(encoder, dataset, "encode_batch"), expected.to_numpy())
+
+    # The ingested columns (gender as integer codes) give the same matrix
+    columns = dataset_cache.load_columns()
+    encoder = model_registry.fit_encoder(columns)
+    X_train, _, X_test, _ = model_registry.split_dataset(columns, encoder)
+    features = pd.concat([X_train, X_test]).sort_index()
+    assert list(features.columns) == list(expected.columns)
+    np.testing.assert_allclose(features.to_numpy(), expected.to_numpy(), rtol=1e-6)
+
+
+def test_encode_row_matches_a_reindexed_get_dummies_row():
+    dataset = dataset_cache.read_csv_dataset()
+    encoder = FeatureEncoder.fit(dataset["Gender"])
+    columns = list(training_frame(dataset).columns)
+
+    for _, row in dataset.sample(20, random_state=0).iterrows():
+        # What prediction used to do: a one-row frame reindexed to the training columns
+        frame = pd.DataFrame({column: [row[column]] for column in TRAINING_COLUMNS})
+        expected = pd.get_dummies(frame).reindex(columns=columns, fill_value=0).astype(np.float64)
+        np.testing.assert_array_equal(
+            encoder.encode_row(row["Age"], row["BMI"], row["Duration"], row["Heart_Rate"], row["Body_Temp"],
+                               row["Gender"]),
+            expected.to_numpy(),
+        )
+
+
+def test_more_than_two_categories_follow_get_dummies_order():
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({column: rng.uniform(10, 100, size=30) for column in TRAINING_COLUMNS[1:]})
+    frame.insert(0, "Gender", rng.choice(["male", "female", "other"], size=30))
+    expected = pd.get_dummies(frame, drop_first=True).astype(np.float64)
+    encoder = FeatureEncoder.fit(frame["Gender"])
+
+    assert encoder.columns == list(expected.columns)
+    np.testing.assert_array_equal(encode(encoder, frame, "encode_batch"), expected.to_numpy())
+    with pytest.raises(ValueError):
+        encoder.gender_code("unknown")
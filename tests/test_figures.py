@@ -0,0 +1,62 @@
+import numpy as np
+
+from caching import LRUCache
+import figures
+
+
+
+def counts(grid, n):
+    # Point counts back from the grid of shares (%)
+    return np.rint(grid['z'] * n / 100).astype(int)
+
+
+def test_density_bins_cover_every_point():
+    rng = np.random.default_rng(0)
+    for n in [1, 2, 50, 10000]:
+        x, y = rng.normal(60, 20, size=n), rng.integers(80, 180, size=n)
+        # A second sample sharing the edges, as the population view does
+        other_x, other_y = rng.uniform(0, 200, size=n // 2), rng.normal(120, 5, size=n // 2)
+        x_edges = figures.density_edges(x, other_x)
+        y_edges = figures.density_edges(y, other_y)
+        assert len(x_edges) == len(y_edges) == figures.DENSITY_BINS + 1
+        assert x_edges[0] <= min(x.min(), other_x.min(initial=np.inf))
+        assert x_edges[-1] >= max(x.max(), other_x.max(initial=-np.inf))
+
+        for sample_x, sample_y in [(x, y), (other_x, other_y)]:
+            grid = figures.density(sample_x, sample_y, x_edges, y_edges)
+            assert grid['z'].shape == (figures.DENSITY_BINS, figures.DENSITY_BINS)
+            assert len(grid['x']) == len(grid['y']) == figures.DENSITY_BINS
+            assert counts(grid, len(sample_x)).sum() == len(sample_x)
+            if len(sample_x):
+                np.testing.assert_allclose(grid['z'].sum(), 100)
+
+
+def test_density_of_identical_points_and_of_no_points():
+    x, y = np.full(7, 30.0), np.full(7, 120.0)
+    x_edges, y_edges = figures.density_edges(x), figures.density_edges(y)
+    grid = figures.density(x, y, x_edges, y_edges)
+    assert counts(grid, 7).sum() == 7
+    assert np.count_nonzero(grid['z']) == 1
+
+    empty = figures.density([], [], figures.density_edges([]), figures.density_edges([]))
+    assert not empty['z'].any()
+
+
+def test_cached_figure_builds_once_per_key(monkeypatch):
+    monkeypatch.setattr(figures, "figure_cache", LRUCache(8))
+    builds = []
+
+    def build():
+        builds.append(object())
+        return builds[-1]
+
+    fig = figures.cached_figure("a@example.com", 'calendar', 3, 738000, build)
+    assert figures.cached_figure("a@example.com", 'calendar', 3, 738000, build) is fig
+    assert len(builds) == 1
+
+    # A new data version, time frame, chart or user is a miss
+    assert figures.cached_figure("a@example.com", 'calendar', 4, 738000, build) is builds[1]
+    assert figures.cached_figure("a@example.com", 'calendar', 4, 738001, build) is builds[2]
+    assert figures.cached_figure("a@example.com", 'progress', 4, 738001, build) is builds[3]
+    assert figures.cached_figure("b@example.com", 'progress', 4, 738001, build) is builds[4]
+    assert figures.figure_cache.stats()['hits'] == 1
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.model_selection import train_test_split
+
+import dataset_cache
+import model_registry
+from forest_engine import ForestEngine
+
+
+def test_matches_predict_on_held_out_split():
+    dataset = dataset_cache.load_columns()
+    encoder = model_registry.fit_encoder(dataset)
+    X_train, y_train, X_test, _ = model_registry.split_dataset(dataset, encoder)
+    model = RandomForestRegressor(n_estimators=8, max_depth=10, random_state=0).fit(X_train, y_train)
+
+    engine = ForestEngine.from_estimator(model)
+
+    np.testing.assert_array_equal(engine.predict(X_test.to_numpy()), model.predict(X_test))
+
+
+def test_matches_predict_on_threshold_ties_and_shallow_leaves():
+    # Integer-valued features put many test rows exactly on split thresholds,
+    # and min_samples_leaf leaves some branches shorter than the forest depth
+    rng = np.random.default_rng(0)
+    X = rng.integers(0, 20, size=(2000, 4)).astype(np.float64)
+    y = X[:, 0] * 3 - X[:, 1] ** 2 + rng.normal(size=len(X))
+    X_train, X_test, y_train, _ = train_test_split(X, y, test_size=0.25, random_state=0)
+    model = RandomForestRegressor(n_estimators=5, max_depth=7, min_samples_leaf=40, random_state=0)
+    model.fit(X_train, y_train)
+
+    engine = ForestEngine.from_estimator(model)
+
+    np.testing.assert_array_equal(engine.predict(X_test), model.predict(X_test))
+    np.testing.assert_array_equal(engine.predict(X_test[0]), model.predict(X_test[:1]))
+
+
+def test_rejects_forests_deeper_than_max_depth():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(5000, 2))
+    model = RandomForestRegressor(n_estimators=1, random_state=0).fit(X, rng.normal(size=len(X)))
+
+    with pytest.raises(ValueError):
+        ForestEngine.from_estimator(model)
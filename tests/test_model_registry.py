@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+from caching import LRUCache
+import dataset_cache
+import model_registry
+
+SMALL_PARAMS = {'n_estimators': 4, 'max_features': 3, 'max_depth': 4, 'random_state': 1}
+
+
+@pytest.fixture
+def registry(tiny_dataset, tmp_path, monkeypatch):
+    # Small forests, artifacts under tmp_path and a counter of training runs
+    monkeypatch.setattr(model_registry, "MODEL_PARAMS", SMALL_PARAMS)
+    monkeypatch.setattr(model_registry, "MODEL_DIR", str(tmp_path / "models"))
+    monkeypatch.setitem(model_registry._cache, 'entry', None)
+    monkeypatch.setattr(model_registry, "prediction_cache", LRUCache(16))
+    trained = []
+    train_model = model_registry.train_model
+
+    def counting_train_model(version, dataset, params=None):
+        trained.append(version)
+        return train_model(version, dataset, params)
+
+    monkeypatch.setattr(model_registry, "train_model", counting_train_model)
+    return trained
+
+
+def append_row(path):
+    # A new user in the exercise file, or their calories
+    with open(path, "a") as f:
+        f.write("99999999,female,30,170.0,65.0,20.0,100.0,40.0\n" if "exercise" in str(path) else "99999999,99.0\n")
+
+
+def test_version_changes_with_the_csv_content_and_the_params(tiny_dataset):
+    version = model_registry.artifact_version(dataset_cache.dataset_version())
+    assert model_registry.artifact_version(dataset_cache.dataset_version()) == version
+    assert model_registry.artifact_version(dataset_cache.dataset_version(), dict(SMALL_PARAMS, max_depth=5)) != version
+
+    append_row(tiny_dataset['exercise'])
+    append_row(tiny_dataset['calories'])
+    assert model_registry.artifact_version(dataset_cache.dataset_version()) != version
+
+
+def test_existing_artifact_is_loaded_instead_of_retrained(registry):
+    artifact = model_registry.load_or_train()
+    assert os.path.exists(model_registry.artifact_path(artifact['version']))
+    assert registry == [artifact['version']]
+
+    loaded = model_registry.load_or_train()
+    assert registry == [artifact['version']]
+    assert loaded['version'] == artifact['version']
+    assert loaded['params'] == SMALL_PARAMS
+
+
+def test_corrupt_or_stale_schema_artifact_is_retrained(registry, monkeypatch):
+    version = model_registry.load_or_train()['version']
+    with open(model_registry.artifact_path(version), "wb") as f:
+        f.write(b"not a joblib file")
+
+    assert model_registry.load_or_train()['version'] == version
+    assert registry == [version, version]
+
+    # An artifact from another schema never matches the current version
+    monkeypatch.setattr(model_registry, "ARTIFACT_SCHEMA", model_registry.ARTIFACT_SCHEMA + 1)
+    rebuilt = model_registry.load_or_train()
+    assert rebuilt['version'] != version
+    assert registry == [version, version, rebuilt['version']]
+
+    # A file under the right name that holds some other artifact is rebuilt too
+    model_registry.save_artifact(dict(rebuilt, version="something-else"))
+    os.replace(model_registry.artifact_path("something-else"), model_registry.artifact_path(rebuilt['version']))
+    assert model_registry.load_or_train()['version'] == rebuilt['version']
+    assert len(registry) == 4
+
+
+def test_model_reload_clears_the_prediction_cache(registry, tiny_dataset):
+    version = model_registry.get_model()['version']
+    prediction = model_registry.predict_calories(30, 22.5, 20, 100, 40.0, "female")
+    assert model_registry.predict_calories(30, 22.5, 20, 100, 40.0, "female") == prediction
+    assert len(model_registry.prediction_cache) == 1
+
+    model_registry.get_model()  # same data: no reload
+    assert len(model_registry.prediction_cache) == 1
+
+    append_row(tiny_dataset['exercise'])
+    append_row(tiny_dataset['calories'])
+    assert model_registry.get_model()['version'] != version
+    assert len(model_registry.prediction_cache) == 0
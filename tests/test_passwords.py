@@ -0,0 +1,39 @@
+import passwords
+
+
+def test_hash_and_verify_round_trip():
+    stored = passwords.hash_password("correct horse")
+    assert stored.startswith(f"scrypt${passwords.SCRYPT_LOG2_N}$")
+    assert passwords.verify_password("correct horse", stored)
+    # Each hash gets its own salt
+    assert passwords.hash_password("correct horse") != stored
+
+
+def test_rejects_wrong_password_and_malformed_hashes():
+    stored = passwords.hash_password("correct horse")
+    assert not passwords.verify_password("battery staple", stored)
+
+    scheme, log2_n, r, p, salt, digest = stored.split("$")
+    for malformed in ["", "correct horse", "scrypt$14$8$1", f"bcrypt${log2_n}${r}${p}${salt}${digest}",
+                      f"{scheme}$x${r}${p}${salt}${digest}", f"{scheme}${log2_n}${r}${p}$not-base64!${digest}",
+                      f"{scheme}${log2_n}${r}${p}${salt}$not-base64!", f"{scheme}$40${r}${p}${salt}${digest}"]:
+        assert not passwords.verify_password("correct horse", malformed)
+
+
+def test_needs_rehash_after_cost_is_raised(monkeypatch):
+    stored = passwords.hash_password("correct horse")
+    assert not passwords.needs_rehash(stored)
+
+    monkeypatch.setattr(passwords, "SCRYPT_LOG2_N", passwords.SCRYPT_LOG2_N + 1)
+    assert passwords.needs_rehash(stored)
+    # Old hashes still verify, since the cost is read from the stored string
+    assert passwords.verify_password("correct horse", stored)
+
+
+def test_cost_is_clamped_to_what_scrypt_accepts():
+    assert passwords.clamp_log2_n("30") == passwords.MAX_LOG2_N
+    assert passwords.clamp_log2_n("1") == passwords.MIN_LOG2_N
+    assert passwords.clamp_log2_n("14") == 14
+    # The largest allowed cost fits under hashlib's maxmem limit
+    n = 1 << passwords.MAX_LOG2_N
+    assert 128 * passwords.SCRYPT_R * n < passwords.MAX_SCRYPT_MEM
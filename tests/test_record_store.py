@@ -0,0 +1,97 @@
+import random
+from datetime import date
+
+import numpy as np
+
+from record_store import ColumnStore
+
+
+def steps(day, n=0):
+    return {'day': day, 'steps': n, 'distance': 1.0}
+
+
+def test_range_rows_matches_brute_force_for_out_of_order_inserts():
+    rng = random.Random(0)
+    first = date(2024, 1, 1).toordinal()
+    for _ in range(100):
+        # ~5 months of days, several entries on some of them, in random order
+        store_days = [first + rng.randrange(150) for _ in range(rng.randint(1, 60))]
+        store = ColumnStore('steps', capacity=4)
+        for i, day in enumerate(store_days):
+            store.append(steps(day, i))
+
+        bounds = [None] + [first + offset for offset in range(-10, 160, 7)]
+        for _ in range(30):
+            start, end = rng.choice(bounds), rng.choice(bounds)
+            expected = sorted(
+                (row for row, day in enumerate(store_days)
+                 if (start is None or day >= start) and (end is None or day <= end)),
+                key=lambda row: (store_days[row], row),
+            )
+            rows = store.range_rows(start, end)
+            assert rows.dtype == np.uint32
+            assert rows.tolist() == expected
+
+
+def test_range_rows_bounds_are_inclusive_mid_month():
+    jan_31, feb_1, feb_14, feb_29, mar_1 = (date(2024, 1, 31).toordinal(), date(2024, 2, 1).toordinal(),
+                                           date(2024, 2, 14).toordinal(), date(2024, 2, 29).toordinal(),
+                                           date(2024, 3, 1).toordinal())
+    store = ColumnStore('steps')
+    for day in [feb_29, jan_31, mar_1, feb_14, feb_1, feb_14]:
+        store.append(steps(day))
+
+    assert store.column('day')[store.range_rows(feb_14, feb_29)].tolist() == [feb_14, feb_14, feb_29]
+    assert store.column('day')[store.range_rows(feb_14 + 1, None)].tolist() == [feb_29, mar_1]
+    assert store.column('day')[store.range_rows(None, feb_1)].tolist() == [jan_31, feb_1]
+    assert store.range_rows(feb_1 + 1, feb_14 - 1).tolist() == []
+    assert ColumnStore('steps').range_rows().tolist() == []
+
+
+def workout(i):
+    return {'day': 738000 + i, 'type': ["Running", "Yoga", "HIIT"][i % 3], 'calories': float(i),
+            'duration': 30.0, 'heart_rate': 120.0, 'notes': "" if i % 2 else f"note {i % 4}"}
+
+
+def test_append_past_capacity_doubles_and_keeps_every_row():
+    store = ColumnStore('workouts', capacity=2)
+    views = []
+    for i in range(9):
+        store.append(workout(i))
+        views.append(store.column('calories'))
+
+    assert len(store) == 9
+    assert len(store._columns['day']) == 16  # 2 -> 4 -> 8 -> 16
+    assert store.column('calories').tolist() == [float(i) for i in range(9)]
+    assert store.decoded('type').tolist() == [workout(i)['type'] for i in range(9)]
+    assert store.decoded('notes').tolist() == [workout(i)['notes'] for i in range(9)]
+    # Views taken before a growth still show the rows they covered
+    assert views[1].tolist() == [0.0, 1.0]
+    assert store.labels('type') == ["Running", "Yoga", "HIIT"]
+
+
+def test_version_changes_on_every_append_and_is_unique_across_stores():
+    store, other = ColumnStore('workouts'), ColumnStore('workouts')
+    versions = [store.version, other.version]
+    for i in range(5):
+        store.append(workout(i))
+        versions.append(store.version)
+    other.append(workout(0))
+    versions.append(other.version)
+
+    assert len(set(versions)) == len(versions)
+    assert versions[2:7] == sorted(versions[2:7])
+
+
+def test_frame_decodes_labels_and_converts_days_to_dates():
+    store = ColumnStore.from_records('workouts', [workout(i) for i in range(4)])
+
+    frame = store.frame(['day', 'type', 'calories'])
+    assert list(frame.columns) == ['date', 'type', 'calories']
+    assert frame['date'].dt.date.tolist() == [date.fromordinal(738000 + i) for i in range(4)]
+    assert frame['type'].tolist() == ["Running", "Yoga", "HIIT", "Running"]
+    assert frame['calories'].tolist() == [0.0, 1.0, 2.0, 3.0]
+
+    rows = store.range_rows(738001, 738002)
+    assert store.frame(['calories', 'notes'], rows).to_dict('list') == {'calories': [1.0, 2.0],
+                                                                       'notes': ["", "note 2"]}
@@ -0,0 +1,97 @@
+import queue
+import random
+import sqlite3
+import uuid
+from collections import defaultdict
+from datetime import date
+
+import pytest
+
+import database
+import days
+import tracker_store
+
+TYPES = ["Walking", "Running", "Cycling", "Yoga"]
+PERIOD_START = {
+    'day': lambda day: day,
+    'week': lambda day: day - date.fromordinal(day).weekday(),
+    'month': days.month_start,
+}
+
+
+@pytest.fixture
+def fresh_database(tmp_path, monkeypatch):
+    # A database file of its own, with no schema applied yet
+    monkeypatch.setattr(database, "DB_PATH", str(tmp_path / "fitness.db"))
+    monkeypatch.setattr(database, "_pool", queue.LifoQueue())
+    monkeypatch.setattr(database, "_schema", {'pending': [], 'applied': set()})
+    return database.DB_PATH
+
+
+def make_workout(rng, first):
+    return {
+        'id': str(uuid.UUID(int=rng.getrandbits(128))),
+        'day': first + rng.randrange(120),
+        'type': rng.choice(TYPES),
+        'calories': float(rng.randint(50, 600)),
+        'duration': float(rng.randint(10, 90)),
+        'heart_rate': 120.0,
+        'notes': "",
+    }
+
+
+def direct_rollups(records, period, start=None, end=None):
+    buckets = defaultdict(lambda: {'workouts': 0, 'calories': 0.0, 'duration': 0.0})
+    for record in records:
+        if (start is None or record['day'] >= start) and (end is None or record['day'] <= end):
+            bucket = buckets[PERIOD_START[period](record['day'])]
+            bucket['workouts'] += 1
+            bucket['calories'] += record['calories']
+            bucket['duration'] += record['duration']
+    return [{'day': day, **buckets[day]} for day in sorted(buckets)]
+
+
+def direct_type_counts(records, start=None, end=None):
+    counts = defaultdict(int)
+    for record in records:
+        if (start is None or record['day'] >= start) and (end is None or record['day'] <= end):
+            counts[record['type']] += 1
+    return dict(counts)
+
+
+def test_rollups_match_a_direct_aggregate_including_backfilled_rows(fresh_database):
+    rng = random.Random(0)
+    first = date(2024, 1, 1).toordinal()  # a Monday
+    emails = [f"{uuid.uuid4()}@example.com" for _ in range(2)]
+
+    # Workouts written before the rollup tables existed
+    legacy = [(email, make_workout(rng, first)) for email in emails for _ in range(25)]
+    with sqlite3.connect(fresh_database) as conn:
+        conn.execute("CREATE TABLE workouts (id TEXT PRIMARY KEY, user_email TEXT NOT NULL, date TEXT NOT NULL, "
+                     "type TEXT NOT NULL, calories REAL NOT NULL, duration REAL NOT NULL, "
+                     "heart_rate REAL NOT NULL, notes TEXT NOT NULL DEFAULT '')")
+        conn.executemany(
+            "INSERT INTO workouts VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(w['id'], email, days.to_iso(w['day']), w['type'], w['calories'], w['duration'], w['heart_rate'],
+              w['notes']) for email, w in legacy],
+        )
+    database.register_schema("trackers", tracker_store.SCHEMA)
+
+    # Workouts logged afterwards upsert into the backfilled rollups
+    for _ in range(50):
+        tracker_store.add_record('workouts', rng.choice(emails), make_workout(rng, first))
+
+    for email in emails:
+        records = tracker_store.fetch_records('workouts', email)
+        assert len(records) > 25
+        for start, end in [(None, None), (first + 10, None), (None, first + 45), (first + 3, first + 100)]:
+            for period in PERIOD_START:
+                # Whole-number calories and durations, so the sums compare exactly
+                assert tracker_store.workout_rollups(email, period, start, end) == direct_rollups(
+                    records, period, start, end
+                )
+            assert tracker_store.workout_type_counts(email, start, end) == direct_type_counts(records, start, end)
+
+        summary = tracker_store.workout_summary(email)
+        assert summary['total_workouts'] == len(records)
+        assert summary['days'] == sorted({record['day'] for record in records})
@@ -0,0 +1,35 @@
+import asyncio
+import json
+
+import model_registry
+import server
+from caching import LRUCache
+
+
+def readyz():
+    response = asyncio.run(server.readyz(None))
+    return response.status_code, json.loads(response.body)
+
+
+def test_readyz_is_503_while_warming_and_on_error(monkeypatch):
+    monkeypatch.setattr(model_registry, "is_ready", lambda: False)
+    monkeypatch.setitem(model_registry._warmup, 'error', None)
+    assert readyz() == (503, {'status': 'warming'})
+
+    monkeypatch.setitem(model_registry._warmup, 'error', RuntimeError("no training data"))
+    assert readyz() == (503, {'status': 'error', 'error': "no training data"})
+
+
+def test_readyz_reports_the_prediction_cache_counters(monkeypatch):
+    cache = LRUCache(maxsize=8)
+    monkeypatch.setattr(model_registry, "prediction_cache", cache)
+    monkeypatch.setattr(model_registry, "is_ready", lambda: True)
+    monkeypatch.setattr(model_registry, "get_model", lambda: {'version': "abc123"})
+    for key in ["a", "b", "a", "a", "c"]:
+        cache.get_or_compute(key, lambda: 0.0)
+
+    assert readyz() == (200, {
+        'status': 'ready',
+        'model_version': "abc123",
+        'prediction_cache': {'hits': 2, 'misses': 3, 'size': 3, 'maxsize': 8},
+    })
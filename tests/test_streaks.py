@@ -0,0 +1,56 @@
+import random
+from datetime import date
+
+from streaks import DayIndex
+
+
+def runs(days):
+    # Brute force: lengths of the runs of consecutive days, in day order
+    lengths = []
+    previous = None
+    for day in sorted(days):
+        if previous is not None and day == previous + 1:
+            lengths[-1] += 1
+        else:
+            lengths.append(1)
+        previous = day
+    return lengths
+
+
+def test_out_of_order_add_merges_both_neighbouring_runs():
+    index = DayIndex([10, 11, 14, 15])
+    assert (index.longest_streak, index.current_streak()) == (2, 2)
+
+    index.add(13)  # joins the 14-15 run from below
+    assert (index.longest_streak, index.current_streak()) == (3, 3)
+
+    index.add(12)  # bridges 10-11 and 13-15
+    assert (index.longest_streak, index.current_streak()) == (6, 6)
+
+    index.add(3)  # an earlier day starts a new run but is not the latest
+    assert (index.longest_streak, index.current_streak()) == (6, 6)
+
+
+def test_add_reports_duplicates_and_accepts_dates_and_iso_strings():
+    index = DayIndex()
+    assert index.add(date(2024, 2, 28))
+    assert index.add("2024-02-29")
+    assert not index.add(date(2024, 2, 29).toordinal())
+    assert len(index) == 2
+    assert "2024-02-28" in index
+    assert index.current_streak() == 2
+
+
+def test_matches_brute_force_for_random_insertion_orders():
+    rng = random.Random(0)
+    for _ in range(200):
+        days = rng.sample(range(1000, 1060), rng.randint(1, 40))
+        index = DayIndex()
+        for i, day in enumerate(days):
+            index.add(day)
+            seen = days[:i + 1]
+            assert index.longest_streak == max(runs(seen))
+            assert index.current_streak() == runs(seen)[-1]
+
+        start, end = sorted(rng.sample(range(990, 1070), 2))
+        assert index.active_days(start, end) == sum(start <= day <= end for day in days)
@@ -0,0 +1,185 @@
+import random
+from datetime import date
+
+import numpy as np
+import pytest
+
+from record_store import ColumnStore
+from timeseries import PERIODS, RollingTrend, SeriesTracker, downsample_indices, period_start, period_starts
+
+TREND = {'window_days': 7, 'halflife_days': 7}
+
+
+def reference_trend(daily, window_days=7, halflife_days=7):
+    # Brute force over {day: value}: calendar-window mean and gap-decayed EWMA
+    decay = 0.5 ** (1 / halflife_days)
+    moving_average, ewma = [], []
+    previous_day = previous = None
+    for day in sorted(daily):
+        window = [value for other, value in daily.items() if day - window_days < other <= day]
+        moving_average.append(sum(window) / len(window))
+        value = daily[day]
+        previous = value if previous is None else value + decay ** (day - previous_day) * (previous - value)
+        ewma.append(previous)
+        previous_day = day
+    return sorted(daily), moving_average, ewma
+
+
+def assert_trend(trend, daily):
+    days, moving_average, ewma = reference_trend(daily, **TREND)
+    assert trend.days.tolist() == days
+    np.testing.assert_allclose(trend.moving_average, moving_average)
+    np.testing.assert_allclose(trend.ewma, ewma)
+
+
+def test_ewma_decays_by_the_gap_in_days():
+    trend = RollingTrend(window_days=7, halflife_days=7)
+    trend.push(100, 80.0)
+    trend.push(107, 70.0)  # one half-life later
+
+    assert trend.ewma.tolist() == [80.0, 75.0]
+    # The 7-day window ending on day 107 no longer holds day 100
+    assert trend.moving_average.tolist() == [80.0, 70.0]
+
+
+def test_relogging_the_latest_day_replaces_its_point():
+    trend = RollingTrend(**TREND)
+    trend.push(100, 80.0)
+    trend.push(103, 78.0)
+    trend.push(103, 76.0)
+
+    assert len(trend) == 2
+    assert_trend(trend, {100: 80.0, 103: 76.0})
+
+
+def test_push_rejects_earlier_days():
+    trend = RollingTrend(**TREND)
+    trend.push(100, 80.0)
+    with pytest.raises(ValueError):
+        trend.push(99, 81.0)
+
+
+def test_backfilling_a_day_before_the_last_trend_point_rebuilds_the_trend():
+    series = SeriesTracker('weight', 'mean', TREND)
+    for day, value in [(100, 80.0), (104, 79.0), (110, 78.0)]:
+        series.add(day, value)
+
+    series.add(102, 82.0)  # earlier than the latest point
+    assert_trend(series.trend, {100: 80.0, 102: 82.0, 104: 79.0, 110: 78.0})
+
+    series.add(104, 77.0)  # second entry of a backfilled day: daily mean 78
+    assert_trend(series.trend, {100: 80.0, 102: 82.0, 104: 78.0, 110: 78.0})
+
+
+def test_random_order_matches_brute_force():
+    rng = random.Random(0)
+    for _ in range(100):
+        series = SeriesTracker('weight', 'mean', TREND)
+        entries = {}
+        for _ in range(rng.randint(1, 40)):
+            day, value = rng.randint(1000, 1060), float(rng.randint(60, 90))
+            series.add(day, value)
+            entries.setdefault(day, []).append(value)
+        assert_trend(series.trend, {day: sum(values) / len(values) for day, values in entries.items()})
+
+        today = rng.randint(1000, 1070)
+        window = [sum(values) / len(values) for day, values in entries.items() if today - 7 < day <= today]
+        expected = sum(window) / len(window) if window else None
+        assert series.trend.current_average(today) == pytest.approx(expected)
+
+
+def test_forecast_finds_the_day_a_falling_line_reaches_the_target():
+    trend = RollingTrend(**TREND)
+    for i in range(10):
+        trend.push(200 + i, 80.0 - 0.5 * i)
+
+    slope, goal_day = trend.forecast(75.0)
+    assert slope == pytest.approx(-0.5)
+    assert goal_day == 210
+    # Heading away from the target
+    assert trend.forecast(90.0) == (pytest.approx(-0.5), None)
+
+
+def test_downsample_keeps_endpoints_and_each_buckets_extremes_within_budget():
+    rng = np.random.default_rng(0)
+    for n in [1, 2, 5, 10, 101, 1000, 5003]:
+        values = rng.normal(size=n).cumsum()
+        values[rng.integers(n)] += 50  # a spike that must survive
+        for max_points in [1, 2, 3, 4, 5, 10, 11, 100, 500, 10000]:
+            kept = downsample_indices(values, max_points)
+            assert len(kept) <= max_points
+            assert kept.tolist() == sorted(set(kept.tolist()))
+            if n <= max_points:
+                assert kept.tolist() == list(range(n))
+                continue
+            assert kept[0] == 0
+            assert kept[-1] == n - 1 or max_points == 1
+            buckets = (max_points - 2) // 2
+            if buckets < 1:
+                continue
+            # Brute force: the inner points split into `buckets` equal-count runs
+            inner = np.arange(1, n - 1)
+            bucket_of = (inner - 1) * buckets // (n - 2)
+            for bucket in range(buckets):
+                members = inner[bucket_of == bucket]
+                kept_members = values[np.intersect1d(kept, members)]
+                assert kept_members.min() == values[members].min()
+                assert kept_members.max() == values[members].max()
+            assert values[kept].max() == values.max()
+
+
+def reference_buckets(entries, period):
+    # Brute force over logged (day, value) entries: stats per period start
+    buckets = {}
+    for order, (day, value) in enumerate(entries):
+        buckets.setdefault(period_start(period, day), []).append((day, order, value))
+    stats = {}
+    for key, members in buckets.items():
+        values = [value for _, _, value in members]
+        ordered = sorted(members)
+        stats[key] = {'count': len(values), 'total': sum(values), 'min': min(values), 'max': max(values),
+                      'first': ordered[0][2], 'last': ordered[-1][2]}
+    return stats
+
+
+def test_period_stats_match_brute_force_for_random_insertion_orders():
+    rng = random.Random(0)
+    for _ in range(100):
+        series = SeriesTracker('steps')
+        entries = []
+        for _ in range(rng.randint(1, 60)):
+            # Whole numbers, so totals compare exactly; days span ~4 months in any order
+            entries.append((rng.randint(738000, 738120), float(rng.randint(0, 20000))))
+            series.add(*entries[-1])
+
+        store = ColumnStore('steps')
+        for day, value in entries:
+            store.append({'day': day, 'steps': value, 'distance': 0.0})
+        rebuilt = SeriesTracker.from_store(store, 'steps')
+
+        for period in PERIODS:
+            expected = reference_buckets(entries, period)
+            best_total = max(stats['total'] for stats in expected.values())
+            best_key = min(key for key, stats in expected.items() if stats['total'] == best_total)
+            for tracker in (series, rebuilt):
+                assert tracker.periods(period) == len(expected)
+                assert tracker.best(period) == (best_key, expected[best_key])
+                for day in range(737995, 738125, 3):
+                    assert tracker.bucket(period, day) == expected.get(period_start(period, day))
+                frame = tracker.chart_frame(period, 'total', start=738030, end=738090)
+                keys = sorted(key for key in expected if period_start(period, 738030) <= key <= 738090)
+                assert frame['steps'].tolist() == [expected[key]['total'] for key in keys]
+
+        daily = reference_buckets(entries, 'day')
+        assert series.first() == rebuilt.first() == daily[min(daily)]['first']
+        assert series.last() == rebuilt.last() == daily[max(daily)]['last']
+
+
+def test_week_and_month_boundaries():
+    monday, sunday = date(2024, 1, 29).toordinal(), date(2024, 2, 4).toordinal()
+    assert period_start('week', sunday) == monday
+    assert period_start('month', sunday) == date(2024, 2, 1).toordinal()
+    assert period_start('month', date(2024, 12, 31).toordinal()) == date(2024, 12, 1).toordinal()
+    np.testing.assert_array_equal(
+        period_starts('month', [monday, sunday]), [date(2024, 1, 1).toordinal(), date(2024, 2, 1).toordinal()]
+    )
@@ -0,0 +1,67 @@
+import random
+import uuid
+
+import pytest
+
+import tracker_store
+
+
+def log_steps(email, days):
+    records = []
+    for day in days:
+        record = {'id': str(uuid.uuid4()), 'day': day, 'steps': random.randint(0, 20000), 'distance': 1.0}
+        tracker_store.add_record('steps', email, record)
+        records.append(record)
+    return records
+
+
+def newest_first(records):
+    # Date descending; entries of one date newest-logged first
+    order = sorted(range(len(records)), key=lambda i: (records[i]['day'], i), reverse=True)
+    return [records[i]['id'] for i in order]
+
+
+def page_all(email, limit):
+    pages = []
+    cursor = None
+    while True:
+        rows, cursor = tracker_store.recent_records('steps', email, limit, before=cursor)
+        pages.append(rows)
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("limit", [1, 3, 4, 12, 13])
+def test_paging_returns_every_row_once_newest_first(limit):
+    email = f"{uuid.uuid4()}@example.com"
+    # 12 records with several entries sharing a date, so the rowid tiebreak matters
+    records = log_steps(email, [738000, 738002, 738001, 738002, 738002, 738000, 738005, 738001, 738003, 738002,
+                                738004, 738003])
+
+    pages = page_all(email, limit)
+
+    assert [row['id'] for page in pages for row in page] == newest_first(records)
+    assert all(len(page) == limit for page in pages[:-1])
+    assert pages[-1]
+
+
+@pytest.mark.parametrize("limit", [2, 4])
+def test_history_of_an_exact_multiple_of_limit_rows_has_no_empty_last_page(limit):
+    email = f"{uuid.uuid4()}@example.com"
+    records = log_steps(email, [738000, 738001, 738001, 738002])
+
+    pages = page_all(email, limit)
+
+    assert [len(page) for page in pages] == [limit] * (4 // limit)
+    assert [row['id'] for page in pages for row in page] == newest_first(records)
+
+
+def test_paging_is_per_user():
+    email, other = f"{uuid.uuid4()}@example.com", f"{uuid.uuid4()}@example.com"
+    records = log_steps(email, [738000, 738001])
+    log_steps(other, [738000, 738001, 738002])
+
+    rows, cursor = tracker_store.recent_records('steps', email, 5)
+    assert [row['id'] for row in rows] == newest_first(records)
+    assert cursor is None
+    assert rows[0]['day'] == 738001
@@ -0,0 +1,101 @@
+import threading
+import uuid
+
+import database
+import passwords
+import user_store
+
+
+def new_email():
+    return f"{uuid.uuid4()}@example.com"
+
+
+def test_duplicate_email_is_rejected():
+    email = new_email()
+    assert user_store.create_user(email, "first", "First", "👤")
+    assert not user_store.create_user(email, "second", "Second", "🧑")
+
+    assert user_store.authenticate(email, "first")['name'] == "First"
+    assert user_store.authenticate(email, "second") is None
+
+
+def test_mixed_case_and_padded_emails_share_one_account():
+    email = new_email()
+    assert user_store.create_user(f"  {email.upper()} ", "secret", "Casey", "👤")
+    assert not user_store.create_user(email, "other", "Other", "👤")
+
+    for variant in [email, email.upper(), f"\t{email.title()}  "]:
+        assert user_store.authenticate(variant, "secret") == {'email': email, 'name': "Casey", 'profile_pic': "👤"}
+
+
+def test_concurrent_registrations_of_one_email_create_one_account():
+    email = new_email()
+    start = threading.Barrier(8)
+    results = []
+
+    def register(i):
+        start.wait()
+        results.append(user_store.create_user(email if i % 2 else email.upper(), f"password{i}", f"User {i}", "👤"))
+
+    threads = [threading.Thread(target=register, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results) == [False] * 7 + [True]
+    with database.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM users WHERE email = ?", (email,)).fetchone()[0] == 1
+
+
+def test_authenticate_rejects_a_wrong_password_and_an_unknown_email():
+    email = new_email()
+    user_store.create_user(email, "correct horse", "Robin", "👤")
+
+    assert user_store.authenticate(email, "battery staple") is None
+    assert user_store.authenticate(new_email(), "correct horse") is None
+    assert user_store.authenticate(email, "correct horse")['email'] == email
+
+
+def test_unknown_email_verifies_against_the_dummy_hash(monkeypatch):
+    checked = []
+    verify = passwords.verify_password
+
+    def recording_verify(password, stored):
+        checked.append(stored)
+        return verify(password, stored)
+
+    monkeypatch.setattr(passwords, "verify_password", recording_verify)
+    assert user_store.authenticate(new_email(), "password123") is None
+    assert checked == [passwords.DUMMY_HASH]
+
+
+def test_legacy_plaintext_password_is_upgraded_on_login():
+    email = new_email()
+    with database.connection() as conn:
+        with conn:
+            conn.execute("INSERT INTO users (email, password, name, profile_pic) VALUES (?, ?, ?, ?)",
+                         (email, "hunter2", "Legacy User", "👤"))
+
+    assert user_store.authenticate(email, "wrong") is None
+    assert user_store._get_row(email)['password'] == "hunter2"
+
+    user = user_store.authenticate(email, "hunter2")
+    assert user == {'email': email, 'name': "Legacy User", 'profile_pic': "👤"}
+    stored = user_store._get_row(email)['password']
+    assert stored.startswith("scrypt$") and not passwords.needs_rehash(stored)
+    assert user_store.authenticate(email, "hunter2") == user
+
+
+def test_demo_accounts_are_only_seeded_when_opted_in(monkeypatch):
+    monkeypatch.setitem(user_store._demo_seed, 'done', False)
+    monkeypatch.setattr(user_store, "DEMO_USERS", {new_email(): {'name': "Demo", 'profile_pic': "👤"}})
+    (email, _), = user_store.DEMO_USERS.items()
+
+    monkeypatch.delenv("FITNESS_DEMO_PASSWORD", raising=False)
+    user_store.seed_demo_users()
+    assert user_store._get_row(email) is None
+
+    monkeypatch.setenv("FITNESS_DEMO_PASSWORD", "demo-secret")
+    user_store.seed_demo_users()
+    assert user_store.authenticate(email, "demo-secret")['name'] == "Demo"
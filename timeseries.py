@@ -0,0 +1,439 @@
+# Generic time-series engine for the health trackers (weight, steps, water, ...)
+#
+# A SeriesTracker folds each logged value into per-day, per-week and
+# per-month stats (count, total, min, max, first, last) held in parallel NumPy
+# arrays sorted by period, the layout record_store uses, so a logged day costs
+# a few dozen bytes instead of a dict. An add updates one bucket per level
+# and the running best period: a binary search, O(log n), plus an O(n) array
+# shift when it opens a period earlier than the latest one (a backfill).
+# Bucket lookups and best() never rescan history.
+# chart_frame() is the shared adapter that turns a period's stats into chart
+# data. A new metric is a METRICS entry plus its record_store/tracker_store
+# schema.
+#
+# Metrics with a 'trend' also keep a RollingTrend over their daily values: a
+# time-based moving average (ring buffer of the last N days) and an EWMA,
+# both advanced in O(1) per day logged in order (a backfilled day replays the
+# daily values), plus a least-squares goal forecast.
+#
+# Long series are reduced to a point budget before plotting with min/max
+# bucketing (downsample_indices): every bucket keeps its lowest and highest
+# point, so peaks and dips survive while the browser gets a bounded payload.
+import numpy as np
+
+import days
+
+PERIODS = ['day', 'week', 'month']
+
+# tracker -> the record field it tracks and how a day's entries combine for charts
+METRICS = {
+    'weight': {'field': 'weight', 'daily': 'mean', 'trend': {'window_days': 7, 'halflife_days': 7}},
+    'steps': {'field': 'steps', 'daily': 'total'},
+    'water': {'field': 'amount', 'daily': 'total'},
+}
+
+
+def period_start(period, day):
+    # First day ordinal of the period containing `day`; ordinal 1 (0001-01-01) is a Monday
+    if period == 'day':
+        return day
+    if period == 'week':
+        return day - (day - 1) % 7
+    return days.month_start(day)
+
+
+def period_starts(period, ordinals):
+    # period_start over an array of day ordinals
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    if period == 'day':
+        return ordinals
+    if period == 'week':
+        return ordinals - (ordinals - 1) % 7
+    months = days.to_datetime64(ordinals).astype("datetime64[M]").astype("datetime64[D]")
+    return months.astype(np.int64) + days.EPOCH_ORDINAL
+
+
+def downsample_indices(values, max_points):
+    # Sorted indices of at most `max_points` points that keep the first and last
+    # point and the min and max of each of (max_points - 2) // 2 equal-count
+    # buckets over the points in between. One lexsort, no per-bucket loop.
+    values = np.asarray(values)
+    n = len(values)
+    if n <= max_points:
+        return np.arange(n)
+    buckets = (max_points - 2) // 2
+    if buckets < 1:
+        # No room for a bucket's min and max: keep the endpoints the budget allows
+        return np.array([0, n - 1][:max_points])
+    inner = np.arange(1, n - 1)
+    bucket = (inner - 1) * buckets // (n - 2)
+    # Inner points ordered by bucket, then by value: each bucket's min comes first and its max last
+    order = inner[np.lexsort((values[inner], bucket))]
+    counts = np.bincount(bucket, minlength=buckets)
+    last = np.cumsum(counts) - 1
+    first = last - counts + 1
+    return np.unique(np.concatenate(([0], order[first], order[last], [n - 1])))
+
+
+def _grow(column, size):
+    # Same column with twice the capacity, first `size` entries copied
+    grown = np.empty(2 * len(column), dtype=column.dtype)
+    grown[:size] = column[:size]
+    return grown
+
+
+class RollingTrend:
+    # Trend over one value per day, fed in day order. Re-feeding the latest day
+    # replaces its value; an earlier day needs a rebuild (see SeriesTracker).
+    # Trend points live in parallel arrays that grow by doubling.
+    __slots__ = ('window_days', 'decay', '_days', '_values', '_moving_average', '_ewma', '_points',
+                 '_ring_days', '_ring_values', '_head', '_size', '_sum', '_previous_ewma')
+
+    def __init__(self, window_days=7, halflife_days=7, capacity=64):
+        self.window_days = window_days
+        self.decay = 0.5 ** (1 / halflife_days)  # EWMA weight kept per elapsed day
+        # Trend points, one per logged day
+        self._days = np.empty(capacity, dtype=np.int32)
+        self._values = np.empty(capacity, dtype=np.float64)
+        self._moving_average = np.empty(capacity, dtype=np.float64)
+        self._ewma = np.empty(capacity, dtype=np.float64)
+        self._points = 0
+        # Ring buffer of the days inside the moving-average window (at most one per day)
+        self._ring_days = [0] * window_days
+        self._ring_values = [0.0] * window_days
+        self._head = 0
+        self._size = 0
+        self._sum = 0.0
+        self._previous_ewma = None  # EWMA before the latest day, for same-day updates
+
+    def __len__(self):
+        return self._points
+
+    # Zero-copy views of the filled points
+    @property
+    def days(self):
+        return self._days[:self._points]
+
+    @property
+    def values(self):
+        return self._values[:self._points]
+
+    @property
+    def moving_average(self):
+        return self._moving_average[:self._points]
+
+    @property
+    def ewma(self):
+        return self._ewma[:self._points]
+
+    def push(self, day, value):
+        last_point = self._points - 1
+        if self._points and day == self._days[last_point]:
+            # Latest day's value changed: swap it in the ring and recompute the last point
+            last = (self._head + self._size - 1) % self.window_days
+            self._sum += value - self._ring_values[last]
+            self._ring_values[last] = value
+            self._values[last_point] = value
+            self._moving_average[last_point] = self._sum / self._size
+            self._ewma[last_point] = self._next_ewma(self._previous_ewma, value, self._gap)
+            return
+        if self._points and day < self._days[last_point]:
+            raise ValueError("RollingTrend days must be pushed in order")
+
+        # Evict days that fell out of the window, then append
+        while self._size and self._ring_days[self._head] <= day - self.window_days:
+            self._sum -= self._ring_values[self._head]
+            self._head = (self._head + 1) % self.window_days
+            self._size -= 1
+        tail = (self._head + self._size) % self.window_days
+        self._ring_days[tail] = day
+        self._ring_values[tail] = value
+        self._size += 1
+        self._sum += value
+
+        if self._points == len(self._days):
+            self._days = _grow(self._days, self._points)
+            self._values = _grow(self._values, self._points)
+            self._moving_average = _grow(self._moving_average, self._points)
+            self._ewma = _grow(self._ewma, self._points)
+        self._previous_ewma = float(self._ewma[last_point]) if self._points else None
+        point = self._points
+        self._days[point] = day
+        self._values[point] = value
+        self._points += 1
+        self._moving_average[point] = self._sum / self._size
+        self._ewma[point] = self._next_ewma(self._previous_ewma, value, self._gap)
+
+    @property
+    def _gap(self):
+        return int(self._days[self._points - 1] - self._days[self._points - 2]) if self._points > 1 else 0
+
+    def _next_ewma(self, previous, value, gap):
+        # Irregular spacing: a gap of g days decays the old average by decay ** g
+        if previous is None:
+            return value
+        return value + (self.decay ** gap) * (previous - value)
+
+    def current_average(self, today):
+        # Moving average of the window ending `today` (None if no day falls in it)
+        start = today - self.window_days + 1
+        lo = np.searchsorted(self.days, start)
+        hi = np.searchsorted(self.days, today, side='right')
+        return float(self.values[lo:hi].mean()) if hi > lo else None
+
+    def forecast(self, target, window_days=90):
+        # Least-squares line through the daily values of the `window_days` days
+        # ending at the latest logged day. Returns (slope per day, first day
+        # ordinal the line reaches `target`); the day is None if the line is
+        # flat or heading away from the target.
+        lo = np.searchsorted(self.days, self.days[-1] - window_days + 1) if self._points else 0
+        x = self.days[lo:].astype(np.float64)
+        y = self.values[lo:]
+        if len(x) < 2:
+            return None, None
+        dx = x - x.mean()
+        slope = float(np.dot(dx, y - y.mean()) / np.dot(dx, dx))
+        intercept = y.mean() - slope * x.mean()
+        fitted_latest = intercept + slope * x[-1]
+        if slope == 0 or (target - fitted_latest) * slope < 0:
+            return slope, None
+        return slope, int(np.ceil((target - intercept) / slope))
+
+
+# Per-bucket stats, in parallel arrays indexed like the bucket keys
+STATS = {'count': np.int32, 'total': np.float64, 'min': np.float64, 'max': np.float64,
+         'first': np.float64, 'last': np.float64}
+# The days 'first' and 'last' came from, so a backfilled day can take over either end
+EDGE_DAYS = {'first_day': np.int32, 'last_day': np.int32}
+
+
+class _Buckets:
+    # Stats of one period level (day, week or month), keyed by the period's
+    # first day ordinal, sorted. The period with the largest total is kept as
+    # a running max.
+    __slots__ = ('period', 'size', 'columns', 'best_key', 'best_total')
+
+    def __init__(self, period, capacity=64):
+        self.period = period
+        self.size = 0
+        self.columns = {name: np.empty(capacity, dtype=dtype)
+                        for name, dtype in {'key': np.int32, **EDGE_DAYS, **STATS}.items()}
+        self.best_key = None
+        self.best_total = None
+
+    @classmethod
+    def from_entries(cls, period, ordered_days, values):
+        # Built with NumPy reductions from entries sorted by day (stable, so a
+        # day's entries keep their logged order)
+        buckets = cls(period, capacity=max(64, len(ordered_days)))
+        if len(ordered_days):
+            keys = period_starts(period, ordered_days)
+            starts = np.flatnonzero(np.diff(keys, prepend=keys[0] - 1))
+            ends = np.append(starts[1:], len(keys))
+            size = buckets.size = len(starts)
+            columns = buckets.columns
+            columns['key'][:size] = keys[starts]
+            columns['first_day'][:size] = ordered_days[starts]
+            columns['last_day'][:size] = ordered_days[ends - 1]
+            columns['count'][:size] = ends - starts
+            columns['total'][:size] = np.add.reduceat(values, starts)
+            columns['min'][:size] = np.minimum.reduceat(values, starts)
+            columns['max'][:size] = np.maximum.reduceat(values, starts)
+            columns['first'][:size] = values[starts]
+            columns['last'][:size] = values[ends - 1]
+            buckets._find_best()
+        return buckets
+
+    def keys(self):
+        return self.columns['key'][:self.size]
+
+    def _find_best(self):
+        best = int(np.argmax(self.columns['total'][:self.size]))
+        self.best_key = int(self.columns['key'][best])
+        self.best_total = float(self.columns['total'][best])
+
+    def add(self, day, value):
+        # Folds one entry into its period; returns the period's position
+        columns = self.columns
+        size = self.size
+        key = period_start(self.period, day)
+        position = int(np.searchsorted(self.keys(), key))
+        if position < size and columns['key'][position] == key:
+            columns['count'][position] += 1
+            columns['total'][position] += value
+            columns['min'][position] = min(columns['min'][position], value)
+            columns['max'][position] = max(columns['max'][position], value)
+            if day < columns['first_day'][position]:
+                columns['first_day'][position] = day
+                columns['first'][position] = value
+            if day >= columns['last_day'][position]:
+                columns['last_day'][position] = day
+                columns['last'][position] = value
+        else:
+            if size == len(columns['key']):
+                for name, column in columns.items():
+                    columns[name] = _grow(column, size)
+            if position < size:
+                # Backfilled an earlier period: shift the later ones up one slot
+                for column in columns.values():
+                    column[position + 1:size + 1] = column[position:size]
+            columns['key'][position] = key
+            columns['first_day'][position] = columns['last_day'][position] = day
+            columns['count'][position] = 1
+            for stat in ('total', 'min', 'max', 'first', 'last'):
+                columns[stat][position] = value
+            self.size += 1
+
+        total = float(columns['total'][position])
+        if value < 0 and key == self.best_key:
+            # The best period's total shrank, so another may have overtaken it
+            self._find_best()
+        elif self.best_key is None or total > self.best_total or (total == self.best_total and key < self.best_key):
+            self.best_key, self.best_total = key, total
+        return position
+
+    def bounds(self, start, end):
+        # Positions lo:hi of the periods whose keys lie in [start, end] (None = open)
+        keys = self.keys()
+        lo = 0 if start is None else int(np.searchsorted(keys, start))
+        hi = self.size if end is None else int(np.searchsorted(keys, end, side='right'))
+        return lo, hi
+
+    def stats(self, position):
+        return {stat: self.columns[stat][position].item() for stat in STATS}
+
+
+class SeriesTracker:
+    __slots__ = ('field', 'daily', 'trend', 'count', 'total', 'min', 'max', '_levels', '_trend_args')
+
+    def __init__(self, field, daily='total', trend=None, capacity=64):
+        self.field = field
+        self.daily = daily
+        # Optional RollingTrend over the daily values (mean or total per `daily`)
+        self._trend_args = trend
+        self.trend = RollingTrend(**trend) if trend else None
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        # Day, week and month stats, each updated on every add
+        self._levels = {period: _Buckets(period, capacity) for period in PERIODS}
+
+    @classmethod
+    def from_store(cls, store, field, daily='total', trend=None):
+        # Builds every period level from a record_store.ColumnStore with NumPy
+        # reductions; a day's entries keep their logged order for first/last
+        day_column = store.column('day')
+        order = np.argsort(day_column, kind='stable')
+        ordered_days = day_column[order]
+        values = store.column(field)[order].astype(np.float64)
+        series = cls(field, daily)
+        series._levels = {period: _Buckets.from_entries(period, ordered_days, values) for period in PERIODS}
+        if len(order):
+            series.count = len(order)
+            series.total = float(values.sum())
+            series.min = float(values.min())
+            series.max = float(values.max())
+        if trend:
+            series._trend_args = trend
+            series.rebuild_trend()
+        return series
+
+    def __len__(self):
+        return self.count
+
+    def add(self, day, value):
+        for period in ('week', 'month'):
+            self._levels[period].add(day, value)
+        position = self._levels['day'].add(day, value)
+
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+        if self.trend is not None:
+            if len(self.trend) and day < self.trend.days[-1]:
+                # Backfilled an earlier day: replay the daily values in order
+                self.rebuild_trend()
+            else:
+                self.trend.push(day, self._daily_value(position))
+
+    def _daily_value(self, position):
+        columns = self._levels['day'].columns
+        if self.daily == 'mean':
+            return float(columns['total'][position] / columns['count'][position])
+        return float(columns[self.daily][position])
+
+    def rebuild_trend(self):
+        logged = self._levels['day'].keys()
+        self.trend = RollingTrend(**self._trend_args, capacity=max(64, len(logged)))
+        for position, day in enumerate(logged.tolist()):
+            self.trend.push(day, self._daily_value(position))
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def bucket(self, period, day):
+        # Stats of the period containing `day`, or None if nothing was logged
+        buckets = self._levels[period]
+        key = period_start(period, days.to_ordinal(day))
+        position = int(np.searchsorted(buckets.keys(), key))
+        if position == buckets.size or buckets.columns['key'][position] != key:
+            return None
+        return buckets.stats(position)
+
+    def day(self, day):
+        return self.bucket('day', day)
+
+    def periods(self, period):
+        # Number of periods with at least one entry
+        return self._levels[period].size
+
+    def best(self, period):
+        # (first day ordinal, stats) of the period with the largest total
+        buckets = self._levels[period]
+        if buckets.best_key is None:
+            return None, None
+        return buckets.best_key, self.bucket(period, buckets.best_key)
+
+    def first(self):
+        # Earliest value: the first entry logged for the earliest day
+        return float(self._levels['day'].columns['first'][0]) if self.count else None
+
+    def last(self):
+        # Latest value: the last entry logged for the latest day
+        level = self._levels['day']
+        return float(level.columns['last'][level.size - 1]) if self.count else None
+
+    def chart_frame(self, period='day', stat='total', start=None, end=None, max_points=None):
+        # DataFrame with a datetime64 'date' column and one row per period
+        # for `stat` ('total', 'mean', 'min', 'max', 'first', 'last' or 'count'),
+        # min/max downsampled to `max_points` rows if given. Periods are whole:
+        # one counts if it starts on or before `end`.
+        import pandas as pd
+
+        buckets = self._levels[period]
+        start = None if start is None else period_start(period, days.to_ordinal(start))
+        end = None if end is None else days.to_ordinal(end)
+        lo, hi = buckets.bounds(start, end)
+        columns = buckets.columns
+        keys = columns['key'][lo:hi]
+        # A copy, not a view: later adds update the stat arrays in place
+        if stat == 'mean':
+            values = columns['total'][lo:hi] / columns['count'][lo:hi]
+        else:
+            values = columns[stat][lo:hi].copy()
+        if max_points is not None:
+            kept = downsample_indices(values, max_points)
+            keys, values = keys[kept], values[kept]
+        return pd.DataFrame({'date': days.to_datetime64(keys), self.field: values})
+
+
+def build(stores):
+    # tracker -> SeriesTracker for every METRICS tracker, from the user's column stores
+    return {
+        tracker: SeriesTracker.from_store(stores[tracker], metric['field'], metric['daily'], metric.get('trend'))
+        for tracker, metric in METRICS.items()
+    }
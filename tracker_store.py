@@ -0,0 +1,228 @@
+# Durable per-user storage for workouts and the health trackers
+#
+# Each tracker is its own table in the shared SQLite database (WAL mode),
+# indexed on (user, date) -- and (user, type) for workouts -- so every view
+# fetches exactly the rows it shows instead of rescanning session lists.
+# Dates are stored as ISO "%Y-%m-%d" text, which sorts and range-compares
+# correctly; records and range arguments use integer day ordinals ('day', see
+# days.py), converted at this boundary.
+#
+# Workouts also maintain per-day rollups (totals and per-type counts) in the
+# same transaction as the insert, so progress views and summaries read one
+# row per day rather than one row per workout ever logged.
+import database
+import days
+
+# tracker -> (table, record fields); the 'day' field is stored in the date column
+TRACKERS = {
+    'workouts': ('workouts', ['id', 'day', 'type', 'calories', 'duration', 'heart_rate', 'notes']),
+    'weight': ('weight_entries', ['id', 'day', 'weight', 'notes']),
+    'steps': ('step_entries', ['id', 'day', 'steps', 'distance']),
+    'water': ('water_entries', ['id', 'day', 'amount', 'type']),
+}
+
+DAY_COLUMN = days.SQL_DAY.format(column="date") + " AS day"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS workouts (
+    id TEXT PRIMARY KEY,
+    user_email TEXT NOT NULL,
+    date TEXT NOT NULL,
+    type TEXT NOT NULL,
+    calories REAL NOT NULL,
+    duration REAL NOT NULL,
+    heart_rate REAL NOT NULL,
+    notes TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS workouts_user_date ON workouts (user_email, date);
+CREATE INDEX IF NOT EXISTS workouts_user_type ON workouts (user_email, type);
+
+CREATE TABLE IF NOT EXISTS weight_entries (
+    id TEXT PRIMARY KEY,
+    user_email TEXT NOT NULL,
+    date TEXT NOT NULL,
+    weight REAL NOT NULL,
+    notes TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS weight_entries_user_date ON weight_entries (user_email, date);
+
+CREATE TABLE IF NOT EXISTS step_entries (
+    id TEXT PRIMARY KEY,
+    user_email TEXT NOT NULL,
+    date TEXT NOT NULL,
+    steps INTEGER NOT NULL,
+    distance REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS step_entries_user_date ON step_entries (user_email, date);
+
+CREATE TABLE IF NOT EXISTS water_entries (
+    id TEXT PRIMARY KEY,
+    user_email TEXT NOT NULL,
+    date TEXT NOT NULL,
+    amount REAL NOT NULL,
+    type TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS water_entries_user_date ON water_entries (user_email, date);
+
+CREATE TABLE IF NOT EXISTS workout_days (
+    user_email TEXT NOT NULL,
+    date TEXT NOT NULL,
+    workouts INTEGER NOT NULL,
+    calories REAL NOT NULL,
+    duration REAL NOT NULL,
+    PRIMARY KEY (user_email, date)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS workout_day_types (
+    user_email TEXT NOT NULL,
+    date TEXT NOT NULL,
+    type TEXT NOT NULL,
+    workouts INTEGER NOT NULL,
+    PRIMARY KEY (user_email, date, type)
+) WITHOUT ROWID;
+
+-- Backfill rollups for workouts stored before the rollup tables existed
+INSERT INTO workout_days
+SELECT user_email, date, COUNT(*), SUM(calories), SUM(duration) FROM workouts
+WHERE NOT EXISTS (SELECT 1 FROM workout_days)
+GROUP BY user_email, date;
+INSERT INTO workout_day_types
+SELECT user_email, date, type, COUNT(*) FROM workouts
+WHERE NOT EXISTS (SELECT 1 FROM workout_day_types)
+GROUP BY user_email, date, type;
+"""
+
+# Rollup period -> SQL expression for the first date of the period containing `date`
+PERIODS = {
+    'day': "date",
+    'week': "date(date, 'weekday 0', '-6 days')",  # Monday
+    'month': "substr(date, 1, 7) || '-01'",
+}
+
+database.register_schema("trackers", SCHEMA)
+
+
+def _date_range(email, start, end):
+    # start/end are inclusive day ordinals
+    where, params = ["user_email = ?"], [email]
+    if start is not None:
+        where.append("date >= ?")
+        params.append(days.to_iso(start))
+    if end is not None:
+        where.append("date <= ?")
+        params.append(days.to_iso(end))
+    return " AND ".join(where), params
+
+
+def _select_list(fields):
+    return ", ".join(DAY_COLUMN if field == 'day' else field for field in fields)
+
+
+def _update_workout_rollups(conn, email, workout, date):
+    conn.execute(
+        "INSERT INTO workout_days (user_email, date, workouts, calories, duration) VALUES (?, ?, 1, ?, ?) "
+        "ON CONFLICT (user_email, date) DO UPDATE SET workouts = workouts + 1, "
+        "calories = calories + excluded.calories, duration = duration + excluded.duration",
+        (email, date, workout['calories'], workout['duration']),
+    )
+    conn.execute(
+        "INSERT INTO workout_day_types (user_email, date, type, workouts) VALUES (?, ?, ?, 1) "
+        "ON CONFLICT (user_email, date, type) DO UPDATE SET workouts = workouts + 1",
+        (email, date, workout['type']),
+    )
+
+
+def add_record(tracker, email, record):
+    table, fields = TRACKERS[tracker]
+    date = days.to_iso(record['day'])
+    columns = ['date' if field == 'day' else field for field in fields]
+    values = [date if field == 'day' else record[field] for field in fields]
+    with database.connection() as conn:
+        with conn:
+            conn.execute(
+                f"INSERT INTO {table} (user_email, {', '.join(columns)}) VALUES (?, {', '.join('?' * len(columns))})",
+                [email] + values,
+            )
+            if tracker == 'workouts':
+                _update_workout_rollups(conn, email, record, date)
+
+
+def fetch_records(tracker, email):
+    # Every record of the user, oldest first; pages of history come from recent_records
+    table, fields = TRACKERS[tracker]
+    with database.connection() as conn:
+        return [
+            dict(row) for row in conn.execute(
+                f"SELECT {_select_list(fields)} FROM {table} WHERE user_email = ? ORDER BY date, rowid", (email,)
+            )
+        ]
+
+
+def recent_records(tracker, email, limit, before=None):
+    # Newest-first page of at most `limit` records, read backwards along the
+    # (user_email, date) index. `before` is the cursor returned with the
+    # previous page; the returned cursor is None once history is exhausted.
+    # One extra row is read to tell a full last page from a page with more after it.
+    table, fields = TRACKERS[tracker]
+    where, params = "user_email = ?", [email]
+    if before is not None:
+        where += " AND (date, rowid) < (?, ?)"
+        params += list(before)
+    with database.connection() as conn:
+        rows = conn.execute(
+            f"SELECT rowid, date, {_select_list(fields)} FROM {table} WHERE {where} "
+            f"ORDER BY date DESC, rowid DESC LIMIT ?",
+            params + [limit + 1],
+        ).fetchall()
+    cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        cursor = (rows[-1]['date'], rows[-1]['rowid'])
+    return [{field: row[field] for field in fields} for row in rows], cursor
+
+
+def workout_rollups(email, period='day', start=None, end=None):
+    # Calories, duration and workout count per day/week/month, oldest first;
+    # weeks and months are summed from the daily rollups
+    where, params = _date_range(email, start, end)
+    bucket = PERIODS[period]
+    with database.connection() as conn:
+        rows = conn.execute(
+            f"SELECT {days.SQL_DAY.format(column=bucket)} AS day, SUM(workouts) AS workouts, "
+            f"SUM(calories) AS calories, SUM(duration) AS duration "
+            f"FROM workout_days WHERE {where} GROUP BY 1 ORDER BY 1",
+            params,
+        )
+        return [dict(row) for row in rows]
+
+
+def workout_type_counts(email, start=None, end=None):
+    where, params = _date_range(email, start, end)
+    with database.connection() as conn:
+        rows = conn.execute(
+            f"SELECT type, SUM(workouts) AS workouts FROM workout_day_types WHERE {where} GROUP BY type",
+            params,
+        )
+        return {row['type']: row['workouts'] for row in rows}
+
+
+def workout_summary(email):
+    # Totals, per-type counts and distinct workout days, read from the rollups
+    rollups = workout_rollups(email)
+    return {
+        'total_workouts': sum(rollup['workouts'] for rollup in rollups),
+        'total_calories': sum(rollup['calories'] for rollup in rollups),
+        'total_duration': sum(rollup['duration'] for rollup in rollups),
+        'type_counts': workout_type_counts(email),
+        'days': [rollup['day'] for rollup in rollups],
+    }
+
+
+def active_days(tracker, email):
+    # Distinct days with at least one entry, served from the (user_email, date) index
+    table = 'workout_days' if tracker == 'workouts' else TRACKERS[tracker][0]
+    with database.connection() as conn:
+        rows = conn.execute(
+            f"SELECT {DAY_COLUMN} FROM {table} WHERE user_email = ? GROUP BY date ORDER BY date", (email,)
+        )
+        return [row['day'] for row in rows]
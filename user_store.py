@@ -0,0 +1,111 @@
+# Process-wide user directory backed by the shared SQLite database
+#
+# Replaces the per-session st.session_state.users dict: an account created in
+# one browser session is visible to all others, lookups are a single primary
+# key query, and nothing about other users is held in session memory.
+# Passwords are stored as salted scrypt hashes (see passwords.py).
+import hashlib
+import hmac
+import os
+import threading
+
+import database
+import passwords
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    email TEXT PRIMARY KEY,
+    password TEXT NOT NULL,
+    name TEXT NOT NULL,
+    profile_pic TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Demo accounts, created only when FITNESS_DEMO_PASSWORD is set (see
+# seed_demo_users). No password lives in source, so a deployment without the
+# variable has no known login.
+DEMO_USERS = {
+    'demo@example.com': {'name': 'Demo User', 'profile_pic': '👤'},
+    'john@example.com': {'name': 'John Smith', 'profile_pic': '🧑'},
+    'jane@example.com': {'name': 'Jane Doe', 'profile_pic': '👩'},
+}
+_demo_seed = {'done': False}
+_demo_seed_lock = threading.Lock()
+
+# Registration locks are striped by email, so sign-ups for different
+# addresses proceed in parallel while the same address is serialized
+_REGISTRATION_STRIPES = 64
+_registration_locks = [threading.Lock() for _ in range(_REGISTRATION_STRIPES)]
+
+database.register_schema("users", SCHEMA)
+
+
+def normalize_email(email):
+    return (email or "").strip().lower()
+
+
+def _registration_lock(email):
+    digest = hashlib.blake2b(email.encode(), digest_size=2).digest()
+    return _registration_locks[int.from_bytes(digest, "big") % _REGISTRATION_STRIPES]
+
+
+def _get_row(email):
+    with database.connection() as conn:
+        return conn.execute(
+            "SELECT email, password, name, profile_pic FROM users WHERE email = ?",
+            (normalize_email(email),),
+        ).fetchone()
+
+
+def _update_password_hash(email, password_hash):
+    with database.connection() as conn:
+        with conn:
+            conn.execute("UPDATE users SET password = ? WHERE email = ?", (password_hash, email))
+
+
+def authenticate(email, password):
+    # Returns the user (without the hash) if the password matches, else None
+    row = _get_row(email)
+    stored = row['password'] if row is not None else passwords.DUMMY_HASH
+
+    if stored.startswith(f"{passwords.SCHEME}$"):
+        valid = passwords.verify_password(password, stored)
+    else:
+        # Plaintext row written before passwords were hashed
+        valid = hmac.compare_digest(stored.encode("utf-8"), password.encode("utf-8"))
+
+    if row is None or not valid:
+        return None
+    if passwords.needs_rehash(stored):
+        _update_password_hash(row['email'], passwords.hash_password(password))
+    return {'email': row['email'], 'name': row['name'], 'profile_pic': row['profile_pic']}
+
+
+def create_user(email, password, name, profile_pic):
+    # Returns False if the email is already registered
+    email = normalize_email(email)
+    with _registration_lock(email):
+        if _get_row(email) is not None:
+            return False
+        password_hash = passwords.hash_password(password)
+        with database.connection() as conn:
+            with conn:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO users (email, password, name, profile_pic) VALUES (?, ?, ?, ?)",
+                    (email, password_hash, name, profile_pic),
+                )
+            return cursor.rowcount == 1
+
+
+def seed_demo_users(password=None):
+    # Opt-in and once per process: creates the demo accounts with `password`
+    # (default: FITNESS_DEMO_PASSWORD); does nothing without one
+    password = os.environ.get("FITNESS_DEMO_PASSWORD") if password is None else password
+    if not password:
+        return
+    with _demo_seed_lock:
+        if _demo_seed['done']:
+            return
+        for email, user in DEMO_USERS.items():
+            create_user(email, password, user['name'], user['profile_pic'])
+        _demo_seed['done'] = True